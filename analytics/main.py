@@ -0,0 +1,65 @@
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from evaluationBackend import ProcessBackend
+from geneticAlgorithm import GeneticAlgorithm
+from ruleAnalytics import analyze_rules, save_table, plot_small_multiples
+from ruleSweep import load_results, top_k as sweep_top_k
+from videoRenderer import top_rules
+
+""" 
+NASTAVENÍ DÁVKOVÉ ANALÝZY PRAVIDEL
+rules - PRAVIDLA K POROVNÁNÍ
+checkpoint - CESTA K SOUBORU STAVU GENETICKÉHO ALGORITMU, ANALYZUJE SE top_k NEJLEPŠÍCH RŮZNÝCH PRAVIDEL POSLEDNÍ GENERACE
+sweep_path - CESTA K VÝSLEDKŮM PROHLEDÁVÁNÍ PRAVIDEL (sweep/main.py), ANALYZUJE SE top_k NEJLEPŠÍCH PRAVIDEL
+             (None = NEPOUŽIJE SE, PŘI NASTAVENÍ checkpoint I sweep_path SE PRAVIDLA SPOJÍ)
+size - VELIKOST CELULÁRNÍHO AUTOMATU, generations - DÉLKA SIMULACE
+initial - 'center' = JEDNA ŽIVÁ BUŇKA UPROSTŘED, 'random' = NÁHODNÁ POČÁTEČNÍ MŘÍŽKA
+statistic - STATISTIKA PRO MALÉ GRAFY ('live', 'changed' NEBO 'mirror')
+VÝSTUP: summary.csv (SOUHRN PRAVIDEL), generations.npz (STATISTIKY KAŽDÉ GENERACE), small_multiples.pdf
+-----------------------------------------------------------------------
+BATCH RULE ANALYTICS SETTINGS
+rules - RULES TO COMPARE
+checkpoint - PATH TO A GENETIC ALGORITHM STATE FILE, THE top_k BEST DISTINCT RULES OF THE LAST GENERATION ARE ANALYSED
+sweep_path - PATH TO RULE SWEEP RESULTS (sweep/main.py), THE top_k BEST RULES ARE ANALYSED
+             (None = NOT USED, WITH BOTH checkpoint AND sweep_path SET THE RULES ARE COMBINED)
+size - SIZE OF THE CELLULAR AUTOMATON, generations - LENGTH OF THE SIMULATION
+initial - 'center' = ONE LIVE CELL IN THE MIDDLE, 'random' = RANDOM INITIAL GRID
+statistic - STATISTIC FOR THE SMALL MULTIPLES ('live', 'changed' OR 'mirror')
+OUTPUT: summary.csv (RULE SUMMARY), generations.npz (STATISTICS OF EVERY GENERATION), small_multiples.pdf
+"""
+rules = ["B0567/S1248", "B02678/S0346", "B3/S23", "B36/S23"]
+checkpoint = None
+sweep_path = None
+top_k = 30
+size = 11
+generations = 100
+initial = "center"
+statistic = "live"
+
+if __name__ == "__main__":
+    current_directory = os.path.dirname(__file__)
+
+    if checkpoint is not None or sweep_path is not None:
+        rules = []
+        if checkpoint is not None:
+            ga = GeneticAlgorithm.resume(checkpoint)
+            rules.extend(top_rules(ga.fitness_values, top_k))
+            ga.close()
+        if sweep_path is not None:
+            rules.extend(rule for rule, _ in sweep_top_k(load_results(sweep_path), top_k))
+
+    start_time = time.time()
+    with ProcessBackend() as backend:
+        generations_table, summary_table = analyze_rules(rules, size, size, generations, initial, backend)
+    save_table(os.path.join(current_directory, 'summary.csv'), summary_table)
+    save_table(os.path.join(current_directory, 'generations.npz'), generations_table)
+    print(len(summary_table["rule"]), "rules analysed in", round(time.time() - start_time, 2), "seconds")
+
+    print("  ".join(summary_table))
+    for row in zip(*summary_table.values()):
+        print("  ".join(f"{value:.2f}" if isinstance(value, float) else str(value) for value in row))
+
+    plot_small_multiples(generations_table, summary_table, os.path.join(current_directory, 'small_multiples.pdf'), statistic)
@@ -0,0 +1,466 @@
+import numpy as np
+from cellularAutomaton import neighbor_counts, cycle_position
+from rule import as_rule
+from fitnessMetrics import MetricStream, FITNESS_METRICS
+from symmetricGrid import supports_symmetry, symmetric_domain, fold_grid, unfold_state, step_symmetric
+from instrumentation import timed
+
+FITNESS_FUNCTIONS = {
+    "min": "min_count_alter",
+    "div": "max_div",
+    "sym": "symetry_fitness",
+    "alt": "alternating_pattern",
+}
+STOCHASTIC_FITNESS = ("min", "div")
+
+
+@timed
+def rule_tables(rules):
+    """
+    TABULKY PŘECHODŮ PRO VÍCE PRAVIDEL NAJEDNOU, TVAR (POČET PRAVIDEL, 2, 9)
+    (18BITOVÉ KÓDY PRAVIDEL SE PŘEVÁDÍ VEKTOROVĚ BEZ VYTVÁŘENÍ OBJEKTŮ Rule)
+    -------------------------------------------------------------------------
+    TRANSITION TABLES FOR SEVERAL RULES AT ONCE, SHAPE (NUMBER OF RULES, 2, 9)
+    (18-BIT RULE CODES ARE CONVERTED VECTORIZED WITHOUT CREATING Rule OBJECTS)
+    """
+    if len(rules) == 0:
+        return np.zeros((0, 2, 9), dtype=bool)
+    codes = np.asarray(rules)
+    if np.issubdtype(codes.dtype, np.integer):
+        return (((codes[:, None] >> np.arange(18)) & 1) == 1).reshape(-1, 2, 9)
+    return np.stack([as_rule(rule).table for rule in rules])
+
+
+def step_stack(grids, tables):
+    """
+    JEDEN KROK SIMULACE PRO CELÝ ZÁSOBNÍK MŘÍŽEK, KAŽDÁ VRSTVA MÁ VLASTNÍ PRAVIDLO
+    ------------------------------------------------------------------------------
+    ONE SIMULATION STEP FOR THE WHOLE STACK OF GRIDS, EACH LAYER HAS ITS OWN RULE
+    """
+    index = neighbor_counts(grids)
+    index += 9 * grids
+    index += 18 * np.arange(len(grids)).reshape(-1, 1, 1)
+    return tables.astype(grids.dtype, copy=False).ravel().take(index)
+
+
+def state_keys(grids):
+    """
+    KOMPAKTNÍ KLÍČE STAVŮ (STEJNÉ JAKO state_key) PRO KAŽDOU VRSTVU ZÁSOBNÍKU
+    --------------------------------------------------------------------------
+    COMPACT STATE KEYS (SAME AS state_key) FOR EVERY LAYER OF THE STACK
+    """
+    packed = np.packbits(grids.reshape(len(grids), -1), axis=1)
+    return [row.tobytes() for row in packed]
+
+
+def layer_from_key(key, shape):
+    """
+    OBNOVENÍ JEDNÉ VRSTVY LIBOVOLNÉHO TVARU Z KLÍČE VYTVOŘENÉHO FUNKCÍ state_keys
+    ------------------------------------------------------------------------------
+    RESTORES ONE LAYER OF ANY SHAPE FROM A KEY CREATED BY state_keys
+    """
+    cells = np.unpackbits(np.frombuffer(key, dtype=np.uint8), count=int(np.prod(shape)))
+    return cells.reshape(shape).astype(int)
+
+
+class DenseStackEngine:
+    def __init__(self, rows, cols):
+        """
+        VRSTVY JSOU CELÉ MŘÍŽKY TVARU (rows, cols)
+        -------------------------------------------
+        LAYERS ARE FULL GRIDS OF SHAPE (rows, cols)
+        """
+        self.rows = rows
+        self.cols = cols
+        self.layer_shape = (rows, cols)
+
+    def fold(self, grids):
+        """
+        PŘEVOD ZÁSOBNÍKU MŘÍŽEK NA VNITŘNÍ VRSTVY
+        ------------------------------------------------
+        CONVERTS A STACK OF GRIDS TO THE INTERNAL LAYERS
+        """
+        return grids
+
+    def unfold(self, states):
+        """
+        PŘEVOD VNITŘNÍCH VRSTEV NA ZÁSOBNÍK CELÝCH MŘÍŽEK
+        -----------------------------------------------------
+        CONVERTS THE INTERNAL LAYERS TO A STACK OF FULL GRIDS
+        """
+        return states
+
+    @timed
+    def step(self, states, tables):
+        """
+        JEDEN KROK SIMULACE PRO VŠECHNY VRSTVY
+        --------------------------------------
+        ONE SIMULATION STEP FOR ALL LAYERS
+        """
+        return step_stack(states, tables)
+
+    def metrics(self, metrics):
+        """
+        VÝPOČET METRIK FITNESS FUNKCÍ PRO VŠECHNY VRSTVY NAJEDNOU
+        -----------------------------------------------------------
+        FITNESS METRICS FOR ALL LAYERS AT ONCE
+        """
+        return MetricStream(self.rows, self.cols, metrics)
+
+
+class SymmetricStackEngine(DenseStackEngine):
+    def __init__(self, rows, cols):
+        """
+        VRSTVY JSOU JEN ZÁKLADNÍ OBLASTI SYMETRIE D4 (VIZ symmetricGrid.py) - PRO MŘÍŽKY S JEDNOU BUŇKOU UPROSTŘED
+        -----------------------------------------------------------------------------------------------------------
+        LAYERS ARE ONLY THE FUNDAMENTAL DOMAINS OF THE D4 SYMMETRY (SEE symmetricGrid.py) - FOR CENTRE-SEEDED GRIDS
+        """
+        super().__init__(rows, cols)
+        self.domain = symmetric_domain(rows)
+        self.layer_shape = (len(self.domain),)
+
+    def fold(self, grids):
+        """
+        PŘEVOD ZÁSOBNÍKU MŘÍŽEK NA VNITŘNÍ VRSTVY
+        ------------------------------------------------
+        CONVERTS A STACK OF GRIDS TO THE INTERNAL LAYERS
+        """
+        return fold_grid(grids, self.domain)
+
+    def unfold(self, states):
+        """
+        PŘEVOD VNITŘNÍCH VRSTEV NA ZÁSOBNÍK CELÝCH MŘÍŽEK
+        -----------------------------------------------------
+        CONVERTS THE INTERNAL LAYERS TO A STACK OF FULL GRIDS
+        """
+        return unfold_state(states, self.domain)
+
+    @timed
+    def step(self, states, tables):
+        """
+        JEDEN KROK SIMULACE PRO VŠECHNY VRSTVY
+        --------------------------------------
+        ONE SIMULATION STEP FOR ALL LAYERS
+        """
+        return step_symmetric(states, self.domain.neighbors, tables)
+
+    def metrics(self, metrics):
+        """
+        VÝPOČET METRIK FITNESS FUNKCÍ PŘÍMO NAD BUŇKAMI OBLASTÍ (ZRCADLENÍ JE VŽDY SHODNÉ)
+        -------------------------------------------------------------------------------------
+        FITNESS METRICS DIRECTLY OVER THE DOMAIN CELLS (THE MIRROR IMAGES ALWAYS AGREE)
+        """
+        return MetricStream(self.rows, self.cols, metrics, domain=self.domain)
+
+
+def common_grids(count, rows, cols, seed=None, probability=0.3):
+    """
+    count NÁHODNÝCH POČÁTEČNÍCH MŘÍŽEK ZE SEMÍNKA seed (None = ZE STAVU np.random) - STEJNÉ SEMÍNKO DÁ STEJNÉ MŘÍŽKY
+    V KAŽDÉM PROCESU, TAKŽE VŠECHNA PRAVIDLA SE POROVNÁVAJÍ NA STEJNÝCH MŘÍŽKÁCH (SPOLEČNÁ NÁHODNÁ ČÍSLA)
+    ----------------------------------------------------------------------------------------------------------------
+    count RANDOM INITIAL GRIDS FROM THE SEED seed (None = FROM THE np.random STATE) - THE SAME SEED GIVES THE SAME GRIDS
+    IN EVERY PROCESS, SO ALL RULES ARE COMPARED ON THE SAME GRIDS (COMMON RANDOM NUMBERS)
+    """
+    generator = np.random if seed is None else np.random.default_rng(seed)
+    return (generator.random((count, rows, cols)) < probability).astype(int)
+
+
+class BatchedCellularAutomaton:
+    def __init__(self, rows, cols, rules, initial_grids=None):
+        """
+        initial_grids - ZÁSOBNÍK POČÁTEČNÍCH MŘÍŽEK PRO NÁHODNÉ FITNESS FUNKCE (MÍSTO randomize_grids), VRSTVA i
+                        DOSTANE MŘÍŽKU i % len(initial_grids) (None = NOVÉ NÁHODNÉ MŘÍŽKY)
+        ------------------------------------------------------------------------------------------------------------
+        initial_grids - STACK OF INITIAL GRIDS FOR THE RANDOM FITNESS FUNCTIONS (INSTEAD OF randomize_grids), LAYER i
+                        GETS THE GRID i % len(initial_grids) (None = NEW RANDOM GRIDS)
+        """
+        self.rows = rows
+        self.cols = cols
+        self.rules = rules
+        self.tables = rule_tables(rules)
+        self.initial_grids = initial_grids
+        self.grids = np.zeros((len(self.rules), rows, cols), dtype=int)
+
+    def center_seeded_engine(self):
+        """
+        ENGINE PRO SIMULACI Z JEDNÉ ŽIVÉ BUŇKY UPROSTŘED - NA LICHÉ ČTVERCOVÉ MŘÍŽCE ZŮSTÁVÁ STAV SYMETRICKÝ,
+        TAKŽE STAČÍ SIMULOVAT OSMINU MŘÍŽKY
+        -------------------------------------------------------------------------------------------------------
+        ENGINE FOR A SIMULATION FROM ONE LIVE CELL IN THE MIDDLE - ON AN ODD SQUARE GRID THE STATE STAYS SYMMETRIC,
+        SO SIMULATING ONE EIGHTH OF THE GRID IS ENOUGH
+        """
+        if supports_symmetry(self.rows, self.cols):
+            return SymmetricStackEngine(self.rows, self.cols)
+        return DenseStackEngine(self.rows, self.cols)
+
+    def randomize_grids(self, probability=0.3):
+        """
+        NÁHODNÉ POČÁTEČNÍ NASTAVENÍ VŠECH MŘÍŽEK
+        (STEJNÁ POSLOUPNOST NÁHODNÝCH ČÍSEL JAKO POSTUPNÉ VOLÁNÍ randomize_grid)
+        --------------------------------------------------------------------------
+        RANDOM INITIAL SETTING OF ALL GRIDS
+        (SAME RANDOM NUMBER SEQUENCE AS CALLING randomize_grid ONE GRID AFTER ANOTHER)
+        """
+        if self.initial_grids is not None:
+            self.grids = np.tile(self.initial_grids, (len(self.rules) // len(self.initial_grids), 1, 1))
+            return
+        random_grids = np.random.rand(len(self.rules), self.rows, self.cols)
+        self.grids = (random_grids < probability).astype(int)
+
+    def initialize_center_cells(self):
+        """
+        NASTAVENÍ VŠECH MŘÍŽEK NA JEDNU ŽIVOU BUŇKU UPROSTŘED
+        ------------------------------------------------------
+        SETTING ALL GRIDS TO ONE LIVE CELL IN THE MIDDLE
+        """
+        self.grids = np.zeros((len(self.rules), self.rows, self.cols), dtype=int)
+        self.grids[:, self.rows // 2, self.cols // 2] = 1
+
+    def count_live_dead(self):
+        """
+        VÝPOČET ŽIVÝCH A MRTVÝCH BUNĚK PRO KAŽDOU VRSTVU
+        --------------------------------------------------
+        SUM OF LIVING AND DEAD CELLS FOR EACH LAYER
+        """
+        live_counts = self.grids.sum(axis=(1, 2))
+        return live_counts, self.rows * self.cols - live_counts
+
+    def apply_rules(self):
+        """
+        POUŽITÍ PRAVIDEL NA VŠECHNY VRSTVY A VYTVOŘENÍ NÁSLEDUJÍCÍCH MŘÍŽEK
+        --------------------------------------------------------------------
+        APPLYING THE RULES TO ALL LAYERS AND CREATING THE RESULTING GRIDS
+        """
+        self.next_grids = step_stack(self.grids, self.tables)
+
+    @timed
+    def min_count_alter(self, generations):
+        """
+        FITNESS FUNKCE min_count_alter PRO CELOU POPULACI
+        VYMŘELÉ VRSTVY MAJÍ FITNESS 0 A DÁLE SE NESIMULUJÍ
+        ---------------------------------------------------
+        FITNESS FUNCTION min_count_alter FOR THE WHOLE POPULATION
+        LAYERS THAT DIE OUT HAVE FITNESS 0 AND ARE NOT SIMULATED ANY FURTHER
+        """
+        self.randomize_grids()
+        metrics = MetricStream(self.rows, self.cols, FITNESS_METRICS["min"])
+        population = len(self.rules)
+        min_living_cells = np.full(population, np.inf)
+        active = np.arange(population)
+        grids = self.grids
+        tables = self.tables
+
+        for _ in range(generations):
+            living_cells = metrics.measure(grids)["live"]
+            alive = living_cells > 0
+            if not alive.all():
+                active, grids, tables, living_cells = active[alive], grids[alive], tables[alive], living_cells[alive]
+            min_living_cells[active] = np.minimum(min_living_cells[active], living_cells)
+            grids = step_stack(grids, tables)
+
+        self.grids = np.zeros((population, self.rows, self.cols), dtype=int)
+        self.grids[active] = grids
+        fitness = np.zeros(population, dtype=int)
+        fitness[active] = (10000 / min_living_cells[active]).astype(int)
+        return fitness
+
+    @timed
+    def max_div(self, generations):
+        """
+        FITNESS FUNKCE max_div PRO CELOU POPULACI
+        -------------------------------------------
+        FITNESS FUNCTION max_div FOR THE WHOLE POPULATION
+        """
+        self.randomize_grids()
+        metrics = MetricStream(self.rows, self.cols, FITNESS_METRICS["div"])
+        self.apply_rules()
+        prev_grids = self.grids
+        self.grids = self.next_grids
+
+        count_div = np.zeros(len(self.rules), dtype=int)
+        for gen in range(1, generations):
+            self.apply_rules()
+
+            if gen >= generations - 25:
+                count_div += metrics.measure(self.grids, prev_grids)["changed"]
+                prev_grids = self.grids
+
+            self.grids = self.next_grids
+
+        return count_div
+
+    @timed
+    def symetry_fitness(self, generations):
+        """
+        FITNESS FUNKCE symetry_fitness PRO CELOU POPULACI
+        VRSTVA, JEJÍŽ STAV SE ZOPAKOVAL, SE DÁLE NESIMULUJE - ZBÝVAJÍCÍ GENERACE SE BEROU Z NALEZENÉHO CYKLU
+        ---------------------------------------------------
+        FITNESS FUNCTION symetry_fitness FOR THE WHOLE POPULATION
+        A LAYER WHOSE STATE HAS REPEATED IS NOT SIMULATED ANY FURTHER - THE REMAINING GENERATIONS ARE TAKEN FROM THE DETECTED CYCLE
+        """
+        self.initialize_center_cells()
+        engine = self.center_seeded_engine()
+        metrics = engine.metrics(FITNESS_METRICS["sym"])
+        population = len(self.rules)
+
+        complexity_score = np.zeros(population, dtype=int)
+        pattern_score = np.zeros(population)
+        density_score = np.zeros(population)
+        diversity_score = np.zeros(population, dtype=int)
+        penalty = np.zeros(population, dtype=int)
+
+        complexity_history = np.zeros((generations, population), dtype=int)
+        pattern_history = np.zeros((generations, population))
+        density_history = np.zeros((generations, population))
+        diversity_history = np.zeros((generations, population), dtype=int)
+
+        active = np.arange(population)
+        period = np.zeros(population, dtype=int)
+        grids = engine.fold(self.grids)
+        prev_grids = grids
+        tables = self.tables
+        previous_states = [{} for _ in range(population)]
+        histories = [[] for _ in range(population)]
+
+        for gen in range(generations):
+            complexity = complexity_history[gen]
+            pattern = pattern_history[gen]
+            density = density_history[gen]
+            diversity = diversity_history[gen]
+
+            finished = np.flatnonzero(period)
+            if len(finished):
+                source = gen - period[finished]
+                complexity[finished] = complexity_history[source, finished]
+                pattern[finished] = pattern_history[source, finished]
+                density[finished] = density_history[source, finished]
+                diversity[finished] = diversity_history[source, finished]
+                penalty[finished] += 50
+
+            if len(active):
+                repeated = np.zeros(len(active), dtype=bool)
+                for position, (layer, current_state) in enumerate(zip(active, state_keys(grids))):
+                    if current_state in previous_states[layer]:
+                        penalty[layer] += 50
+                        period[layer] = gen - previous_states[layer][current_state]
+                        repeated[position] = True
+                    else:
+                        previous_states[layer][current_state] = gen
+                    histories[layer].append(current_state)
+
+                measured = metrics.measure(grids, prev_grids)
+                complexity[active] = measured["changed"]
+                pattern[active] = measured["mirror"]
+                density[active] = measured["density"]
+                diversity[active] = measured["diversity"]
+
+                if repeated.any():
+                    active, grids, tables = active[~repeated], grids[~repeated], tables[~repeated]
+                prev_grids = grids
+                grids = engine.step(grids, tables)
+
+            complexity_score += complexity
+            pattern_score += pattern
+            density_score += density
+            diversity_score += diversity
+
+        final_grids = engine.fold(self.grids)
+        final_grids[active] = grids
+        for layer in np.flatnonzero(period):
+            start = len(histories[layer]) - 1 - period[layer]
+            last = cycle_position(start, period[layer], generations)
+            final_grids[layer] = layer_from_key(histories[layer][last], engine.layer_shape)
+        self.grids = engine.unfold(final_grids)
+
+        total_score = complexity_score + pattern_score + density_score * diversity_score - penalty
+        return np.maximum(0, (total_score / (10 + 0.1 * (self.rows - 11) ** 2)).astype(int))
+
+    @timed
+    def alternating_pattern(self, generations):
+        """
+        FITNESS FUNKCE alternating_pattern PRO CELOU POPULACI
+        (ROZHODUJE POUZE POSLEDNÍ GENERACE, PROTO SE ŠACHOVNICE POROVNÁVÁ JEN JEDNOU;
+        VRSTVA, JEJÍŽ STAV SE ZOPAKOVAL, SE DÁLE NESIMULUJE A POSLEDNÍ STAV SE URČÍ Z CYKLU)
+        -------------------------------------------------------------------------------
+        FITNESS FUNCTION alternating_pattern FOR THE WHOLE POPULATION
+        (ONLY THE LAST GENERATION DECIDES, SO THE CHECKERBOARD IS COMPARED ONLY ONCE;
+        A LAYER WHOSE STATE HAS REPEATED IS NOT SIMULATED ANY FURTHER AND ITS LAST STATE IS TAKEN FROM THE CYCLE)
+        """
+        self.initialize_center_cells()
+        engine = self.center_seeded_engine()
+        grids = engine.fold(self.grids)
+        final_grids = grids.copy()
+        active = np.arange(len(self.rules))
+        tables = self.tables
+        histories = [[current_state] for current_state in state_keys(grids)]
+        previous_states = [{history[0]: 0} for history in histories]
+
+        for gen in range(1, generations + 1):
+            if not len(active):
+                break
+            grids = engine.step(grids, tables)
+            repeated = np.zeros(len(active), dtype=bool)
+            for position, (layer, current_state) in enumerate(zip(active, state_keys(grids))):
+                if current_state in previous_states[layer]:
+                    start = previous_states[layer][current_state]
+                    last = cycle_position(start, gen - start, generations)
+                    final_grids[layer] = layer_from_key(histories[layer][last], engine.layer_shape)
+                    repeated[position] = True
+                else:
+                    previous_states[layer][current_state] = gen
+                    histories[layer].append(current_state)
+            if repeated.any():
+                active, grids, tables = active[~repeated], grids[~repeated], tables[~repeated]
+
+        final_grids[active] = grids
+        self.grids = engine.unfold(final_grids)
+
+        pattern_score = np.zeros(len(self.rules))
+        if generations > 0:
+            pattern_score = engine.metrics(FITNESS_METRICS["alt"]).measure(final_grids)["checkerboard"]
+
+        return (pattern_score - 0.5) * 100
+
+
+@timed
+def batch_fitness(rules, rows, cols, generations, fitfun, seeds=1, seed=None):
+    """
+    FITNESS HODNOTY PRO SEZNAM PRAVIDEL JEDNÍM VEKTOROVÝM VÝPOČTEM
+    fitfun - 'min', 'div', 'sym' NEBO 'alt' (VIZ GeneticAlgorithm.simulate_rule)
+    seeds, seed - PRŮMĚR ZE seeds SPOLEČNÝCH NÁHODNÝCH MŘÍŽEK (VIZ batch_fitness_stats)
+    --------------------------------------------------------------------------------
+    FITNESS VALUES FOR A LIST OF RULES IN ONE VECTORIZED COMPUTATION
+    fitfun - 'min', 'div', 'sym' OR 'alt' (SEE GeneticAlgorithm.simulate_rule)
+    seeds, seed - MEAN OVER seeds COMMON RANDOM GRIDS (SEE batch_fitness_stats)
+    """
+    if fitfun not in FITNESS_FUNCTIONS:
+        raise ValueError("Invalid fitness function. Expected 'min', 'div', 'sym' or 'alt'.")
+    if seeds > 1 or seed is not None:
+        return [mean for mean, _ in batch_fitness_stats(rules, rows, cols, generations, fitfun, seeds, seed)]
+    batch = BatchedCellularAutomaton(rows, cols, rules)
+    return getattr(batch, FITNESS_FUNCTIONS[fitfun])(generations).tolist()
+
+
+@timed
+def batch_fitness_stats(rules, rows, cols, generations, fitfun, seeds, seed=None):
+    """
+    PRŮMĚR A ROZPTYL FITNESS ZE seeds NÁHODNÝCH POČÁTEČNÍCH MŘÍŽEK PRO KAŽDÉ PRAVIDLO - [(PRŮMĚR, ROZPTYL), ...]
+    VŠECHNA PRAVIDLA A MŘÍŽKY SE SIMULUJÍ JAKO JEDEN ZÁSOBNÍK (len(rules) * seeds VRSTEV), MŘÍŽKY JSOU PRO VŠECHNA
+    PRAVIDLA STEJNÉ (common_grids ZE SEMÍNKA seed), TAKŽE ROZDÍLY MEZI PRAVIDLY NEJSOU ZPŮSOBENY NÁHODOU
+    DETERMINISTICKÉ FITNESS FUNKCE ('sym', 'alt') SE SIMULUJÍ JEDNOU S ROZPTYLEM 0
+    ----------------------------------------------------------------------------------------------------------------
+    MEAN AND VARIANCE OF THE FITNESS OVER seeds RANDOM INITIAL GRIDS FOR EVERY RULE - [(MEAN, VARIANCE), ...]
+    ALL RULES AND GRIDS ARE SIMULATED AS ONE STACK (len(rules) * seeds LAYERS), THE GRIDS ARE THE SAME FOR ALL
+    RULES (common_grids FROM THE SEED seed), SO DIFFERENCES BETWEEN RULES ARE NOT CAUSED BY CHANCE
+    THE DETERMINISTIC FITNESS FUNCTIONS ('sym', 'alt') ARE SIMULATED ONCE WITH VARIANCE 0
+    """
+    if fitfun not in FITNESS_FUNCTIONS:
+        raise ValueError("Invalid fitness function. Expected 'min', 'div', 'sym' or 'alt'.")
+    if fitfun not in STOCHASTIC_FITNESS:
+        return [(value, 0.0) for value in batch_fitness(rules, rows, cols, generations, fitfun)]
+    if len(rules) == 0:
+        return []
+    layers = [rule for rule in rules for _ in range(seeds)]
+    batch = BatchedCellularAutomaton(rows, cols, layers, common_grids(seeds, rows, cols, seed))
+    values = getattr(batch, FITNESS_FUNCTIONS[fitfun])(generations).reshape(len(rules), seeds)
+    return list(zip(values.mean(axis=1).tolist(), values.var(axis=1).tolist()))
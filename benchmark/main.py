@@ -0,0 +1,65 @@
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from benchmarkSuite import (cross_check, step_benchmarks, fitness_benchmarks, ga_benchmarks,
+                            save_baseline, load_baseline, compare)
+
+""" 
+NASTAVENÍ MĚŘENÍ VÝKONU
+sizes - VELIKOSTI MŘÍŽEK PRO MĚŘENÍ KROKŮ (9x9 AŽ 2048x2048)
+population_sizes - VELIKOSTI POPULACE PRO MĚŘENÍ CELÝCH GENERACÍ GENETICKÉHO ALGORITMU
+min_time - NEJKRATŠÍ DOBA MĚŘENÍ JEDNOHO PŘÍPADU (SEKUNDY)
+save - True = VÝSLEDKY SE ULOŽÍ JAKO NOVÝ ZÁKLAD, False = POROVNÁNÍ S ULOŽENÝM ZÁKLADEM
+       (POKUD ZÁKLAD JEŠTĚ NEEXISTUJE, ULOŽÍ SE VŽDY)
+tolerance - POMĚR, O KTERÝ SMÍ BÝT PŘÍPAD POMALEJŠÍ NEŽ ZÁKLAD, NEŽ SE OZNAČÍ JAKO ZPOMALENÍ
+PŘED MĚŘENÍM SE VŽDY OVĚŘÍ, ŽE VŠECHNY ENGINE DÁVAJÍ STEJNÉ MŘÍŽKY JAKO REFERENČNÍ SMYČKA
+-----------------------------------------------------------------------
+BENCHMARK SETTINGS
+sizes - GRID SIZES FOR THE STEP MEASUREMENTS (9x9 TO 2048x2048)
+population_sizes - POPULATION SIZES FOR MEASURING WHOLE GENERATIONS OF THE GENETIC ALGORITHM
+min_time - SHORTEST MEASUREMENT TIME OF ONE CASE (SECONDS)
+save - True = THE RESULTS ARE SAVED AS THE NEW BASELINE, False = COMPARISON WITH THE SAVED BASELINE
+       (IF NO BASELINE EXISTS YET, IT IS ALWAYS SAVED)
+tolerance - FRACTION BY WHICH A CASE MAY BE SLOWER THAN THE BASELINE BEFORE IT IS FLAGGED AS A SLOWDOWN
+BEFORE MEASURING, ALL ENGINES ARE ALWAYS CHECKED TO PRODUCE THE SAME GRIDS AS THE REFERENCE LOOP
+"""
+sizes = (9, 33, 129, 513, 2048)
+population_sizes = (50, 150, 500)
+min_time = 0.2
+save = False
+tolerance = 0.2
+
+if __name__ == "__main__":
+    current_directory = os.path.dirname(__file__)
+    baseline_path = os.path.join(current_directory, 'baseline.json')
+
+    mismatches = cross_check()
+    if mismatches:
+        for name, size, rule, seed_type, generation in mismatches:
+            print("NESHODA:", name, size, rule, seed_type, "generace", generation)
+        sys.exit(1)
+    print("Cross-check passed: all engines match the reference loop")
+
+    start_time = time.time()
+    results = {}
+    results.update(step_benchmarks(sizes, min_time))
+    results.update(fitness_benchmarks(min_time=min_time))
+    results.update(ga_benchmarks(population_sizes, min_time=max(min_time, 0.5)))
+    print("Benchmarks finished in", int(time.time() - start_time), "seconds")
+
+    baseline = load_baseline(baseline_path)
+    if save or baseline is None:
+        for name, result in results.items():
+            print(f"{name:45s} {result['rate']:14.1f} {result['unit']}")
+        save_baseline(baseline_path, results)
+        print("Baseline saved to", baseline_path)
+    else:
+        slowdowns = 0
+        for name, before, after, ratio, slower in compare(results, baseline, tolerance):
+            print(f"{name:45s} {before:14.1f} -> {after:14.1f} {results[name]['unit']:14s} {ratio:6.2f}x",
+                  "ZPOMALENÍ" if slower else "")
+            slowdowns += slower
+        print("Slowdowns:", slowdowns)
+        sys.exit(1 if slowdowns else 0)
@@ -0,0 +1,254 @@
+import os
+import sys
+import json
+import time
+import random
+import platform
+import numpy as np
+from rule import as_rule
+from cellularAutomaton import CellularAutomaton, ENGINES
+from batchedAutomaton import BatchedCellularAutomaton, batch_fitness, FITNESS_FUNCTIONS
+from hashLife import HashLife, is_power_of_two
+from geneticAlgorithm import GeneticAlgorithm
+from progressEvents import QuietSink
+
+"""
+PRAVIDLA S RŮZNOU HUSTOTOU PODMÍNEK A TYPY POČÁTEČNÍCH MŘÍŽEK PRO MĚŘENÍ
+---------------------------------------------------------------------------
+RULES WITH DIFFERENT DENSITIES OF CONDITIONS AND INITIAL GRID TYPES FOR THE MEASUREMENTS
+"""
+BENCHMARK_RULES = {"low": "B3/S23", "medium": "B3678/S34678", "high": "B0235678/S0124568"}
+SEED_TYPES = ("center", "random", "sparse")
+GRID_SIZES = (9, 33, 129, 513, 2048)
+POPULATION_SIZES = (50, 150, 500)
+
+
+def seed_grid(rows, cols, seed_type, seed=0):
+    """
+    POČÁTEČNÍ MŘÍŽKA - 'center' = JEDNA ŽIVÁ BUŇKA UPROSTŘED, 'random' = 30 % ŽIVÝCH, 'sparse' = 1 % ŽIVÝCH
+    ---------------------------------------------------------------------------------------------------------
+    INITIAL GRID - 'center' = ONE LIVE CELL IN THE MIDDLE, 'random' = 30 % ALIVE, 'sparse' = 1 % ALIVE
+    """
+    if seed_type == "center":
+        grid = np.zeros((rows, cols), dtype=int)
+        grid[rows // 2, cols // 2] = 1
+        return grid
+    probability = {"random": 0.3, "sparse": 0.01}[seed_type]
+    return (np.random.RandomState(seed).rand(rows, cols) < probability).astype(int)
+
+
+def reference_step(grid, rule):
+    """
+    REFERENČNÍ KROK - PŮVODNÍ SMYČKA PŘES KAŽDOU BUŇKU A JEJÍ SOUSEDY (POMALÁ, JEN PRO KONTROLU)
+    ---------------------------------------------------------------------------------------------
+    REFERENCE STEP - THE ORIGINAL LOOP OVER EVERY CELL AND ITS NEIGHBOURS (SLOW, ONLY FOR CHECKING)
+    """
+    rule = as_rule(rule)
+    rows, cols = grid.shape
+    cells = grid.tolist()
+    new_grid = np.zeros((rows, cols), dtype=int)
+    for i in range(rows):
+        for j in range(cols):
+            neighbors = 0
+            for di in (-1, 0, 1):
+                for dj in (-1, 0, 1):
+                    if (di or dj) and cells[(i + di) % rows][(j + dj) % cols] == 1:
+                        neighbors += 1
+            if cells[i][j] == 0 and neighbors in rule.birth:
+                new_grid[i, j] = 1
+            elif cells[i][j] == 1 and neighbors not in rule.survival:
+                new_grid[i, j] = 0
+            else:
+                new_grid[i, j] = cells[i][j]
+    return new_grid
+
+
+def cross_check(sizes=(9, 16, 33, 70, 130, (20, 130)), steps=20):
+    """
+    KONTROLA, ŽE VŠECHNY RYCHLÉ ENGINE DÁVAJÍ STEJNÉ MŘÍŽKY JAKO REFERENČNÍ SMYČKA
+    (ENGINE CellularAutomaton, ZÁSOBNÍK BatchedCellularAutomaton A HashLife NA TORU PRO PRAVIDLA BEZ B0)
+    sizes - VELIKOSTI ČTVERCOVÝCH MŘÍŽEK NEBO DVOJICE (rows, cols), VÍCE NEŽ 64 SLOUPCŮ KONTROLUJE ŘÁDKY ENGINE 'packed'
+            Z VÍCE SLOV A PŘENOSY PŘES HRANICE SLOV
+    VRACÍ SEZNAM NESHOD [(NÁZEV, 'rowsxcols', PRAVIDLO, POČÁTEK, GENERACE), ...]
+    ---------------------------------------------------------------------------------------------------------
+    CHECKS THAT ALL FAST ENGINES PRODUCE THE SAME GRIDS AS THE REFERENCE LOOP
+    (CellularAutomaton ENGINES, THE BatchedCellularAutomaton STACK AND HashLife ON A TORUS FOR RULES WITHOUT B0)
+    sizes - SIZES OF SQUARE GRIDS OR (rows, cols) PAIRS, MORE THAN 64 COLUMNS CHECKS THE MULTI-WORD ROWS OF THE 'packed'
+            ENGINE AND THE CARRIES ACROSS WORD BOUNDARIES
+    RETURNS A LIST OF MISMATCHES [(NAME, 'rowsxcols', RULE, SEED, GENERATION), ...]
+    """
+    mismatches = []
+    rules = list(BENCHMARK_RULES.values())
+    for size in sizes:
+        rows, cols = size if isinstance(size, tuple) else (size, size)
+        label = f"{rows}x{cols}"
+        for seed_type in SEED_TYPES:
+            initial_grid = seed_grid(rows, cols, seed_type)
+            references = []
+            for rule in rules:
+                grids = [initial_grid]
+                for _ in range(steps):
+                    grids.append(reference_step(grids[-1], rule))
+                references.append(grids)
+
+            for rule, grids in zip(rules, references):
+                candidates = {name: CellularAutomaton(rows, cols, initial_grid, engine=name) for name in ENGINES}
+                if rows == cols and is_power_of_two(rows) and 0 not in as_rule(rule).birth:
+                    candidates["hashlife"] = HashLife(rows, cols, initial_grid)
+                for generation in range(1, steps + 1):
+                    for name, ca in candidates.items():
+                        ca.advance(rule)
+                        if not np.array_equal(ca.grid, grids[generation]):
+                            mismatches.append((name, label, rule, seed_type, generation))
+
+            batch = BatchedCellularAutomaton(rows, cols, rules)
+            batch.grids = np.repeat(initial_grid[None], len(rules), axis=0)
+            for generation in range(1, steps + 1):
+                batch.apply_rules()
+                batch.grids = batch.next_grids
+                for layer, (rule, grids) in enumerate(zip(rules, references)):
+                    if not np.array_equal(batch.grids[layer], grids[generation]):
+                        mismatches.append(("batched", label, rule, seed_type, generation))
+    return mismatches
+
+
+def measure_rate(run, min_time=0.2, repeats=3):
+    """
+    POČET JEDNOTEK ZA SEKUNDU - run(count) SE VOLÁ S ROSTOUCÍM count, DOKUD NETRVÁ ALESPOŇ min_time,
+    POTÉ SE MĚŘENÍ OPAKUJE repeats KRÁT A BERE SE NEJLEPŠÍ VÝSLEDEK (MENŠÍ VLIV OSTATNÍCH PROCESŮ)
+    -------------------------------------------------------------------------------------------------
+    UNITS PER SECOND - run(count) IS CALLED WITH A GROWING count UNTIL IT TAKES AT LEAST min_time,
+    THEN THE MEASUREMENT IS REPEATED repeats TIMES AND THE BEST RESULT IS TAKEN (LESS NOISE FROM OTHER PROCESSES)
+    """
+    count = 1
+    while True:
+        start = time.perf_counter()
+        run(count)
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        count = max(count + 1, int(count * min(10, 1.2 * min_time / max(elapsed, 1e-9))))
+    best = count / elapsed
+    for _ in range(repeats - 1):
+        start = time.perf_counter()
+        run(count)
+        best = max(best, count / (time.perf_counter() - start))
+    return best
+
+
+def step_benchmarks(sizes=GRID_SIZES, min_time=0.2):
+    """
+    KROKY ZA SEKUNDU PRO KAŽDÝ ENGINE, VELIKOST MŘÍŽKY, PRAVIDLO A POČÁTEČNÍ MŘÍŽKU
+    (PŘÍPADY, KDY BY ENGINE PŘEŠEL NA 'dense', SE VYNECHÁVAJÍ)
+    ---------------------------------------------------------------------------------
+    STEPS PER SECOND FOR EVERY ENGINE, GRID SIZE, RULE AND INITIAL GRID
+    (CASES WHERE THE ENGINE WOULD FALL BACK TO 'dense' ARE SKIPPED)
+    """
+    results = {}
+    for size in sizes:
+        for seed_type in SEED_TYPES:
+            initial_grid = seed_grid(size, size, seed_type)
+            for engine in ENGINES:
+                ca = CellularAutomaton(size, size, initial_grid, engine=engine)
+                if ca.active_engine != engine:
+                    continue
+                for rule_name, rule in BENCHMARK_RULES.items():
+                    rule = as_rule(rule)
+
+                    def run(count):
+                        ca.grid = initial_grid
+                        for _ in range(count):
+                            ca.advance(rule)
+                    results[f"step/{engine}/{size}x{size}/{rule_name}/{seed_type}"] = {
+                        "rate": measure_rate(run, min_time), "unit": "steps/s"}
+    return results
+
+
+def fitness_benchmarks(rows=9, cols=9, cagens=100, population_size=150, min_time=0.2):
+    """
+    JEDINCI ZA SEKUNDU PRO KAŽDOU FITNESS FUNKCI - DÁVKOVĚ (batch_fitness) A PO JEDNOM PRAVIDLE (CellularAutomaton)
+    -----------------------------------------------------------------------------------------------------------------
+    INDIVIDUALS PER SECOND FOR EVERY FITNESS FUNCTION - BATCHED (batch_fitness) AND ONE RULE AT A TIME (CellularAutomaton)
+    """
+    results = {}
+    codes = np.random.RandomState(0).randint(0, 1 << 18, size=population_size)
+    rules = [str(as_rule(int(code))) for code in codes]
+    for fitfun, method in FITNESS_FUNCTIONS.items():
+        np.random.seed(0)
+        results[f"fitness/batched/{fitfun}"] = {
+            "rate": population_size * measure_rate(
+                lambda count: [batch_fitness(rules, rows, cols, cagens, fitfun) for _ in range(count)], min_time),
+            "unit": "individuals/s"}
+
+        def run(count):
+            for i in range(count):
+                getattr(CellularAutomaton(rows, cols), method)(rules[i % population_size], cagens)
+        np.random.seed(0)
+        results[f"fitness/scalar/{fitfun}"] = {"rate": measure_rate(run, min_time), "unit": "individuals/s"}
+    return results
+
+
+def ga_benchmarks(population_sizes=POPULATION_SIZES, rows=9, cols=9, cagens=100, fitfun="alt", min_time=0.5):
+    """
+    JEDINCI ZA SEKUNDU PRO CELÉ GENERACE GeneticAlgorithm.evolve PŘI RŮZNÝCH VELIKOSTECH POPULACE
+    ----------------------------------------------------------------------------------------------
+    INDIVIDUALS PER SECOND FOR WHOLE GENERATIONS OF GeneticAlgorithm.evolve AT SEVERAL POPULATION SIZES
+    """
+    results = {}
+    for population_size in population_sizes:
+        random.seed(0)
+        np.random.seed(0)
+        ga = GeneticAlgorithm(rows, cols, population_size, 0.01, cagens, "t", fitfun, genome="int", progress=QuietSink())
+        results[f"ga/{fitfun}/{population_size}"] = {
+            "rate": population_size * measure_rate(lambda count: ga.evolve(ga.generation + count), min_time),
+            "unit": "individuals/s"}
+    return results
+
+
+def environment():
+    """
+    POPIS PROSTŘEDÍ, VE KTERÉM MĚŘENÍ PROBĚHLO
+    -------------------------------------------
+    DESCRIPTION OF THE ENVIRONMENT THE MEASUREMENT RAN IN
+    """
+    return {"python": sys.version.split()[0], "numpy": np.__version__, "machine": platform.machine(),
+            "processor": platform.processor(), "cpus": os.cpu_count()}
+
+
+def save_baseline(path, results):
+    """
+    ULOŽENÍ VÝSLEDKŮ JAKO ZÁKLADU PRO POROVNÁNÍ (JSON)
+    ---------------------------------------------------
+    SAVES THE RESULTS AS THE BASELINE FOR COMPARISON (JSON)
+    """
+    with open(path, "w", encoding="utf-8") as baseline_file:
+        json.dump({"environment": environment(), "results": results}, baseline_file, indent=1, sort_keys=True)
+
+
+def load_baseline(path):
+    """
+    NAČTENÍ ULOŽENÉHO ZÁKLADU (None, POKUD SOUBOR NEEXISTUJE)
+    ----------------------------------------------------------
+    LOADS THE SAVED BASELINE (None IF THE FILE DOES NOT EXIST)
+    """
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as baseline_file:
+        return json.load(baseline_file)["results"]
+
+
+def compare(results, baseline, tolerance=0.2):
+    """
+    POROVNÁNÍ SE ZÁKLADEM - [(NÁZEV, ZÁKLAD, NYNÍ, POMĚR, ZPOMALENÍ)], ZPOMALENÍ = POMĚR POD 1 - tolerance
+    -------------------------------------------------------------------------------------------------------
+    COMPARISON WITH THE BASELINE - [(NAME, BASELINE, CURRENT, RATIO, SLOWDOWN)], SLOWDOWN = RATIO BELOW 1 - tolerance
+    """
+    rows = []
+    for name in sorted(results):
+        if name not in baseline:
+            continue
+        before = baseline[name]["rate"]
+        after = results[name]["rate"]
+        ratio = after / before if before else float("inf")
+        rows.append((name, before, after, ratio, ratio < 1 - tolerance))
+    return rows
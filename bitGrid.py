@@ -0,0 +1,273 @@
+import numpy as np
+from fitnessMetrics import MetricStream, checkerboard
+
+WORD_BITS = 64
+ONE = np.uint64(1)
+ALL_ONES = np.uint64(0xFFFFFFFFFFFFFFFF)
+POPCOUNT_TABLE = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+REVERSE_TABLE = np.array([int(f"{i:08b}"[::-1], 2) for i in range(256)], dtype=np.uint8)
+
+
+def word_count(cols):
+    """
+    POČET 64BITOVÝCH SLOV NA JEDEN ŘÁDEK
+    -------------------------------------
+    NUMBER OF 64-BIT WORDS PER ROW
+    """
+    return -(-cols // WORD_BITS)
+
+
+def last_word_mask(cols):
+    """
+    MASKA PLATNÝCH BITŮ V POSLEDNÍM SLOVĚ ŘÁDKU
+    --------------------------------------------
+    MASK OF THE VALID BITS IN THE LAST WORD OF A ROW
+    """
+    valid = cols - WORD_BITS * (word_count(cols) - 1)
+    return ALL_ONES if valid == WORD_BITS else np.uint64((1 << valid) - 1)
+
+
+def pack_grid(grid):
+    """
+    ZABALENÍ MŘÍŽKY (NEBO ZÁSOBNÍKU MŘÍŽEK) DO 64BITOVÝCH SLOV, BIT k SLOVA w = SLOUPEC 64*w + k
+    ----------------------------------------------------------------------------------------------
+    PACKS A GRID (OR A STACK OF GRIDS) INTO 64-BIT WORDS, BIT k OF WORD w = COLUMN 64*w + k
+    """
+    grid = np.asarray(grid)
+    cols = grid.shape[-1]
+    packed_bytes = np.packbits(grid != 0, axis=-1, bitorder="little")
+    padding = word_count(cols) * 8 - packed_bytes.shape[-1]
+    if padding:
+        pad_width = [(0, 0)] * (packed_bytes.ndim - 1) + [(0, padding)]
+        packed_bytes = np.pad(packed_bytes, pad_width)
+    return np.ascontiguousarray(packed_bytes).view("<u8").astype(np.uint64)
+
+
+def unpack_grid(packed, cols):
+    """
+    ROZBALENÍ SLOV ZPĚT NA MŘÍŽKU S HODNOTAMI 0/1 (dtype=int)
+    ----------------------------------------------------------
+    UNPACKS THE WORDS BACK INTO A GRID OF 0/1 VALUES (dtype=int)
+    """
+    packed_bytes = np.ascontiguousarray(packed.astype("<u8")).view(np.uint8)
+    return np.unpackbits(packed_bytes, axis=-1, count=cols, bitorder="little").astype(int)
+
+
+def packed_live_count(packed, axis=None):
+    """
+    POČET ŽIVÝCH BUNĚK (POČET NASTAVENÝCH BITŮ)
+    --------------------------------------------
+    NUMBER OF LIVE CELLS (NUMBER OF SET BITS)
+    """
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(packed).sum(axis=axis, dtype=np.int64)
+    counts = POPCOUNT_TABLE[np.ascontiguousarray(packed).view(np.uint8)]
+    counts = counts.reshape(packed.shape + (8,)).sum(axis=-1, dtype=np.int64)
+    return counts.sum(axis=axis)
+
+
+def reverse_columns(words, cols):
+    """
+    ŘÁDKY S OBRÁCENÝM POŘADÍM SLOUPCŮ (SLOUPEC c NESE HODNOTU SLOUPCE cols - 1 - c) BEZ ROZBALENÍ
+    ------------------------------------------------------------------------------------------------
+    ROWS WITH THE COLUMN ORDER REVERSED (COLUMN c HOLDS THE VALUE OF COLUMN cols - 1 - c) WITHOUT UNPACKING
+    """
+    packed_bytes = np.ascontiguousarray(words.astype("<u8")).view(np.uint8)
+    reversed_words = np.ascontiguousarray(REVERSE_TABLE[packed_bytes[..., ::-1]]).view("<u8").astype(np.uint64)
+    padding = word_count(cols) * WORD_BITS - cols
+    if padding == 0:
+        return reversed_words
+    shifted = reversed_words >> np.uint64(padding)
+    shifted[..., :-1] |= reversed_words[..., 1:] << np.uint64(WORD_BITS - padding)
+    return shifted
+
+
+def shift_from_west(words, cols):
+    """
+    ROVINA, VE KTERÉ BUŇKA (r, c) NESE HODNOTU BUŇKY (r, c - 1) NA TORU
+    ---------------------------------------------------------------------
+    PLANE IN WHICH CELL (r, c) HOLDS THE VALUE OF CELL (r, c - 1) ON THE TORUS
+    """
+    carry = np.roll(words >> np.uint64(WORD_BITS - 1), 1, axis=-1)
+    carry[..., 0] = (words[..., -1] >> np.uint64((cols - 1) % WORD_BITS)) & ONE
+    shifted = (words << ONE) | carry
+    shifted[..., -1] &= last_word_mask(cols)
+    return shifted
+
+
+def shift_from_east(words, cols):
+    """
+    ROVINA, VE KTERÉ BUŇKA (r, c) NESE HODNOTU BUŇKY (r, c + 1) NA TORU
+    ---------------------------------------------------------------------
+    PLANE IN WHICH CELL (r, c) HOLDS THE VALUE OF CELL (r, c + 1) ON THE TORUS
+    """
+    carry = np.roll((words & ONE) << np.uint64(WORD_BITS - 1), -1, axis=-1)
+    shifted = (words >> ONE) | carry
+    shifted[..., -1] = (words[..., -1] >> ONE) | ((words[..., 0] & ONE) << np.uint64((cols - 1) % WORD_BITS))
+    shifted[..., -1] &= last_word_mask(cols)
+    return shifted
+
+
+def full_adder(a, b, c):
+    """
+    ÚPLNÁ SČÍTAČKA NAD BITOVÝMI ROVINAMI - VRACÍ (SOUČET, PŘENOS)
+    -------------------------------------------------------------
+    FULL ADDER OVER BIT PLANES - RETURNS (SUM, CARRY)
+    """
+    partial_sum = a ^ b
+    return partial_sum ^ c, (a & b) | (partial_sum & c)
+
+
+def half_adder(a, b):
+    """
+    POLOVIČNÍ SČÍTAČKA NAD BITOVÝMI ROVINAMI - VRACÍ (SOUČET, PŘENOS)
+    -----------------------------------------------------------------
+    HALF ADDER OVER BIT PLANES - RETURNS (SUM, CARRY)
+    """
+    return a ^ b, a & b
+
+
+def neighbor_count_planes(words, cols):
+    """
+    POČET ŽIVÝCH SOUSEDŮ JAKO ČTYŘI BITOVÉ ROVINY (1, 2, 4, 8) - SČÍTAČKY NAD CELÝMI SLOVY
+    ----------------------------------------------------------------------------------------
+    NUMBER OF LIVE NEIGHBOURS AS FOUR BIT PLANES (1, 2, 4, 8) - ADDERS OVER WHOLE WORDS
+    """
+    north = np.roll(words, 1, axis=-2)
+    south = np.roll(words, -1, axis=-2)
+    planes = [north, south]
+    for row in (north, words, south):
+        planes.append(shift_from_west(row, cols))
+        planes.append(shift_from_east(row, cols))
+
+    sum1, carry1 = full_adder(planes[0], planes[1], planes[2])
+    sum2, carry2 = full_adder(planes[3], planes[4], planes[5])
+    sum3, carry3 = half_adder(planes[6], planes[7])
+    bit1, carry4 = full_adder(sum1, sum2, sum3)
+    twos, carry5 = full_adder(carry1, carry2, carry3)
+    bit2, carry6 = half_adder(twos, carry4)
+    bit4, bit8 = half_adder(carry5, carry6)
+    return bit1, bit2, bit4, bit8
+
+
+def step_packed(words, cols, table):
+    """
+    JEDEN KROK SIMULACE NAD ZABALENOU MŘÍŽKOU (NEBO ZÁSOBNÍKEM S TABULKAMI TVARU (POČET, 2, 9))
+    ---------------------------------------------------------------------------------------------
+    ONE SIMULATION STEP OVER A PACKED GRID (OR A STACK WITH TABLES OF SHAPE (COUNT, 2, 9))
+    """
+    table = np.asarray(table, dtype=bool)
+    masks = np.where(table, ALL_ONES, np.uint64(0))
+    if table.ndim == 3:
+        masks = np.moveaxis(masks, 0, -1)[..., None, None]
+
+    count_bits = neighbor_count_planes(words, cols)
+    inverted_bits = [~bit for bit in count_bits]
+    dead = ~words
+    new_words = np.zeros_like(words)
+    for neighbors in range(9):
+        if not table[..., neighbors].any():
+            continue
+        matches = count_bits[0] if neighbors & 1 else inverted_bits[0]
+        for position in range(1, 4):
+            matches = matches & (count_bits[position] if neighbors >> position & 1 else inverted_bits[position])
+        new_words |= matches & ((dead & masks[0, neighbors]) | (words & masks[1, neighbors]))
+    new_words[..., -1] &= last_word_mask(cols)
+    return new_words
+
+
+class PackedMetricStream(MetricStream):
+    def __init__(self, rows, cols, metrics):
+        """
+        METRIKY PŘÍMO NAD ZABALENÝMI SLOVY - POČTY BUNĚK JSOU POČTY NASTAVENÝCH BITŮ (changed = prev ^ cur,
+        checkerboard = XOR SE ZABALENOU ŠACHOVNICÍ, mirror = XOR S OBRÁCENÝMI ŘÁDKY A SLOUPCI)
+        ------------------------------------------------------------------------------------------------------
+        METRICS DIRECTLY OVER THE PACKED WORDS - CELL COUNTS ARE COUNTS OF SET BITS (changed = prev ^ cur,
+        checkerboard = XOR WITH THE PACKED CHECKERBOARD, mirror = XOR WITH THE REVERSED ROWS AND COLUMNS)
+        """
+        super().__init__(rows, cols, metrics)
+        self._packed_checkerboard = pack_grid(checkerboard(rows, cols))
+
+    def count(self, words):
+        return packed_live_count(words, axis=(-2, -1))
+
+    def changed_cells(self, states, prev_states):
+        return self.count(states ^ prev_states)
+
+    def mirror_differences(self, states):
+        return self.count(states ^ reverse_columns(states, self.cols)) + self.count(states ^ states[..., ::-1, :])
+
+    def checkerboard_matches(self, states):
+        return self.area - self.count(states ^ self._packed_checkerboard)
+
+
+class PackedEngine:
+    name = "packed"
+
+    def __init__(self, rows, cols):
+        self.rows = rows
+        self.cols = cols
+
+    def pack(self, grid):
+        """
+        PŘEVOD MŘÍŽKY NA VNITŘNÍ STAV (64 BUNĚK V JEDNOM SLOVĚ)
+        --------------------------------------------------------
+        CONVERTS A GRID TO THE INTERNAL STATE (64 CELLS PER WORD)
+        """
+        return pack_grid(grid)
+
+    def accepts(self, grid):
+        """
+        ENGINE 'packed' PŘIJME KAŽDOU MŘÍŽKU
+        -------------------------------------
+        THE 'packed' ENGINE ACCEPTS EVERY GRID
+        """
+        return True
+
+    def unpack(self, state):
+        """
+        PŘEVOD VNITŘNÍHO STAVU NA MŘÍŽKU (VŽDY NOVÁ KOPIE)
+        ---------------------------------------------------
+        CONVERTS THE INTERNAL STATE TO A GRID (ALWAYS A NEW COPY)
+        """
+        return unpack_grid(state, self.cols)
+
+    def step(self, state, rule):
+        """
+        NÁSLEDUJÍCÍ STAV PODLE PRAVIDLA
+        --------------------------------
+        NEXT STATE ACCORDING TO THE RULE
+        """
+        return step_packed(state, self.cols, rule.table)
+
+    def live_count(self, state):
+        """
+        POČET ŽIVÝCH BUNĚK VE STAVU
+        ----------------------------
+        NUMBER OF LIVE CELLS IN THE STATE
+        """
+        return int(packed_live_count(state))
+
+    def metrics(self, metrics):
+        """
+        VÝPOČET METRIK FITNESS FUNKCÍ PŘÍMO NAD ZABALENÝMI STAVY (BEZ ROZBALENÍ)
+        ---------------------------------------------------------------------------
+        FITNESS METRICS DIRECTLY OVER THE PACKED STATES (WITHOUT UNPACKING)
+        """
+        return PackedMetricStream(self.rows, self.cols, metrics)
+
+    def key(self, state):
+        """
+        KOMPAKTNÍ KLÍČ STAVU (ZABALENÁ SLOVA)
+        --------------------------------------
+        COMPACT STATE KEY (THE PACKED WORDS)
+        """
+        return state.tobytes()
+
+    def from_key(self, key):
+        """
+        OBNOVENÍ STAVU Z KLÍČE
+        -----------------------
+        RESTORES A STATE FROM A KEY
+        """
+        return np.frombuffer(key, dtype=np.uint64).reshape(self.rows, word_count(self.cols)).copy()
@@ -1,20 +1,224 @@
 import numpy as np
-import re
+from rule import as_rule
+from bitGrid import PackedEngine
+from symmetricGrid import SymmetricEngine
+from sparseGrid import SparseEngine
+from fitnessMetrics import MetricStream, FITNESS_METRICS
+from instrumentation import timed
+from trajectoryFile import TrajectoryWriter
+
+
+def neighbor_counts(grid):
+    """ 
+    VÝPOČET ŽIVÝCH SOUSEDŮ PRO CELOU MŘÍŽKU NAJEDNOU (TORUS)
+    ---------------------------------------------------------
+    NUMBER OF LIVE NEIGHBOURS FOR THE WHOLE GRID AT ONCE (TORUS)
+    """
+    row_sums = grid + np.roll(grid, 1, axis=-1) + np.roll(grid, -1, axis=-1)
+    return row_sums + np.roll(row_sums, 1, axis=-2) + np.roll(row_sums, -1, axis=-2) - grid
+
+
+def step_grid(grid, table):
+    """ 
+    JEDEN KROK SIMULACE PRO CELOU MŘÍŽKU POMOCÍ TABULKY PŘECHODŮ
+    -------------------------------------------------------------
+    ONE SIMULATION STEP FOR THE WHOLE GRID USING THE TRANSITION TABLE
+    """
+    if grid.dtype == bool:
+        grid = grid.view(np.uint8)
+    index = neighbor_counts(grid)
+    index += 9 * grid
+    return table.astype(grid.dtype, copy=False).ravel().take(index)
+
+
+def state_key(grid):
+    """ 
+    KOMPAKTNÍ KLÍČ STAVU MŘÍŽKY (1 BIT NA BUŇKU) PRO ROZPOZNÁNÍ OPAKOVÁNÍ
+    ----------------------------------------------------------------------
+    COMPACT KEY OF A GRID STATE (1 BIT PER CELL) FOR DETECTING REPEATS
+    """
+    return np.packbits(grid, axis=None).tobytes()
+
+
+def state_from_key(key, shape):
+    """ 
+    OBNOVENÍ MŘÍŽKY Z KLÍČE VYTVOŘENÉHO FUNKCÍ state_key
+    -----------------------------------------------------
+    RESTORES A GRID FROM A KEY CREATED BY state_key
+    """
+    cells = np.unpackbits(np.frombuffer(key, dtype=np.uint8), count=shape[0] * shape[1])
+    return cells.reshape(shape).astype(int)
+
+
+def cycle_position(start, period, generation):
+    """ 
+    INDEX STAVU V ZAZNAMENANÉ HISTORII, KTERÝ ODPOVÍDÁ GENERACI generation
+    (HISTORIE SE OD GENERACE start OPAKUJE S PERIODOU period)
+    -----------------------------------------------------------------------
+    INDEX OF THE STATE IN THE RECORDED HISTORY THAT MATCHES GENERATION generation
+    (THE HISTORY REPEATS FROM GENERATION start WITH PERIOD period)
+    """
+    if generation < start:
+        return generation
+    return start + (generation - start) % period
+
+
+class DenseEngine:
+    name = "dense"
+
+    def __init__(self, rows, cols):
+        self.rows = rows
+        self.cols = cols
+
+    def pack(self, grid):
+        """ 
+        VNITŘNÍM STAVEM JE PŘÍMO MŘÍŽKA
+        --------------------------------
+        THE INTERNAL STATE IS THE GRID ITSELF
+        """
+        return grid
+
+    def accepts(self, grid):
+        """ 
+        ENGINE 'dense' PŘIJME KAŽDOU MŘÍŽKU
+        ------------------------------------
+        THE 'dense' ENGINE ACCEPTS EVERY GRID
+        """
+        return True
+
+    def unpack(self, state):
+        """ 
+        MŘÍŽKA BEZ KOPÍROVÁNÍ
+        ----------------------
+        THE GRID WITHOUT COPYING
+        """
+        return state
+
+    def step(self, state, rule):
+        """ 
+        NÁSLEDUJÍCÍ STAV PODLE PRAVIDLA
+        --------------------------------
+        NEXT STATE ACCORDING TO THE RULE
+        """
+        return step_grid(state, rule.table)
+
+    def live_count(self, state):
+        """ 
+        POČET ŽIVÝCH BUNĚK VE STAVU
+        ----------------------------
+        NUMBER OF LIVE CELLS IN THE STATE
+        """
+        return np.sum(state)
+
+    def metrics(self, metrics):
+        """ 
+        VÝPOČET METRIK FITNESS FUNKCÍ PRO STAVY TOHOTO ENGINE
+        ------------------------------------------------------
+        FITNESS METRICS FOR THE STATES OF THIS ENGINE
+        """
+        return MetricStream(self.rows, self.cols, metrics)
+
+    def key(self, state):
+        """ 
+        KOMPAKTNÍ KLÍČ STAVU (VIZ state_key)
+        -------------------------------------
+        COMPACT STATE KEY (SEE state_key)
+        """
+        return state_key(state)
+
+    def from_key(self, key):
+        """ 
+        OBNOVENÍ STAVU Z KLÍČE
+        -----------------------
+        RESTORES A STATE FROM A KEY
+        """
+        return state_from_key(key, (self.rows, self.cols))
+
+
+ENGINES = {
+    "dense": DenseEngine,
+    "packed": PackedEngine,
+    "symmetric": SymmetricEngine,
+    "sparse": SparseEngine,
+}
 
 
 class CellularAutomaton:
-    def __init__(self, rows, cols, initial_grid=None):
+    def __init__(self, rows, cols, initial_grid=None, engine="dense"):
+        """ 
+        engine - 'dense' = MŘÍŽKA dtype=int, 'packed' = 64 BUNĚK V JEDNOM SLOVĚ (PRO VELKÉ MŘÍŽKY)
+                 'symmetric' = JEN OSMINA MŘÍŽKY PRO STAVY SYMETRICKÉ KOLEM STŘEDU (NAPŘ. PO initialize_center_cell),
+                               NESYMETRICKÉ MŘÍŽKY NEBO MŘÍŽKY, KTERÉ NEJSOU LICHÉ ČTVERCOVÉ, SE SIMULUJÍ JAKO 'dense'
+                 'sparse' = POČÍTÁ SE JEN OKNO KOLEM ŽIVÝCH BUNĚK (PRO VELKÉ, PŘEVÁŽNĚ PRÁZDNÉ MŘÍŽKY)
+        -------------------------------------------------------------------------------------------
+        engine - 'dense' = GRID OF dtype=int, 'packed' = 64 CELLS PER WORD (FOR LARGE GRIDS)
+                 'symmetric' = ONLY ONE EIGHTH OF THE GRID FOR STATES SYMMETRIC AROUND THE CENTRE (E.G. AFTER initialize_center_cell),
+                               GRIDS THAT ARE NOT SYMMETRIC OR NOT ODD AND SQUARE ARE SIMULATED AS 'dense'
+                 'sparse' = ONLY A WINDOW AROUND THE LIVE CELLS IS COMPUTED (FOR LARGE, MOSTLY EMPTY GRIDS)
+        """
+        if engine not in ENGINES:
+            raise ValueError(f"Invalid engine. Expected one of {', '.join(ENGINES)}.")
         self.rows = rows
         self.cols = cols 
+        self.engine = engine
+        self._preferred_engine = ENGINES[engine](rows, cols)
+        self._dense_engine = DenseEngine(rows, cols)
+        self._engine = self._preferred_engine
+        self._next_state = None
+        self._next_grid = None
+        self.recorder = None
         if initial_grid is not None:
             self.grid = initial_grid.copy()
             self.initial_grid = initial_grid.copy()
         else:
             self.grid = np.zeros((rows, cols), dtype=int)
             self.initial_grid = np.zeros((rows, cols), dtype=int)
+        self.rule = None
         self.birth_rules = []
         self.survival_rules = []
 
+    @property
+    def grid(self):
+        """ 
+        AKTUÁLNÍ MŘÍŽKA (U ENGINE 'packed' JDE O ROZBALENOU KOPII - ZMĚNY SE PROVÁDÍ PŘIŘAZENÍM)
+        ------------------------------------------------------------------------------------------
+        THE CURRENT GRID (WITH THE 'packed' ENGINE THIS IS AN UNPACKED COPY - CHANGE IT BY ASSIGNMENT)
+        """
+        return self._engine.unpack(self._state)
+
+    @grid.setter
+    def grid(self, grid):
+        if grid is not None and grid is self._next_grid:
+            self._state = self._next_state
+        else:
+            if self._preferred_engine.accepts(grid):
+                self._engine = self._preferred_engine
+            else:
+                self._engine = self._dense_engine
+            self._state = self._engine.pack(grid)
+        if self.recorder is not None:
+            self.recorder.append(self.grid)
+
+    @property
+    def active_engine(self):
+        """ 
+        NÁZEV ENGINE, KTERÝ PRÁVĚ SIMULUJE MŘÍŽKU (MŮŽE SE LIŠIT OD engine PO PŘECHODU NA 'dense')
+        --------------------------------------------------------------------------------------------
+        NAME OF THE ENGINE CURRENTLY SIMULATING THE GRID (MAY DIFFER FROM engine AFTER FALLING BACK TO 'dense')
+        """
+        return self._engine.name
+
+    @property
+    def next_grid(self):
+        """ 
+        MŘÍŽKA VYTVOŘENÁ POSLEDNÍM VOLÁNÍM apply_rules
+        -----------------------------------------------
+        THE GRID CREATED BY THE LAST CALL OF apply_rules
+        """
+        if self._next_grid is None and self._next_state is not None:
+            self._next_grid = self._engine.unpack(self._next_state)
+        return self._next_grid
+
     def randomize_grid(self, probability=0.3):
         """ 
         NÁHODNÉ POČÁTEČNÍ NASTAVENÍ MŘÍŽKY
@@ -30,10 +234,11 @@ class CellularAutomaton:
         -----------------------------------------------------------
         SETTING THE INITIAL GRID TO ONE LIVE CELL IN THE MIDDLE
         """
-        self.grid = np.zeros((self.rows, self.cols), dtype=int)
+        grid = np.zeros((self.rows, self.cols), dtype=int)
         center_row = self.rows // 2
         center_col = self.cols // 2
-        self.grid[center_row, center_col] = 1
+        grid[center_row, center_col] = 1
+        self.grid = grid
         
     def count_live_dead(self):
         """ 
@@ -42,32 +247,64 @@ class CellularAutomaton:
         SUM OF LIVING AND DEAD CELLS
         
         """
-        live_count = np.sum(self.grid)
-        dead_count = np.size(self.grid) - live_count
+        live_count = self._engine.live_count(self._state)
+        dead_count = self.rows * self.cols - live_count
         return live_count, dead_count
 
-    def apply_rules(self, rule_string):
+    @timed
+    def apply_rules(self, rule):
         """ 
         POUŽITÍ PRAVIDEL PRO MŘÍŽKU A VYTVOŘENÍ NASTÁVÁJÍCÍ MŘÍŽKY
+        PRAVIDLO MŮŽE BÝT TEXT 'Bxxx/Sxxx' NEBO OBJEKT Rule
         -----------------------------------------------------------
         APPLYING GRID RULES AND CREATING THE RESULTING GRID
+        THE RULE CAN BE A 'Bxxx/Sxxx' STRING OR A Rule OBJECT
         """
-        if not re.match(r'^B\d+/S\d+$', rule_string):
-            raise ValueError("Invalid rule format. Expected 'Bxxx/Sxxx'.")
-        b, s = rule_string.split('/')
-        self.birth_rules = [int(x) for x in b[1:]]
-        self.survival_rules = [int(x) for x in s[1:]]
-        new_grid = np.zeros((self.rows, self.cols), dtype=int)
-        for i in range(self.rows):
-            for j in range(self.cols):
-                neighbors = self.count_neighbors(i, j)
-                if self.grid[i, j] == 0 and neighbors in self.birth_rules:
-                    new_grid[i, j] = 1
-                elif self.grid[i, j] == 1 and neighbors not in self.survival_rules:
-                    new_grid[i, j] = 0
-                else:
-                    new_grid[i, j] = self.grid[i, j]
-        self.next_grid = new_grid
+        rule = as_rule(rule)
+        if rule is not self.rule:
+            self.rule = rule
+            self.birth_rules = list(rule.birth)
+            self.survival_rules = list(rule.survival)
+        self._next_state = self._engine.step(self._state, rule)
+        self._next_grid = None
+
+    def advance(self, rule):
+        """ 
+        POUŽITÍ PRAVIDEL A PŘECHOD NA NÁSLEDUJÍCÍ MŘÍŽKU (BEZ ROZBALOVÁNÍ U ENGINE 'packed')
+        -------------------------------------------------------------------------------------
+        APPLYING THE RULES AND MOVING TO THE RESULTING GRID (WITHOUT UNPACKING FOR THE 'packed' ENGINE)
+        """
+        self.apply_rules(rule)
+        self._state = self._next_state
+        if self.recorder is not None:
+            self.recorder.append(self.grid)
+
+    def record(self, path, seed=None, stats=True, chunk_frames=64):
+        """ 
+        ZAČÁTEK ZÁZNAMU TRAJEKTORIE DO SOUBORU path (trajectoryFile.py) - ZAPÍŠE SE AKTUÁLNÍ MŘÍŽKA A POTÉ KAŽDÁ
+        MŘÍŽKA NASTAVENÁ PŘIŘAZENÍM ca.grid NEBO VOLÁNÍM advance, DOKUD SE NEZAVOLÁ stop_recording
+        seed - SEMÍNKO POČÁTEČNÍ MŘÍŽKY, KTERÉ SE ULOŽÍ DO HLAVIČKY
+        --------------------------------------------------------------------------------------------------------
+        STARTS RECORDING A TRAJECTORY INTO THE FILE path (trajectoryFile.py) - THE CURRENT GRID IS WRITTEN AND THEN EVERY
+        GRID SET BY ASSIGNING ca.grid OR BY CALLING advance, UNTIL stop_recording IS CALLED
+        seed - SEED OF THE INITIAL GRID, STORED IN THE HEADER
+        """
+        self.stop_recording()
+        self.recorder = TrajectoryWriter(path, self.rows, self.cols, self.rule, seed, stats, chunk_frames)
+        self.recorder.append(self.grid)
+        return self.recorder
+
+    def stop_recording(self):
+        """ 
+        UKONČENÍ ZÁZNAMU (PRAVIDLO V HLAVIČCE = POSLEDNÍ POUŽITÉ PRAVIDLO, POKUD NEBYLO ZADÁNO)
+        -----------------------------------------------------------------------------------------
+        STOPS RECORDING (THE RULE IN THE HEADER = THE LAST RULE USED, IF NONE WAS GIVEN)
+        """
+        if self.recorder is not None:
+            if self.recorder.rule is None:
+                self.recorder.rule = self.rule
+            self.recorder.close()
+            self.recorder = None
 
     def count_neighbors(self, x, y):
         """ 
@@ -84,67 +321,74 @@ class CellularAutomaton:
                     count += 1
         return count
 
-    def min_count_alter(self, rule_string, generations):
+    @timed
+    def min_count_alter(self, rule, generations):
         """ 
         FITNESS FUNKCE - Nejmenší četnost živých buněk a zároveň alespoň jedna buňka živá
+        Jakmile mřížka vymře, je výsledek 0 a simulace končí
         ----------------------------------------------------------------------------------
         FITNESS FUNCTION - Least number of living cells and at least one living cell
+        As soon as the grid dies out the result is 0 and the simulation stops
         """
+        rule = as_rule(rule)
         self.randomize_grid()
+        metrics = self._engine.metrics(FITNESS_METRICS["min"])
         cell_count = 0
         min_living_cells = float('inf')
-        generations_survived = 0
 
         for _ in range(generations):
-            self.apply_rules(rule_string)
-            living_cells = np.sum(self.grid)
+            living_cells = metrics.measure(self._state)["live"]
+            if living_cells == 0:
+                return 0
             cell_count += living_cells
-            if living_cells > 0:
-                generations_survived += 1
-                min_living_cells = min(min_living_cells, living_cells)
+            min_living_cells = min(min_living_cells, living_cells)
             
-            self.grid = self.next_grid
+            self.advance(rule)
         
         fitness = int(10000 / min_living_cells) if min_living_cells > 0 else 0
 
-        if generations_survived < generations:
-            return 0
-        else:
-            return fitness
+        return fitness
 
-    def max_div(self, rule_string, generations):
+    @timed
+    def max_div(self, rule, generations):
         """ 
         FITNESS FUNKCE - Co největší rozdílnost hodnot v dvou po sobě jdoucích mřížkách
         --------------------------------------------------------------------------------
         FITNESS FUNCTION - Maximize the difference between two consecutive grids
         """
+        rule = as_rule(rule)
         self.randomize_grid()
-        self.apply_rules(rule_string)
-        prev_grid = np.copy(self.grid)
-        self.grid = self.next_grid
+        metrics = self._engine.metrics(FITNESS_METRICS["div"])
+        prev_state = self._state
+        self.advance(rule)
 
         count_div = 0
         for gen in range(1, generations):
-            self.apply_rules(rule_string)
-            
             if gen >= generations - 25:
-                diff_grid = np.logical_xor(self.grid, prev_grid)
-                count_div += np.sum(diff_grid)
-                prev_grid = np.copy(self.grid)
+                count_div += metrics.measure(self._state, prev_state)["changed"]
+                prev_state = self._state
             
-            self.grid = self.next_grid
+            self.advance(rule)
             
         fitness = int(count_div)
 
         return fitness
 
-    def symetry_fitness(self, rule_string, generations):
+    @timed
+    def symetry_fitness(self, rule, generations):
         """ 
         FITNESS FUNKCE - Symetrie a zajímavé vzory
+        Po prvním opakování stavu se simulace zastaví a zbývající generace se dopočítají z nalezeného cyklu
+        Hodnoty pro každou generaci počítá fitnessMetrics.MetricStream (metriky FITNESS_METRICS['sym'])
         -------------------------------------------
         FITNESS FUNCTION - Symmetry and interesting patterns
+        After the first repeated state the simulation stops and the remaining generations are taken from the detected cycle
+        The values for every generation are computed by fitnessMetrics.MetricStream (metrics FITNESS_METRICS['sym'])
         """
+        rule = as_rule(rule)
         self.initialize_center_cell()
+        engine = self._engine
+        metrics = engine.metrics(FITNESS_METRICS["sym"])
 
         complexity_score = 0
         pattern_score = 0
@@ -152,54 +396,78 @@ class CellularAutomaton:
         diversity_score = 0
         penalty = 0
 
-        prev_grid = self.grid.copy()
-        previous_states = set()
+        prev_state = self._state
+        previous_states = {}
+        history = []
+        scores = []
+        period = None
 
         for gen in range(generations):
-            self.apply_rules(rule_string)
-
-            current_state = self.grid.tostring()
-            if current_state in previous_states:
+            if period is not None:
+                complexity, pattern, density, diversity = scores[gen - period]
                 penalty += 50
-            previous_states.add(current_state)
+            else:
+                current_state = engine.key(self._state)
+                if current_state in previous_states:
+                    penalty += 50
+                    period = gen - previous_states[current_state]
+                else:
+                    previous_states[current_state] = gen
+                history.append(current_state)
 
-            complexity_score += np.sum(np.abs(self.grid - prev_grid))
+                measured = metrics.measure(self._state, prev_state)
+                complexity, pattern, density, diversity = (measured[name] for name in FITNESS_METRICS["sym"])
 
-            pattern_score += (self.rows * self.cols - np.sum(np.abs(self.grid - np.fliplr(self.grid))) - np.sum(np.abs(self.grid - np.flipud(self.grid)))) / (self.rows * self.cols)
+                if period is None:
+                    prev_state = self._state
+                    self.advance(rule)
+            scores.append((complexity, pattern, density, diversity))
 
-            density_score += np.sum(self.grid) / (self.rows * self.cols)
-            diversity_score += len(set(self.grid.flatten()))
+            complexity_score += complexity
+            pattern_score += pattern
+            density_score += density
+            diversity_score += diversity
 
-            prev_grid = self.grid.copy()
-            self.grid = self.next_grid
+        if period is not None:
+            start = len(history) - 1 - period
+            self._state = engine.from_key(history[cycle_position(start, period, generations)])
 
         total_score = complexity_score + pattern_score + density_score * diversity_score - penalty
         fitness = max(0, int(total_score / (10 + 0.1 * (self.rows - 11) ** 2)))
         
         return fitness
         
-    def alternating_pattern(self, rule_string, generations):
+    @timed
+    def alternating_pattern(self, rule, generations):
         """ 
         FITNESS FUNKCE - Šachovnicový vzor
+        Po prvním opakování stavu se simulace zastaví a poslední generace se určí z nalezeného cyklu
         ----------------------------------------
         FITNESS FUNCTION - Checkerboard pattern
+        After the first repeated state the simulation stops and the last generation is taken from the detected cycle
         """
+        rule = as_rule(rule)
         self.initialize_center_cell()
+        engine = self._engine
         pattern_score = 0
 
-        for gen in range(generations):
-            self.apply_rules(rule_string)
-            self.grid = self.next_grid.copy()
+        history = [engine.key(self._state)]
+        previous_states = {history[0]: 0}
+        for gen in range(1, generations + 1):
+            self.advance(rule)
 
-            if gen >= generations - 20:
-                checkerboard1 = np.indices((self.rows, self.cols)).sum(axis=0) % 2
-                checkerboard2 = 1 - checkerboard1
+            current_state = engine.key(self._state)
+            if current_state in previous_states:
+                start = previous_states[current_state]
+                last = cycle_position(start, gen - start, generations)
+                self._state = engine.from_key(history[last])
+                break
+            previous_states[current_state] = gen
+            history.append(current_state)
 
-                match1 = np.sum(self.grid == checkerboard1)
-                match2 = np.sum(self.grid == checkerboard2)
+        if generations > 0:
+            pattern_score = engine.metrics(FITNESS_METRICS["alt"]).measure(self._state)["checkerboard"]
 
-                pattern_score = max(match1, match2) / (self.rows * self.cols)
-            
-            fitness = (pattern_score - 0.5)*100
+        fitness = (pattern_score - 0.5)*100
 
-        return fitness     
\ No newline at end of file
+        return fitness
@@ -0,0 +1,168 @@
+import os
+import random
+from functools import partial
+from concurrent.futures import Future, ThreadPoolExecutor, ProcessPoolExecutor
+import numpy as np
+import instrumentation
+
+
+def split_chunks(items, chunk_size):
+    """
+    ROZDĚLENÍ SEZNAMU NA ČÁSTI O VELIKOSTI NEJVÝŠE chunk_size (POŘADÍ ZACHOVÁNO)
+    ------------------------------------------------------------------------------
+    SPLITS A LIST INTO CHUNKS OF AT MOST chunk_size ITEMS (ORDER IS PRESERVED)
+    """
+    return [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+
+
+def seed_worker():
+    """
+    NOVÉ NÁHODNÉ SEMÍNKO V KAŽDÉM PRACOVNÍM PROCESU (JINAK BY VŠECHNY ZDĚDILY STEJNÝ STAV)
+    ----------------------------------------------------------------------------------------
+    FRESH RANDOM SEED IN EVERY WORKER PROCESS (OTHERWISE ALL WOULD INHERIT THE SAME STATE)
+    """
+    np.random.seed()
+    random.seed()
+
+
+def completed_future(func, *args):
+    """
+    FUTURE S JIŽ HOTOVÝM VÝSLEDKEM VOLÁNÍ func(*args) (VÝJIMKA SE ULOŽÍ DO FUTURE)
+    ---------------------------------------------------------------------------------
+    A FUTURE WITH THE RESULT OF func(*args) ALREADY SET (AN EXCEPTION IS STORED IN THE FUTURE)
+    """
+    future = Future()
+    try:
+        future.set_result(func(*args))
+    except Exception as error:
+        future.set_exception(error)
+    return future
+
+
+class SerialBackend:
+    max_workers = 1
+
+    def map_chunks(self, func, items):
+        """
+        VYHODNOCENÍ VŠECH POLOŽEK JEDNÍM VOLÁNÍM func V HLAVNÍM PROCESU
+        ----------------------------------------------------------------
+        EVALUATES ALL ITEMS WITH A SINGLE CALL OF func IN THE MAIN PROCESS
+        """
+        items = list(items)
+        if not items:
+            return []
+        return list(func(items))
+
+    def submit(self, func, items):
+        """
+        VYHODNOCENÍ POLOŽEK HNED V HLAVNÍM PROCESU, VÝSLEDEK JE HOTOVÁ FUTURE
+        ----------------------------------------------------------------------
+        EVALUATES THE ITEMS RIGHT AWAY IN THE MAIN PROCESS, THE RESULT IS A COMPLETED FUTURE
+        """
+        return completed_future(lambda: list(func(list(items))))
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class PoolBackend(SerialBackend):
+    def __init__(self, executor_factory, max_workers=None, chunk_size=None, worker_timers=False):
+        """
+        SPOLEČNÝ ZÁKLAD BACKENDŮ SE SKUPINOU PRACOVNÍKŮ
+        executor_factory - TŘÍDA NEBO FUNKCE, KTERÁ Z max_workers VYTVOŘÍ concurrent.futures.Executor
+        worker_timers - True = PRACOVNÍCI MĚŘÍ V JINÝCH PROCESECH, PŘI ZAPNUTÉM MĚŘENÍ VRACÍ PŘÍRŮSTKY ČASOVAČŮ
+                        SPOLU S VÝSLEDKY A TY SE PŘIČTOU K ČASOVAČŮM HLAVNÍHO PROCESU (instrumentation.py)
+        ---------------------------------------------------------------------------------------------
+        COMMON BASE OF THE BACKENDS WITH A WORKER POOL
+        executor_factory - CLASS OR FUNCTION CREATING A concurrent.futures.Executor FROM max_workers
+        worker_timers - True = THE WORKERS MEASURE IN OTHER PROCESSES, WITH THE MEASUREMENT ENABLED THEY RETURN THE TIMER
+                        INCREMENTS TOGETHER WITH THE RESULTS AND THESE ARE ADDED TO THE TIMERS OF THE MAIN PROCESS (instrumentation.py)
+        """
+        self.executor_factory = executor_factory
+        self.worker_timers = worker_timers
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self._executor = None
+
+    @property
+    def executor(self):
+        """
+        SKUPINA PRACOVNÍKŮ SE VYTVOŘÍ JEDNOU A POUŽÍVÁ SE PRO VŠECHNY GENERACE
+        -----------------------------------------------------------------------
+        THE WORKER POOL IS CREATED ONCE AND REUSED FOR ALL GENERATIONS
+        """
+        if self._executor is None:
+            self._executor = self.executor_factory(max_workers=self.max_workers)
+        return self._executor
+
+    def map_chunks(self, func, items):
+        """
+        ROZDĚLENÍ POLOŽEK NA ČÁSTI, ODESLÁNÍ VŠECH ČÁSTÍ NAJEDNOU A SBĚR VÝSLEDKŮ V PŮVODNÍM POŘADÍ
+        chunk_size=None - JEDNA ČÁST NA KAŽDÉHO PRACOVNÍKA
+        ----------------------------------------------------------------------------------------------
+        SPLITS THE ITEMS INTO CHUNKS, SUBMITS ALL CHUNKS AT ONCE AND COLLECTS RESULTS IN THE ORIGINAL ORDER
+        chunk_size=None - ONE CHUNK PER WORKER
+        """
+        items = list(items)
+        if not items:
+            return []
+        chunk_size = self.chunk_size or -(-len(items) // self.max_workers)
+        futures = [self.submit_chunk(func, chunk) for chunk in split_chunks(items, chunk_size)]
+        results = []
+        for future in futures:
+            results.extend(future.result())
+        return results
+
+    def submit(self, func, items):
+        """
+        ODESLÁNÍ JEDNÉ ČÁSTI PRACOVNÍKŮM BEZ ČEKÁNÍ NA VÝSLEDEK (VRACÍ FUTURE SE SEZNAMEM VÝSLEDKŮ)
+        -------------------------------------------------------------------------------------------
+        SUBMITS ONE CHUNK TO THE WORKERS WITHOUT WAITING FOR THE RESULT (RETURNS A FUTURE OF THE RESULT LIST)
+        """
+        return self.submit_chunk(func, list(items))
+
+    def submit_chunk(self, func, chunk):
+        """
+        ODESLÁNÍ ČÁSTI PRACOVNÍKŮM - S worker_timers A ZAPNUTÝM MĚŘENÍM SE ČÁST ZMĚŘÍ V PRACOVNÍKOVI A JEHO PŘÍRŮSTKY
+        SE PŘIČTOU DŘÍVE, NEŽ FUTURE DOSTANE VÝSLEDEK
+        ---------------------------------------------------------------------------------------------------------------
+        SUBMITS A CHUNK TO THE WORKERS - WITH worker_timers AND THE MEASUREMENT ENABLED THE CHUNK IS MEASURED IN THE WORKER
+        AND ITS INCREMENTS ARE ADDED BEFORE THE FUTURE RECEIVES THE RESULT
+        """
+        if not (self.worker_timers and instrumentation.is_enabled()):
+            return self.executor.submit(func, chunk)
+        measured = Future()
+
+        def collect(future):
+            try:
+                result, delta = future.result()
+            except Exception as error:
+                measured.set_exception(error)
+                return
+            instrumentation.merge(delta)
+            measured.set_result(result)
+
+        self.executor.submit(instrumentation.measured_call, func, chunk).add_done_callback(collect)
+        return measured
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+class ThreadBackend(PoolBackend):
+    def __init__(self, max_workers=None, chunk_size=None):
+        super().__init__(ThreadPoolExecutor, max_workers, chunk_size)
+
+
+class ProcessBackend(PoolBackend):
+    def __init__(self, max_workers=None, chunk_size=None):
+        super().__init__(partial(ProcessPoolExecutor, initializer=seed_worker), max_workers, chunk_size,
+                         worker_timers=True)
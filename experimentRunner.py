@@ -0,0 +1,164 @@
+import os
+import time
+import threading
+from itertools import product
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from evaluationBackend import ProcessBackend
+from fitnessCache import FitnessCache
+from geneticAlgorithm import GeneticAlgorithm
+from progressEvents import QuietSink
+
+"""
+PARAMETRY MŘÍŽKY EXPERIMENTŮ (OSTATNÍ NÁZVY SE PŘEDAJÍ GeneticAlgorithm BEZE ZMĚNY)
+size - VELIKOST ČTVERCOVÉ MŘÍŽKY (rows = cols = size), population_size, mutation_rate, cagens, selection, fitfun, seeds
+seed - SEMÍNKO GENERÁTORŮ NÁHODNÝCH ČÍSEL BĚHU (OPAKOVÁNÍ NASTAVENÍ = VÍCE HODNOT, NAPŘ. "seed": [0, 1, 2])
+-------------------------------------------------------------------------------------------------------------------------
+PARAMETERS OF THE EXPERIMENT GRID (OTHER NAMES ARE PASSED TO GeneticAlgorithm UNCHANGED)
+size - SIZE OF THE SQUARE GRID (rows = cols = size), population_size, mutation_rate, cagens, selection, fitfun, seeds
+seed - SEED OF THE RUN'S RANDOM NUMBER GENERATORS (REPLICATES OF A SETTING = SEVERAL VALUES, E.G. "seed": [0, 1, 2])
+"""
+DEFAULT_SETTINGS = {
+    "size": 9,
+    "population_size": 150,
+    "mutation_rate": 0.01,
+    "cagens": 100,
+    "selection": "t",
+    "fitfun": "alt",
+    "seed": 0,
+}
+
+
+def parameter_grid(parameters):
+    """
+    VŠECHNY KOMBINACE HODNOT {NÁZEV: [HODNOTY]} JAKO SEZNAM NASTAVENÍ (CHYBĚJÍCÍ NÁZVY Z DEFAULT_SETTINGS)
+    ------------------------------------------------------------------------------------------------------
+    ALL COMBINATIONS OF THE VALUES {NAME: [VALUES]} AS A LIST OF SETTINGS (MISSING NAMES FROM DEFAULT_SETTINGS)
+    """
+    names = list(parameters)
+    return [dict(DEFAULT_SETTINGS, **dict(zip(names, values)))
+            for values in product(*(parameters[name] for name in names))]
+
+
+def ga_settings(settings):
+    """
+    PŘEVOD NASTAVENÍ EXPERIMENTU NA ARGUMENTY GeneticAlgorithm (size -> rows, cols)
+    -------------------------------------------------------------------------------
+    CONVERTS EXPERIMENT SETTINGS TO GeneticAlgorithm ARGUMENTS (size -> rows, cols)
+    """
+    arguments = dict(settings)
+    size = arguments.pop("size", None)
+    if size is not None:
+        arguments.setdefault("rows", size)
+        arguments.setdefault("cols", size)
+    return arguments
+
+
+class ExperimentRunner:
+    def __init__(self, runs, generations, cpu_budget=None, concurrent_runs=None, cache=None, progress=None):
+        """
+        PLÁNOVAČ EXPERIMENTŮ - KAŽDÉ NASTAVENÍ Z runs (NAPŘ. parameter_grid) JE JEDEN BĚH GENETICKÉHO ALGORITMU
+        VŠECHNY BĚHY SDÍLÍ JEDEN ProcessBackend S cpu_budget PRACOVNÍKY (None = POČET CPU) A JEDNU FitnessCache,
+        TAKŽE SE PROCESY SPUSTÍ JEN JEDNOU A PRAVIDLA OHODNOCENÁ V JEDNOM BĚHU SE V DALŠÍCH NESIMULUJÍ
+        concurrent_runs - POČET SOUČASNĚ ŘÍZENÝCH BĚHŮ (None = cpu_budget), SIMULACE VŠECH BĚHŮ ČEKAJÍ VE SPOLEČNÉ FRONTĚ
+        progress - PŘÍJEMCE UDÁLOSTÍ PRŮBĚHU VŠECH BĚHŮ (UDÁLOSTI MAJÍ POLOŽKU run), None = QuietSink()
+        KAŽDÝ BĚH MÁ VLASTNÍ GENERÁTORY ZE SEMÍNKA seed, TABULKU VÝSLEDKŮ LZE PROTO ZOPAKOVAT PŘI JAKÉMKOLI concurrent_runs
+        (seed=None = GLOBÁLNÍ GENERÁTORY SDÍLENÉ BĚHY, TAKOVÉ BĚHY OPAKOVATELNÉ NEJSOU)
+        ------------------------------------------------------------------------------------------------------------------
+        EXPERIMENT SCHEDULER - EVERY SETTING IN runs (E.G. parameter_grid) IS ONE GENETIC ALGORITHM RUN
+        ALL RUNS SHARE ONE ProcessBackend WITH cpu_budget WORKERS (None = NUMBER OF CPUS) AND ONE FitnessCache,
+        SO THE PROCESSES START ONLY ONCE AND RULES SCORED IN ONE RUN ARE NOT SIMULATED IN THE OTHERS
+        concurrent_runs - NUMBER OF RUNS DRIVEN AT THE SAME TIME (None = cpu_budget), THE SIMULATIONS OF ALL RUNS WAIT IN ONE QUEUE
+        progress - RECEIVER OF THE PROGRESS EVENTS OF ALL RUNS (THE EVENTS HAVE A run ENTRY), None = QuietSink()
+        EVERY RUN HAS ITS OWN GENERATORS FROM THE SEED seed, SO THE RESULTS TABLE CAN BE REPRODUCED WITH ANY concurrent_runs
+        (seed=None = GLOBAL GENERATORS SHARED BY THE RUNS, SUCH RUNS ARE NOT REPEATABLE)
+        """
+        self.runs = [dict(settings) for settings in runs]
+        self.generations = generations
+        self.cpu_budget = cpu_budget or os.cpu_count() or 1
+        self.concurrent_runs = concurrent_runs or self.cpu_budget
+        self.backend = ProcessBackend(max_workers=self.cpu_budget)
+        self.cache = cache if cache is not None else FitnessCache()
+        self.progress = progress if progress is not None else QuietSink()
+        self.results = []
+        self._lock = threading.Lock()
+
+    def run_one(self, index):
+        """
+        JEDEN BĚH - VRACÍ ŘÁDEK VÝSLEDKŮ: run, NASTAVENÍ, best_rule, best_fitness, curve (NEJLEPŠÍ FITNESS KAŽDÉ GENERACE),
+        wall_time (SEKUNDY), evaluations
+        ---------------------------------------------------------------------------------------------------------------
+        ONE RUN - RETURNS A RESULT ROW: run, SETTINGS, best_rule, best_fitness, curve (BEST FITNESS OF EVERY GENERATION),
+        wall_time (SECONDS), evaluations
+        """
+        settings = self.runs[index]
+        curve = []
+        ga = GeneticAlgorithm(**ga_settings(settings), backend=self.backend, cache=self.cache,
+                              progress=RunSink(index, curve, self.progress, self._lock))
+        start = time.perf_counter()
+        ga.evolve(self.generations)
+        wall_time = time.perf_counter() - start
+        best_fitness, best_rule = ga.best
+        return dict(run=index, **settings, best_rule=best_rule, best_fitness=float(best_fitness), curve=curve,
+                    wall_time=wall_time, evaluations=ga.evaluations)
+
+    def run(self):
+        """
+        SPUŠTĚNÍ VŠECH BĚHŮ (NEJVÝŠE concurrent_runs NAJEDNOU), VRACÍ TABULKU VÝSLEDKŮ (VIZ results_table)
+        -------------------------------------------------------------------------------------------------
+        RUNS ALL EXPERIMENTS (AT MOST concurrent_runs AT ONCE), RETURNS THE RESULTS TABLE (SEE results_table)
+        """
+        self.backend.submit(len, []).result()
+        with ThreadPoolExecutor(max_workers=self.concurrent_runs) as executor:
+            self.results = list(executor.map(self.run_one, range(len(self.runs))))
+        return results_table(self.results)
+
+    def close(self):
+        """
+        UKONČENÍ SDÍLENÝCH PRACOVNÍKŮ A ZÁPIS ZBÝVAJÍCÍCH UDÁLOSTÍ (SDÍLENÁ CACHE SE NEZAVÍRÁ)
+        ----------------------------------------------------------------------------------------
+        SHUTS DOWN THE SHARED WORKERS AND WRITES THE REMAINING EVENTS (THE SHARED CACHE IS NOT CLOSED)
+        """
+        self.backend.close()
+        self.progress.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class RunSink(QuietSink):
+    def __init__(self, run, curve, progress, lock):
+        """
+        PŘÍJEMCE UDÁLOSTÍ JEDNOHO BĚHU - NEJLEPŠÍ FITNESS GENERACE SE PŘIDÁ DO curve A UDÁLOST S POLOŽKOU run
+        SE PŘEDÁ SPOLEČNÉMU PŘÍJEMCI progress
+        ---------------------------------------------------------------------------------------------------------
+        EVENT RECEIVER OF ONE RUN - THE BEST FITNESS OF A GENERATION IS APPENDED TO curve AND THE EVENT WITH A run
+        ENTRY IS PASSED ON TO THE SHARED RECEIVER progress
+        """
+        self.run = run
+        self.curve = curve
+        self.progress = progress
+        self.lock = lock
+
+    def emit(self, event):
+        if event["event"] == "generation":
+            self.curve.append(event["best"])
+        with self.lock:
+            self.progress.emit(dict(event, run=self.run))
+
+
+def results_table(results):
+    """
+    SLOUPCOVÁ TABULKA VÝSLEDKŮ {SLOUPEC: np.ndarray} (curve MÁ TVAR (POČET BĚHŮ, GENERACE)), ULOŽENÍ PŘES
+    ruleAnalytics.save_table
+    --------------------------------------------------------------------------------------------------------
+    COLUMNAR RESULTS TABLE {COLUMN: np.ndarray} (curve HAS SHAPE (NUMBER OF RUNS, GENERATIONS)), SAVED WITH
+    ruleAnalytics.save_table
+    """
+    columns = []
+    for row in results:
+        columns.extend(name for name in row if name not in columns)
+    return {name: np.array([row.get(name) for row in results]) for name in columns}
@@ -0,0 +1,64 @@
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from experimentRunner import ExperimentRunner, parameter_grid
+from fitnessCache import FitnessCache
+from ruleAnalytics import save_table
+
+""" 
+NASTAVENÍ EXPERIMENTŮ
+parameters - MŘÍŽKA PARAMETRŮ GENETICKÉHO ALGORITMU {NÁZEV: [HODNOTY]}, SPUSTÍ SE KAŽDÁ KOMBINACE
+             (size = rows = cols, DALŠÍ NÁZVY JAKO V GeneticAlgorithm, CHYBĚJÍCÍ NÁZVY JAKO V main.py)
+             seed - SEMÍNKO BĚHU, STEJNÁ SEMÍNKA DAJÍ STEJNOU TABULKU, VÍCE HODNOT = OPAKOVÁNÍ KAŽDÉHO NASTAVENÍ
+generations - POČET GENERACÍ KAŽDÉHO BĚHU
+cpu_budget - POČET PRACOVNÍCH PROCESŮ SDÍLENÝCH VŠEMI BĚHY (None = POČET CPU)
+concurrent_runs - POČET SOUČASNĚ ŘÍZENÝCH BĚHŮ (None = cpu_budget)
+cache_path - SOUBOR SQLITE SE SDÍLENOU CACHE FITNESS HODNOT, KTERÁ PŘETRVÁ MEZI SPUŠTĚNÍMI (None = JEN V PAMĚTI)
+VÝSTUP: results.csv A results.npz - JEDEN ŘÁDEK NA BĚH (NASTAVENÍ, best_rule, best_fitness, curve, wall_time, evaluations)
+-----------------------------------------------------------------------
+EXPERIMENT SETTINGS
+parameters - GRID OF GENETIC ALGORITHM PARAMETERS {NAME: [VALUES]}, EVERY COMBINATION IS RUN
+             (size = rows = cols, OTHER NAMES AS IN GeneticAlgorithm, MISSING NAMES AS IN main.py)
+             seed - SEED OF A RUN, THE SAME SEEDS GIVE THE SAME TABLE, SEVERAL VALUES = REPLICATES OF EVERY SETTING
+generations - NUMBER OF GENERATIONS OF EVERY RUN
+cpu_budget - NUMBER OF WORKER PROCESSES SHARED BY ALL RUNS (None = NUMBER OF CPUS)
+concurrent_runs - NUMBER OF RUNS DRIVEN AT THE SAME TIME (None = cpu_budget)
+cache_path - SQLITE FILE WITH THE SHARED FITNESS CACHE THAT PERSISTS BETWEEN LAUNCHES (None = MEMORY ONLY)
+OUTPUT: results.csv AND results.npz - ONE ROW PER RUN (SETTINGS, best_rule, best_fitness, curve, wall_time, evaluations)
+"""
+parameters = {
+    "size": [9, 11],
+    "population_size": [50, 150],
+    "mutation_rate": [0.01, 0.05],
+    "selection": ["t", "r"],
+    "fitfun": ["alt"],
+    "seeds": [1],
+    "seed": [0],
+}
+generations = 30
+cpu_budget = None
+concurrent_runs = None
+cache_path = None
+
+if __name__ == "__main__":
+    current_directory = os.path.dirname(__file__)
+    runs = parameter_grid(parameters)
+    print(len(runs), "runs")
+
+    start_time = time.time()
+    with FitnessCache(path=cache_path) as cache, ExperimentRunner(runs, generations, cpu_budget, concurrent_runs,
+                                                                   cache) as runner:
+        table = runner.run()
+    print("Experiments finished in", round(time.time() - start_time, 2), "seconds")
+    print("Fitness cache:", cache.stats())
+
+    save_table(os.path.join(current_directory, 'results.csv'), table)
+    save_table(os.path.join(current_directory, 'results.npz'), table)
+
+    columns = [name for name in table if name != "curve"]
+    print("  ".join(columns))
+    for index in sorted(range(len(table["run"])), key=lambda i: -table["best_fitness"][i]):
+        print("  ".join(f"{table[name][index]:.2f}" if name in ("best_fitness", "wall_time") else str(table[name][index])
+                        for name in columns))
@@ -0,0 +1,224 @@
+import sqlite3
+import threading
+from collections import OrderedDict
+import numpy as np
+from rule import as_rule
+
+DETERMINISTIC_FITNESS = ("sym", "alt")
+STOCHASTIC_POLICIES = ("bypass", "mean")
+
+
+class FitnessCache:
+    def __init__(self, maxsize=65536, path=None, stochastic_policy="bypass", seeds=5):
+        if stochastic_policy not in STOCHASTIC_POLICIES:
+            raise ValueError("Invalid stochastic policy. Expected 'bypass' or 'mean'.")
+        self.maxsize = maxsize
+        self.path = path
+        self.stochastic_policy = stochastic_policy
+        self.seeds = seeds
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.bypassed = 0
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._connection = None
+        if path is not None:
+            self._connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS fitness ("
+                "rule INTEGER, fitfun TEXT, rows INTEGER, cols INTEGER, cagens INTEGER, seeds INTEGER, value, "
+                "PRIMARY KEY (rule, fitfun, rows, cols, cagens, seeds)) WITHOUT ROWID")
+            self._connection.commit()
+
+    def is_cacheable(self, fitfun):
+        """
+        DETERMINISTICKÉ FITNESS FUNKCE ('sym', 'alt') SE UKLÁDAJÍ VŽDY,
+        NÁHODNÉ ('min', 'div') JEN PŘI stochastic_policy='mean'
+        ----------------------------------------------------------------
+        DETERMINISTIC FITNESS FUNCTIONS ('sym', 'alt') ARE ALWAYS CACHED,
+        RANDOM ONES ('min', 'div') ONLY WITH stochastic_policy='mean'
+        """
+        return fitfun in DETERMINISTIC_FITNESS or self.stochastic_policy == "mean"
+
+    def seeds_for(self, fitfun):
+        """
+        POČET NÁHODNÝCH POČÁTEČNÍCH MŘÍŽEK, ZE KTERÝCH SE POČÍTÁ PRŮMĚR
+        -----------------------------------------------------------------
+        NUMBER OF RANDOM INITIAL GRIDS THE MEAN IS COMPUTED FROM
+        """
+        return 1 if fitfun in DETERMINISTIC_FITNESS else self.seeds
+
+    def key(self, rule, fitfun, rows, cols, cagens):
+        """
+        KLÍČ ZÁZNAMU - (KÓD PRAVIDLA, FITNESS FUNKCE, ŘÁDKY, SLOUPCE, cagens, POČET SEMÍNEK)
+        -------------------------------------------------------------------------------------
+        ENTRY KEY - (RULE CODE, FITNESS FUNCTION, ROWS, COLUMNS, cagens, NUMBER OF SEEDS)
+        """
+        code = int(rule) if isinstance(rule, (int, np.integer)) else as_rule(rule).code
+        return (code, fitfun, rows, cols, cagens, self.seeds_for(fitfun))
+
+    def get(self, key):
+        """
+        HLEDÁNÍ V PAMĚTI (LRU) A POTÉ NA DISKU, NALEZENÝ ZÁZNAM Z DISKU SE PŘESUNE DO PAMĚTI
+        ----------------------------------------------------------------------------------------
+        LOOKS UP THE IN-MEMORY LRU TIER AND THEN THE DISK, AN ENTRY FOUND ON DISK IS PROMOTED TO MEMORY
+        """
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            return self._memory[key]
+        if self._connection is not None:
+            row = self._connection.execute(
+                "SELECT value FROM fitness WHERE rule=? AND fitfun=? AND rows=? AND cols=? AND cagens=? AND seeds=?",
+                key).fetchone()
+            if row is not None:
+                self.disk_hits += 1
+                self._remember(key, row[0])
+                return row[0]
+        return None
+
+    def put_many(self, items):
+        """
+        ULOŽENÍ VÍCE ZÁZNAMŮ DO PAMĚTI I NA DISK (JEDNÍM ZÁPISEM)
+        -----------------------------------------------------------
+        STORES SEVERAL ENTRIES IN MEMORY AND ON DISK (IN ONE WRITE)
+        """
+        for key, value in items:
+            self._remember(key, value)
+        if self._connection is not None and items:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO fitness VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [key + (value,) for key, value in items])
+            self._connection.commit()
+
+    def lookup(self, rule, fitfun, rows, cols, cagens):
+        """
+        HLEDÁNÍ JEDNOHO PRAVIDLA (PRO ASYNCHRONNÍ VYHODNOCENÍ) - VRACÍ (KLÍČ, HODNOTA NEBO None)
+        PRO FITNESS FUNKCE, KTERÉ SE NEUKLÁDAJÍ, VRACÍ (None, None)
+        ------------------------------------------------------------------------------------------
+        LOOKS UP A SINGLE RULE (FOR ASYNCHRONOUS EVALUATION) - RETURNS (KEY, VALUE OR None)
+        FOR FITNESS FUNCTIONS THAT ARE NOT CACHED IT RETURNS (None, None)
+        """
+        with self._lock:
+            if not self.is_cacheable(fitfun):
+                self.bypassed += 1
+                return None, None
+            key = self.key(rule, fitfun, rows, cols, cagens)
+            value = self.get(key)
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return key, value
+
+    def store(self, key, value):
+        """
+        ULOŽENÍ HODNOTY PRO KLÍČ Z lookup
+        ----------------------------------
+        STORES THE VALUE FOR A KEY FROM lookup
+        """
+        with self._lock:
+            self.put_many([(key, value)])
+
+    def _remember(self, key, value):
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+
+    def evaluate(self, rules, fitfun, rows, cols, cagens, simulate):
+        """
+        FITNESS HODNOTY PRO SEZNAM PRAVIDEL - SIMULUJÍ SE JEN PRAVIDLA, KTERÁ NEJSOU ULOŽENA
+        simulate(rules) - FUNKCE VRACEJÍCÍ SEZNAM FITNESS HODNOT PRO SEZNAM PRAVIDEL
+        ------------------------------------------------------------------------------------
+        FITNESS VALUES FOR A LIST OF RULES - ONLY RULES THAT ARE NOT CACHED ARE SIMULATED
+        simulate(rules) - FUNCTION RETURNING A LIST OF FITNESS VALUES FOR A LIST OF RULES
+        """
+        if not self.is_cacheable(fitfun):
+            with self._lock:
+                self.bypassed += len(rules)
+            return simulate(rules)
+
+        results = [None] * len(rules)
+        pending = OrderedDict()
+        with self._lock:
+            for i, rule in enumerate(rules):
+                key = self.key(rule, fitfun, rows, cols, cagens)
+                if key in pending:
+                    self.hits += 1
+                    pending[key].append(i)
+                    continue
+                value = self.get(key)
+                if value is None:
+                    self.misses += 1
+                    pending[key] = [i]
+                else:
+                    self.hits += 1
+                    results[i] = value
+
+        if pending:
+            missing_rules = [rules[indices[0]] for indices in pending.values()]
+            seeds = self.seeds_for(fitfun)
+            if seeds > 1:
+                values = np.reshape(simulate(missing_rules * seeds), (seeds, len(missing_rules))).mean(axis=0).tolist()
+            else:
+                values = simulate(missing_rules)
+            with self._lock:
+                self.put_many(list(zip(pending.keys(), values)))
+            for indices, value in zip(pending.values(), values):
+                for i in indices:
+                    results[i] = value
+        return results
+
+    def state(self):
+        """
+        NASTAVENÍ, ZÁZNAMY V PAMĚTI (V POŘADÍ LRU) A POČITADLA PRO KONTROLNÍ BOD
+        -------------------------------------------------------------------------
+        SETTINGS, IN-MEMORY ENTRIES (IN LRU ORDER) AND COUNTERS FOR A CHECKPOINT
+        """
+        with self._lock:
+            return {
+                "settings": {"maxsize": self.maxsize, "path": self.path,
+                             "stochastic_policy": self.stochastic_policy, "seeds": self.seeds},
+                "entries": list(self._memory.items()),
+                "counters": (self.hits, self.misses, self.disk_hits, self.bypassed),
+            }
+
+    @classmethod
+    def from_state(cls, state):
+        """
+        NOVÁ CACHE OBNOVENÁ Z VÝSLEDKU state()
+        ---------------------------------------
+        A NEW CACHE RESTORED FROM THE RESULT OF state()
+        """
+        cache = cls(**state["settings"])
+        cache._memory = OrderedDict(state["entries"])
+        cache.hits, cache.misses, cache.disk_hits, cache.bypassed = state["counters"]
+        return cache
+
+    def stats(self):
+        """
+        POČITADLA ZÁSAHŮ A MINUTÍ
+        --------------------------
+        HIT AND MISS COUNTERS
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "disk_hits": self.disk_hits,
+            "bypassed": self.bypassed,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "size": len(self._memory),
+        }
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,174 @@
+from functools import lru_cache
+import numpy as np
+from instrumentation import timed
+
+"""
+METRIKY, ZE KTERÝCH SE SKLÁDAJÍ FITNESS FUNKCE (HODNOTY PRO JEDNU GENERACI)
+live - POČET ŽIVÝCH BUNĚK
+changed - POČET BUNĚK, KTERÉ SE ZMĚNILY OPROTI PŘEDCHOZÍ MŘÍŽCE
+mirror - SHODA S VODOROVNÝM A SVISLÝM ZRCADLENÍM ((PLOCHA - ROZDÍLY) / PLOCHA)
+density - PODÍL ŽIVÝCH BUNĚK
+diversity - POČET RŮZNÝCH HODNOT BUNĚK (1 NEBO 2)
+checkerboard - SHODA S BLIŽŠÍ ZE DVOU ŠACHOVNIC (0.5 AŽ 1)
+-----------------------------------------------------------------------------
+METRICS THE FITNESS FUNCTIONS ARE COMPOSED OF (VALUES FOR ONE GENERATION)
+live - NUMBER OF LIVE CELLS
+changed - NUMBER OF CELLS THAT CHANGED COMPARED TO THE PREVIOUS GRID
+mirror - AGREEMENT WITH THE HORIZONTAL AND VERTICAL MIRROR IMAGE ((AREA - DIFFERENCES) / AREA)
+density - SHARE OF LIVE CELLS
+diversity - NUMBER OF DISTINCT CELL VALUES (1 OR 2)
+checkerboard - AGREEMENT WITH THE CLOSER OF THE TWO CHECKERBOARDS (0.5 TO 1)
+"""
+METRICS = ("live", "changed", "mirror", "density", "diversity", "checkerboard")
+
+"""
+FITNESS FUNKCE JAKO KOMBINACE METRIK
+'min' - NEJMENŠÍ live BĚHEM SIMULACE
+'div' - SOUČET changed ZA POSLEDNÍCH 25 GENERACÍ
+'sym' - SOUČET changed + SOUČET mirror + SOUČET density * SOUČET diversity - PENALIZACE ZA OPAKOVÁNÍ
+'alt' - checkerboard POSLEDNÍ GENERACE
+----------------------------------------------------------------------
+FITNESS FUNCTIONS AS COMBINATIONS OF METRICS
+'min' - THE LOWEST live DURING THE SIMULATION
+'div' - SUM OF changed OVER THE LAST 25 GENERATIONS
+'sym' - SUM OF changed + SUM OF mirror + SUM OF density * SUM OF diversity - PENALTY FOR REPEATS
+'alt' - checkerboard OF THE LAST GENERATION
+"""
+FITNESS_METRICS = {
+    "min": ("live",),
+    "div": ("changed",),
+    "sym": ("changed", "mirror", "density", "diversity"),
+    "alt": ("checkerboard",),
+}
+
+
+@lru_cache(maxsize=64)
+def checkerboard(rows, cols):
+    """
+    ŠACHOVNICE (r + c) % 2 PRO DANOU VELIKOST MŘÍŽKY (VYTVOŘÍ SE JEN JEDNOU, JEN PRO ČTENÍ)
+    ----------------------------------------------------------------------------------------
+    CHECKERBOARD (r + c) % 2 FOR THE GIVEN GRID SIZE (CREATED ONLY ONCE, READ-ONLY)
+    """
+    board = np.indices((rows, cols)).sum(axis=0) % 2
+    board.flags.writeable = False
+    return board
+
+
+class MetricStream:
+    def __init__(self, rows, cols, metrics, domain=None):
+        """
+        VÝPOČET VYBRANÝCH METRIK PRO MŘÍŽKU NEBO ZÁSOBNÍK MŘÍŽEK V KAŽDÉ GENERACI
+        SPOLEČNÉ MEZIVÝSLEDKY SE POČÍTAJÍ JEN JEDNOU A POROVNÁNÍ SE ZAPISUJÍ DO PŘEDEM ALOKOVANÉHO BUFFERU
+        metrics - NÁZVY METRIK Z METRICS
+        domain - ZÁKLADNÍ OBLAST SYMETRIE (symmetricGrid.py), KDYŽ JSOU STAVY JEN BUŇKY OBLASTI
+        ENGINE S JINÝM VNITŘNÍM STAVEM (bitGrid.py, sparseGrid.py) PŘEPÍŠÍ POČÍTÁNÍ BUNĚK VE SVÉ PODTŘÍDĚ
+        ---------------------------------------------------------------------------------------------------
+        COMPUTES THE SELECTED METRICS FOR A GRID OR A STACK OF GRIDS IN EVERY GENERATION
+        SHARED INTERMEDIATE RESULTS ARE COMPUTED ONLY ONCE AND COMPARISONS ARE WRITTEN INTO A PREALLOCATED BUFFER
+        metrics - METRIC NAMES FROM METRICS
+        domain - FUNDAMENTAL DOMAIN OF THE SYMMETRY (symmetricGrid.py) WHEN THE STATES ARE ONLY THE DOMAIN CELLS
+        ENGINES WITH A DIFFERENT INTERNAL STATE (bitGrid.py, sparseGrid.py) OVERRIDE THE CELL COUNTING IN THEIR SUBCLASS
+        """
+        unknown = set(metrics) - set(METRICS)
+        if unknown:
+            raise ValueError(f"Unknown metrics: {', '.join(sorted(unknown))}.")
+        self.rows = rows
+        self.cols = cols
+        self.area = rows * cols
+        self.metrics = tuple(metrics)
+        self.domain = domain
+        self._buffer = np.empty(0, dtype=bool)
+        if domain is None:
+            self._axes = (-2, -1)
+            self._checkerboard = checkerboard(rows, cols)
+        else:
+            self._axes = -1
+            self._checkerboard = checkerboard(rows, cols)[domain.rep_rows, domain.rep_cols]
+
+    def scratch(self, shape):
+        """
+        PŘEDEM ALOKOVANÝ BUFFER DANÉHO TVARU (ZVĚTŠÍ SE JEN TEHDY, KDYŽ NESTAČÍ)
+        --------------------------------------------------------------------------
+        PREALLOCATED BUFFER OF THE GIVEN SHAPE (IT GROWS ONLY WHEN IT IS TOO SMALL)
+        """
+        size = int(np.prod(shape))
+        if self._buffer.size < size:
+            self._buffer = np.empty(size, dtype=bool)
+        return self._buffer[:size].reshape(shape)
+
+    def count(self, cells):
+        """
+        POČET NASTAVENÝCH BUNĚK V KAŽDÉ MŘÍŽCE (V OBLASTI SYMETRIE VÁŽENÝ VELIKOSTÍ OBĚŽNÝCH DRAH)
+        --------------------------------------------------------------------------------------------
+        NUMBER OF SET CELLS IN EACH GRID (WEIGHTED BY THE ORBIT SIZES IN A SYMMETRY DOMAIN)
+        """
+        if self.domain is None:
+            return np.count_nonzero(cells, axis=self._axes)
+        return cells @ self.domain.weights
+
+    def live_cells(self, states):
+        """
+        POČET ŽIVÝCH BUNĚK V KAŽDÉM STAVU
+        ----------------------------------
+        NUMBER OF LIVE CELLS IN EACH STATE
+        """
+        return self.count(states)
+
+    def changed_cells(self, states, prev_states):
+        """
+        POČET BUNĚK, KTERÉ SE LIŠÍ OD PŘEDCHOZÍHO STAVU
+        -------------------------------------------------
+        NUMBER OF CELLS THAT DIFFER FROM THE PREVIOUS STATE
+        """
+        return self.count(np.not_equal(states, prev_states, out=self.scratch(states.shape)))
+
+    def mirror_differences(self, states):
+        """
+        POČET ROZDÍLŮ OPROTI VODOROVNÉMU A SVISLÉMU ZRCADLENÍ DOHROMADY (V OBLASTI SYMETRIE VŽDY 0)
+        ---------------------------------------------------------------------------------------------
+        NUMBER OF DIFFERENCES FROM THE HORIZONTAL AND VERTICAL MIRROR IMAGE TOGETHER (ALWAYS 0 IN A SYMMETRY DOMAIN)
+        """
+        if self.domain is not None:
+            return np.zeros(states.shape[:-1]) if states.ndim > 1 else 0
+        buffer = self.scratch(states.shape)
+        horizontal = self.count(np.not_equal(states, states[..., ::-1], out=buffer))
+        vertical = self.count(np.not_equal(states, states[..., ::-1, :], out=buffer))
+        return horizontal + vertical
+
+    def checkerboard_matches(self, states):
+        """
+        POČET BUNĚK SHODNÝCH SE ŠACHOVNICÍ (r + c) % 2
+        ------------------------------------------------
+        NUMBER OF CELLS MATCHING THE CHECKERBOARD (r + c) % 2
+        """
+        return self.count(np.equal(states, self._checkerboard, out=self.scratch(states.shape)))
+
+    @timed
+    def measure(self, states, prev_states=None):
+        """
+        HODNOTY VŠECH VYBRANÝCH METRIK JAKO SLOVNÍK {NÁZEV: HODNOTA NEBO VEKTOR PRO ZÁSOBNÍK}
+        prev_states - PŘEDCHOZÍ STAV (POTŘEBNÝ JEN PRO METRIKU changed)
+        ---------------------------------------------------------------------------------------
+        VALUES OF ALL SELECTED METRICS AS A DICTIONARY {NAME: VALUE OR VECTOR FOR A STACK}
+        prev_states - PREVIOUS STATE (ONLY NEEDED FOR THE changed METRIC)
+        """
+        measured = {}
+        live = None
+        for name in self.metrics:
+            if name in ("live", "density", "diversity"):
+                if live is None:
+                    live = self.live_cells(states)
+                if name == "live":
+                    measured[name] = live
+                elif name == "density":
+                    measured[name] = live / self.area
+                else:
+                    measured[name] = 1 + ((live > 0) & (live < self.area))
+            elif name == "changed":
+                measured[name] = self.changed_cells(states, prev_states)
+            elif name == "mirror":
+                measured[name] = (self.area - self.mirror_differences(states)) / self.area
+            else:
+                matches = self.checkerboard_matches(states)
+                measured[name] = np.maximum(matches, self.area - matches) / self.area
+        return measured
@@ -1,18 +1,91 @@
+import os
 import random
-from concurrent.futures import ThreadPoolExecutor
+import time
+import pickle
 import operator
+from functools import partial
+from itertools import accumulate
+from contextlib import nullcontext
+from concurrent.futures import wait, FIRST_COMPLETED
+import numpy as np
 from cellularAutomaton import CellularAutomaton
+from batchedAutomaton import batch_fitness, batch_fitness_stats, STOCHASTIC_FITNESS
+from evaluationBackend import SerialBackend, completed_future
+from fitnessCache import FitnessCache
+from progressEvents import ConsoleSink
+from rule import as_rule
+import instrumentation
+from instrumentation import timed, SamplingProfiler
+
+PART_BITS = 9
+PART_MASK = (1 << PART_BITS) - 1
+GENOME_MASK = (1 << (2 * PART_BITS)) - 1
 
 
 class GeneticAlgorithm:
-    def __init__(self, rows, cols, population_size, mutation_rate, cagens, selection, fitfun):
+    def __init__(self, rows, cols, population_size, mutation_rate, cagens, selection, fitfun, backend=None, cache=None,
+                 genome="string", fidelity=None, progress=None, instrument=False, profile_generation=None, seeds=1, seed=None):
+        """ 
+        genome - 'string' = JEDINCI JSOU TEXTY 'Bxxx/Sxxx'
+                 'int' = JEDINCI JSOU 18BITOVÁ ČÍSLA V POLI NUMPY, SELEKCE, KŘÍŽENÍ A MUTACE PROBÍHAJÍ PRO CELOU GENERACI NAJEDNOU
+        fidelity - SuccessiveHalving(rungs, keep) = POPULACE SE NEJDŘÍVE VYHODNOTÍ LEVNĚ, PLNĚ JEN NEJLEPŠÍ PODÍL (None = VŠICHNI PLNĚ)
+        progress - PŘÍJEMCE UDÁLOSTÍ PRŮBĚHU (progressEvents.py), None = ConsoleSink() = JEDEN ŘÁDEK ZA GENERACI
+        instrument - True = MĚŘENÍ ČASU (instrumentation.py) PO DOBU evolve A evolve_steady_state, PŘÍRŮSTKY SE POSÍLAJÍ
+                     V KAŽDÉ UDÁLOSTI JAKO 'timers' (S ProcessBackend VČETNĚ ČASŮ Z PRACOVNÍCH PROCESŮ)
+        profile_generation - ČÍSLO GENERACE, KTERÁ SE PROJDE VZORKOVACÍM PROFILEREM (UDÁLOST 'profile'), None = NIKDY
+        seeds - POČET NÁHODNÝCH POČÁTEČNÍCH MŘÍŽEK PRO 'min' A 'div', FITNESS JE PRŮMĚR (ROZPTYL V self.fitness_variances);
+                V KAŽDÉ GENERACI DOSTANOU VŠICHNI JEDINCI STEJNÉ MŘÍŽKY (SPOLEČNÁ NÁHODNÁ ČÍSLA), TAKOVÉ HODNOTY SE NEUKLÁDAJÍ DO CACHE
+        seed - SEMÍNKO VLASTNÍCH GENERÁTORŮ NÁHODNÝCH ČÍSEL BĚHU (self.random, self.np_random), STEJNÉ SEMÍNKO DÁ STEJNÝ BĚH
+               I PŘI SOUBĚŽNÝCH BĚZÍCH; 'min' A 'div' SE PAK VŽDY POČÍTAJÍ ZE SPOLEČNÝCH MŘÍŽEK (I PRO seeds=1)
+               None = GLOBÁLNÍ GENERÁTORY MODULŮ random A np.random
+        -------------------------------------------------------------------------------------------------------------------
+        genome - 'string' = INDIVIDUALS ARE 'Bxxx/Sxxx' STRINGS
+                 'int' = INDIVIDUALS ARE 18-BIT INTEGERS IN A NUMPY ARRAY, SELECTION, CROSSOVER AND MUTATION RUN FOR THE WHOLE GENERATION AT ONCE
+        fidelity - SuccessiveHalving(rungs, keep) = THE POPULATION IS SCORED CHEAPLY FIRST, ONLY THE BEST FRACTION IN FULL (None = ALL IN FULL)
+        progress - RECEIVER OF PROGRESS EVENTS (progressEvents.py), None = ConsoleSink() = ONE LINE PER GENERATION
+        instrument - True = TIMING (instrumentation.py) FOR THE DURATION OF evolve AND evolve_steady_state, THE INCREMENTS
+                     ARE SENT IN EVERY EVENT AS 'timers' (WITH ProcessBackend INCLUDING THE TIMES FROM THE WORKER PROCESSES)
+        profile_generation - NUMBER OF THE GENERATION RUN UNDER THE SAMPLING PROFILER ('profile' EVENT), None = NEVER
+        seeds - NUMBER OF RANDOM INITIAL GRIDS FOR 'min' AND 'div', THE FITNESS IS THE MEAN (VARIANCE IN self.fitness_variances);
+                IN EVERY GENERATION ALL INDIVIDUALS GET THE SAME GRIDS (COMMON RANDOM NUMBERS), SUCH VALUES ARE NOT CACHED
+        seed - SEED OF THE RUN'S OWN RANDOM NUMBER GENERATORS (self.random, self.np_random), THE SAME SEED GIVES THE SAME RUN
+               EVEN WITH CONCURRENT RUNS; 'min' AND 'div' ARE THEN ALWAYS SCORED ON COMMON GRIDS (ALSO FOR seeds=1)
+               None = THE GLOBAL GENERATORS OF THE random AND np.random MODULES
+        """
+        if genome not in ("string", "int"):
+            raise ValueError("Invalid genome. Expected 'string' or 'int'.")
         self.population_size = population_size
         self.mutation_rate = mutation_rate
         self.gens = cagens
         self.selection = selection
         self.fitfun = fitfun
-        self.population = [self.generate_rule_string() for _ in range(population_size)]
+        self.genome = genome
+        self.seeds = seeds
+        self.seed = seed
+        self.random = random if seed is None else random.Random(seed)
+        self.np_random = np.random if seed is None else np.random.RandomState(seed)
+        self.common_seed = None
+        self.fitness_variances = None
+        if genome == "int":
+            self.population = self.generate_genomes(population_size)
+        else:
+            self.population = [self.generate_rule_string() for _ in range(population_size)]
+        self._roulette_values = None
+        self._roulette_weights = None
         self.ca = CellularAutomaton(rows, cols)
+        self.backend = backend if backend is not None else SerialBackend()
+        self.cache = cache
+        self.fidelity = fidelity
+        self.progress = progress if progress is not None else ConsoleSink()
+        self.evaluations = 0
+        self.evaluation_time = 0.0
+        self.profile_generation = profile_generation
+        self.instrument = instrument
+        self._timers = {}
+        self.generation = 0
+        self.fitness_values = []
+        self.gen_rule = None
+        self.best = None
 
     def check_rule(self, rule):
         """ 
@@ -20,7 +93,7 @@ class GeneticAlgorithm:
         ------------------------------------
         CHECKS THE CORRECTNESS OF THE RULES 
         """
-        b, s = rule.split('/')
+        b, s = str(rule).split('/')
         sorted_b = ''.join(sorted(set(b)))
         sorted_s = ''.join(sorted(set(s)))
         return b == sorted_b and s == sorted_s
@@ -31,12 +104,7 @@ class GeneticAlgorithm:
         -----------------------------------------------------
         REMOVES DUPLICATE NUMBERS IN THE RULES AND SORTS THEM
         """
-        b, s = rule.split('/')
-        b = b[1:]
-        s = s[1:]
-        sorted_b = ''.join(sorted(set(b)))
-        sorted_s = ''.join(sorted(set(s)))
-        return f"B{sorted_b}/S{sorted_s}"
+        return str(as_rule(rule))
 
     def generate_rule_string(self):
         """ 
@@ -44,11 +112,33 @@ class GeneticAlgorithm:
         ----------------------------------------
         CREATES AN INITIAL RANDOM RULE
         """
-        b_conditions = ''.join(sorted(random.sample(['0', '1', '2', '3', '4', '5', '6', '7', '8'], random.randint(1, 8))))
-        s_conditions = ''.join(sorted(random.sample(['0', '1', '2', '3', '4', '5', '6', '7', '8'], random.randint(1, 8))))
+        b_conditions = ''.join(sorted(self.random.sample(['0', '1', '2', '3', '4', '5', '6', '7', '8'], self.random.randint(1, 8))))
+        s_conditions = ''.join(sorted(self.random.sample(['0', '1', '2', '3', '4', '5', '6', '7', '8'], self.random.randint(1, 8))))
         return f'B{b_conditions}/S{s_conditions}'
+
+    def generate_genomes(self, count):
+        """ 
+        VYTVOŘENÍ count NÁHODNÝCH 18BITOVÝCH GENOMŮ (V KAŽDÉ ČÁSTI 1 AŽ 8 ČÍSEL, JAKO generate_rule_string)
+        --------------------------------------------------------------------------------------------------
+        CREATES count RANDOM 18-BIT GENOMES (1 TO 8 NUMBERS IN EACH PART, LIKE generate_rule_string)
+        """
+        genomes = np.zeros(count, dtype=np.int64)
+        for shift in (0, PART_BITS):
+            sizes = self.np_random.randint(1, PART_BITS, size=count)
+            ranks = np.argsort(np.argsort(self.np_random.rand(count, PART_BITS), axis=1), axis=1)
+            bits = ranks < sizes[:, None]
+            genomes |= (bits << np.arange(PART_BITS)).sum(axis=1) << shift
+        return genomes
+
+    def display_rule(self, rule):
+        """ 
+        TEXT 'Bxxx/Sxxx' JEDINCE PRO VÝPIS
+        -----------------------------------
+        THE 'Bxxx/Sxxx' STRING OF AN INDIVIDUAL FOR DISPLAY
+        """
+        return rule if isinstance(rule, str) else str(as_rule(rule))
     
-    def simulate_rule(self, rule_string):
+    def simulate_rule(self, rule):
         """ 
         SIMULACE CELULÁRNÍHO AUTOMATU
         
@@ -66,33 +156,131 @@ class GeneticAlgorithm:
         local_ca.symetry_fitness - INTERESTING PATTERNS AND SYMMETRIES
         local_ca.alternating_pattern - CHECKERBOARD PATTERN
         """
+        rule = as_rule(rule)
         local_ca = CellularAutomaton(self.ca.rows, self.ca.cols)
         if self.fitfun == "min":
-            return local_ca.min_count_alter(rule_string, self.gens)
+            return local_ca.min_count_alter(rule, self.gens)
         elif self.fitfun == "div":
-            return local_ca.max_div(rule_string, self.gens)
+            return local_ca.max_div(rule, self.gens)
         elif self.fitfun == "sym":
-            return local_ca.symetry_fitness(rule_string, self.gens)
+            return local_ca.symetry_fitness(rule, self.gens)
         elif self.fitfun == "alt":
-            return local_ca.alternating_pattern(rule_string, self.gens)
+            return local_ca.alternating_pattern(rule, self.gens)
         else:
             print("NEPLATNÉ NASTAVENÍ FITNESS FUNKCE")
     
+    def evaluate_rules(self, rules, rows=None, cols=None, cagens=None):
+        """ 
+        FITNESS HODNOTY PRO SEZNAM PRAVIDEL (PŘES self.cache, POKUD JE NASTAVENA, A self.backend)
+        rows, cols, cagens - NEZADANÉ HODNOTY SE PŘEVEZMOU Z NASTAVENÍ GENETICKÉHO ALGORITMU
+        ------------------------------------------------------------------------------------------
+        FITNESS VALUES FOR A LIST OF RULES (THROUGH self.cache, IF SET, AND self.backend)
+        rows, cols, cagens - VALUES NOT GIVEN ARE TAKEN FROM THE GENETIC ALGORITHM SETTINGS
+        """
+        rows = self.ca.rows if rows is None else rows
+        cols = self.ca.cols if cols is None else cols
+        cagens = self.gens if cagens is None else cagens
+        if self.uses_common_seeds():
+            return [mean for mean, _ in self.evaluate_rule_stats(rules, rows, cols, cagens)]
+        evaluate = partial(batch_fitness, rows=rows, cols=cols, generations=cagens, fitfun=self.fitfun)
+        simulate = partial(self.backend.map_chunks, evaluate)
+        if self.cache is None:
+            return simulate(rules)
+        return self.cache.evaluate(rules, self.fitfun, rows, cols, cagens, simulate)
+
+    def uses_common_seeds(self):
+        """ 
+        True, POKUD SE FITNESS POČÍTÁ JAKO PRŮMĚR ZE self.seeds SPOLEČNÝCH NÁHODNÝCH MŘÍŽEK
+        (S self.seed VŽDY, ABY MŘÍŽKY ZÁVISELY JEN NA GENERÁTORU BĚHU)
+        --------------------------------------------------------------------------------------
+        True IF THE FITNESS IS COMPUTED AS THE MEAN OVER self.seeds COMMON RANDOM GRIDS
+        (ALWAYS WITH self.seed, SO THE GRIDS DEPEND ONLY ON THE RUN'S GENERATOR)
+        """
+        return (self.seeds > 1 or self.seed is not None) and self.fitfun in STOCHASTIC_FITNESS
+
+    def evaluate_rule_stats(self, rules, rows=None, cols=None, cagens=None):
+        """ 
+        (PRŮMĚR, ROZPTYL) FITNESS PRO SEZNAM PRAVIDEL ZE self.seeds MŘÍŽEK SEMÍNKA self.common_seed
+        (VŠECHNY ČÁSTI self.backend SIMULUJÍ STEJNÉ MŘÍŽKY, BEZ self.cache)
+        -------------------------------------------------------------------------------------------
+        (MEAN, VARIANCE) OF THE FITNESS FOR A LIST OF RULES OVER self.seeds GRIDS OF THE SEED self.common_seed
+        (ALL CHUNKS OF self.backend SIMULATE THE SAME GRIDS, WITHOUT self.cache)
+        """
+        rows = self.ca.rows if rows is None else rows
+        cols = self.ca.cols if cols is None else cols
+        cagens = self.gens if cagens is None else cagens
+        evaluate = partial(batch_fitness_stats, rows=rows, cols=cols, generations=cagens, fitfun=self.fitfun,
+                           seeds=self.seeds, seed=self.common_seed)
+        return self.backend.map_chunks(evaluate, rules)
+
+    @timed
     def evaluate_fitness(self):
         """ 
         URČENÍ FITNESS HODNOTY PRO KAŽDÉHO JEDINCE Z GENERACE
+        (JIŽ OHODNOCENÁ PRAVIDLA SE BEROU Z self.cache, OSTATNÍ SE SIMULUJÍ PŘES self.backend)
         ------------------------------------------------------
         DETERMINES FITNESS VALUES FOR EACH INDIVIDUAL IN THE GENERATION
+        (RULES ALREADY SCORED ARE TAKEN FROM self.cache, THE REST ARE SIMULATED THROUGH self.backend)
+        """
+        start = time.perf_counter()
+        if self.uses_common_seeds():
+            self.common_seed = int(self.np_random.randint(2 ** 31 - 1))
+        if self.fidelity is None and self.uses_common_seeds():
+            fitness_values, self.fitness_variances = map(list, zip(*self.evaluate_rule_stats(self.population)))
+        elif self.fidelity is None:
+            fitness_values = self.evaluate_rules(self.population)
+        else:
+            fitness_values = self.fidelity.evaluate(self, self.population)
+        self.evaluation_time += time.perf_counter() - start
+        self.evaluations += len(fitness_values)
+        return [(fitness_value, self.display_rule(rule)) for fitness_value, rule in zip(fitness_values, self.population)]
+
+    def report(self, event, generation, fitness_values, **fields):
+        """ 
+        ODESLÁNÍ SOUHRNU OHODNOCENÉ POPULACE DO self.progress (DOBA VYHODNOCENÍ SE POČÍTÁ OD MINULÉHO SOUHRNU)
+        fields - DALŠÍ POLOŽKY UDÁLOSTI (NAPŘ. ČÍSLO OSTROVA)
+        ---------------------------------------------------------------------------------------------------------
+        SENDS A SUMMARY OF THE SCORED POPULATION TO self.progress (EVALUATION TIME IS COUNTED SINCE THE LAST SUMMARY)
+        fields - EXTRA EVENT ENTRIES (E.G. THE ISLAND NUMBER)
+        """
+        fitness = np.array([fitness_value for fitness_value, _ in fitness_values], dtype=float)
+        best = int(np.argmax(fitness))
+        summary = {
+            "event": event,
+            "generation": generation,
+            "best": float(fitness[best]),
+            "best_rule": fitness_values[best][1],
+            "mean": float(fitness.mean()),
+            "worst": float(fitness.min()),
+            "diversity": len({rule for _, rule in fitness_values}) / len(fitness_values),
+            "evaluation_time": self.evaluation_time,
+            "evaluations": self.evaluations,
+            "cache_hits": 0 if self.cache is None else self.cache.hits,
+            "cache_misses": 0 if self.cache is None else self.cache.misses,
+        }
+        if event == "generation" and self.fitness_variances is not None:
+            summary["best_variance"] = float(self.fitness_variances[best])
+            summary["mean_variance"] = float(np.mean(self.fitness_variances))
+        if self.instrument:
+            timers = instrumentation.snapshot()
+            summary["timers"] = instrumentation.difference(timers, self._timers)
+            self._timers = timers
+        summary.update(fields)
+        self.evaluation_time = 0.0
+        self.progress.emit(summary)
+
+    def timing(self):
+        """ 
+        BLOK with, PO JEHOŽ DOBU SE MĚŘÍ ČAS (JEN S instrument=True) - PO SKONČENÍ SE MĚŘENÍ ZASE VYPNE
+        PŘÍRŮSTKY V report SE POČÍTAJÍ OD ZAČÁTKU BLOKU
+        ---------------------------------------------------------------------------------------------------
+        with BLOCK FOR WHOSE DURATION THE TIME IS MEASURED (ONLY WITH instrument=True) - AFTERWARDS THE MEASUREMENT IS
+        SWITCHED OFF AGAIN. THE INCREMENTS IN report ARE COUNTED FROM THE START OF THE BLOCK
         """
-        with ThreadPoolExecutor(max_workers=10) as executor:
-            results = []
-            for rule_string in self.population:
-                future = executor.submit(self.simulate_rule, rule_string)
-                fitness_value = future.result()
-                print(fitness_value, "  (", rule_string,")")
-                results.append((fitness_value, rule_string))
-        return results
+        self._timers = instrumentation.snapshot()
+        return instrumentation.measuring(self.instrument)
 
+    @timed
     def select_parents(self, fitness_values, tournament_size=2):
         """ 
         VÝBĚR DVOU RODIČŮ PRO KŘÍŽENÍ (METODA VÁŽENÉ RULETY NEBO TURNAJE)
@@ -115,7 +303,7 @@ class GeneticAlgorithm:
         TOURNAMENT SELECTION
         """
         def tournament():
-            participants = random.sample(fitness_values, tournament_size)
+            participants = self.random.sample(fitness_values, tournament_size)
             winner = max(participants, key=lambda participant: participant[0])
             return winner
 
@@ -128,13 +316,19 @@ class GeneticAlgorithm:
     def roulette_selection(self, fitness_values):
         """ 
         SELEKCE VAZENOU RULETOU
+        (KUMULATIVNÍ VÁHY SE POČÍTAJÍ JEN JEDNOU ZA GENERACI)
         --------------------------
         WEIGHTED RULLETE SELECTION
+        (CUMULATIVE WEIGHTS ARE COMPUTED ONLY ONCE PER GENERATION)
         """
-        total_fitness = sum(fitness for fitness, _ in fitness_values)
-        probabilities = [fitness / total_fitness for fitness, _ in fitness_values]
-        return random.choices(fitness_values, weights=probabilities, k=2)
+        if fitness_values is not self._roulette_values:
+            total_fitness = sum(fitness for fitness, _ in fitness_values)
+            probabilities = [fitness / total_fitness for fitness, _ in fitness_values]
+            self._roulette_values = fitness_values
+            self._roulette_weights = list(accumulate(probabilities))
+        return self.random.choices(fitness_values, cum_weights=self._roulette_weights, k=2)
 
+    @timed
     def crossover(self, parent1, parent2):
         """ 
         PROCES KŘÍŽENÍ DVOU RODIČŮ A TVORBA DVOU POTOMKŮ (PRAVIDLO JE ROZDĚLENO NA DVĚ ČÁSTI A TY JSOU NÁSLEDNĚ JEDNOBODOVĚ KŘÍŽENY)
@@ -143,8 +337,8 @@ class GeneticAlgorithm:
         THE PROCESS OF CROSSBREEDING OF TWO PARENTS AND CREATING TWO OFFSPRING (THE RULE IS DIVIDED INTO TWO PARTS AND THEY ARE SUBSEQUENTLY 
         CROSSED AT ONE POINT) THEN THE CORRECTNESS OF THE FORMAT OF THE NEWLY CREATED RULES IS CHECKED, POSSIBLE CORRECTION IS DONE IF NEEDED
         """
-        b1, s1 = parent1.split('/')
-        b2, s2 = parent2.split('/')
+        b1, s1 = str(parent1).split('/')
+        b2, s2 = str(parent2).split('/')
         b1, b2 = b1[1:], b2[1:]
         s1, s2 = s1[1:], s2[1:]
 
@@ -162,18 +356,19 @@ class GeneticAlgorithm:
             child2 = self.sort_and_remove_duplicates(child2)
         return child1, child2
 
+    @timed
     def mutate(self, individual):
         """
         OPERÁTOR MUTACE - POKUD JE NÁHODNĚ VYBRANÉ ČÍSLO MENŠÍ NEŽ self.mutation_rate, DOCHÁZÍ K MUTACI GENU.
         -------------------------------------------------------------------------------------------------------
         MUTATION OPERATOR - IF A RANDOMLY SELECTED NUMBER IS LESS THAN self.mutation_rate, A GENE IS MUTATED.
         """
-        if random.random() < self.mutation_rate:
-            b, s = individual.split('/')
+        if self.random.random() < self.mutation_rate:
+            b, s = str(individual).split('/')
             b_numbers = b[1:]
             s_numbers = s[1:]
 
-            if random.random() < 0.5:
+            if self.random.random() < 0.5:
                 target_list = list(b_numbers)
                 part = 'B'
             else:
@@ -185,12 +380,12 @@ class GeneticAlgorithm:
             if not available_positions:
                 return individual
 
-            selected_position = random.choice(available_positions)
+            selected_position = self.random.choice(available_positions)
             existing_genes = set(target_list)
-            new_gene = str(random.randint(0, 8))
+            new_gene = str(self.random.randint(0, 8))
 
             while new_gene in existing_genes:
-                new_gene = str(random.randint(0, 8))
+                new_gene = str(self.random.randint(0, 8))
 
             target_list[selected_position] = new_gene
 
@@ -204,20 +399,174 @@ class GeneticAlgorithm:
         else:
             return self.sort_and_remove_duplicates(individual)
   
-    def evolve(self, generations):
+    def select_parent_indices(self, fitness, count, tournament_size=2):
+        """ 
+        VÝBĚR count RODIČŮ NAJEDNOU (INDEXY DO POPULACE), TURNAJEM NEBO VÁŽENOU RULETOU PODLE self.selection
+        ---------------------------------------------------------------------------------------------------
+        SELECTS count PARENTS AT ONCE (INDICES INTO THE POPULATION), BY TOURNAMENT OR WEIGHTED ROULETTE ACCORDING TO self.selection
+        """
+        if self.selection == "t":
+            participants = self.np_random.randint(0, len(fitness), size=(count, tournament_size))
+            return participants[np.arange(count), np.argmax(fitness[participants], axis=1)]
+        elif self.selection == "r":
+            total_fitness = fitness.sum()
+            probabilities = fitness / total_fitness if total_fitness > 0 else None
+            return self.np_random.choice(len(fitness), size=count, p=probabilities)
+
+    def crossover_genomes(self, parents1, parents2):
+        """ 
+        JEDNOBODOVÉ KŘÍŽENÍ ČÁSTÍ B A S PRO VŠECHNY DVOJICE RODIČŮ NAJEDNOU (BOD KŘÍŽENÍ JE NÁHODNÝ BIT)
+        -------------------------------------------------------------------------------------------------
+        ONE-POINT CROSSOVER OF THE B AND S PARTS FOR ALL PARENT PAIRS AT ONCE (THE CROSSOVER POINT IS A RANDOM BIT)
+        """
+        count = len(parents1)
+        birth_cut = self.np_random.randint(1, PART_BITS, size=count)
+        survival_cut = self.np_random.randint(1, PART_BITS, size=count)
+        mask = ((1 << birth_cut) - 1) | (((1 << survival_cut) - 1) << PART_BITS)
+        child1 = (parents1 & mask) | (parents2 & ~mask & GENOME_MASK)
+        child2 = (parents2 & mask) | (parents1 & ~mask & GENOME_MASK)
+        return child1, child2
+
+    def mutate_genomes(self, genomes):
+        """ 
+        MUTACE CELÉ GENERACE NAJEDNOU - S PRAVDĚPODOBNOSTÍ self.mutation_rate SE V ČÁSTI B NEBO S
+        JEDNO PŘÍTOMNÉ ČÍSLO NAHRADÍ JINÝM, KTERÉ V ČÁSTI JEŠTĚ NENÍ (STEJNĚ JAKO mutate)
+        --------------------------------------------------------------------------------------
+        MUTATION OF THE WHOLE GENERATION AT ONCE - WITH PROBABILITY self.mutation_rate ONE NUMBER PRESENT
+        IN THE B OR S PART IS REPLACED BY ANOTHER ONE NOT YET IN THAT PART (SAME AS mutate)
+        """
+        count = len(genomes)
+        mutating = self.np_random.rand(count) < self.mutation_rate
+        shift = np.where(self.np_random.rand(count) < 0.5, 0, PART_BITS)
+        bits = (genomes[:, None] >> (shift[:, None] + np.arange(PART_BITS))) & 1
+        keys = self.np_random.rand(count, PART_BITS)
+        removed = np.argmax(np.where(bits == 1, keys, -1), axis=1)
+        added = np.argmax(np.where(bits == 0, keys, -1), axis=1)
+        mutating &= bits.any(axis=1) & ~bits.all(axis=1)
+        flips = ((1 << removed) | (1 << added)) << shift
+        return np.where(mutating, genomes ^ flips, genomes)
+
+    @timed
+    def breed_genomes(self, fitness):
+        """ 
+        NOVÁ GENERACE GENOMŮ (self.population_size JEDINCŮ) - SELEKCE, KŘÍŽENÍ A MUTACE NAJEDNOU
+        ------------------------------------------------------------------------------------------
+        A NEW GENERATION OF GENOMES (self.population_size INDIVIDUALS) - SELECTION, CROSSOVER AND MUTATION AT ONCE
+        """
+        pairs = -(-self.population_size // 2)
+        parents = self.population[self.select_parent_indices(fitness, 2 * pairs)]
+        child1, child2 = self.crossover_genomes(parents[:pairs], parents[pairs:])
+        children = np.concatenate([child1, child2])[:self.population_size]
+        return self.mutate_genomes(children)
+
+    def evolve(self, generations, checkpoint=None, checkpoint_interval=1):
         """ 
         PROCES EVOLUCE - URČENÍ FITNESS HODNOTY, SELEKCE RODIČOVSÝCH PRAVIDEL, PROCES KŘÍŽENÍ, MUTACE.
         V GENERACI JE VŽDY VYBRÁN JEDINEC S NEVYŠŠÍ HODNOTOU FITNESS - TEN NENÍ PODROBEN KŘÍŽENÍ A MUTACI
         A PŘECHÁZÍ ROVNOU DO NOVÉ GENERACE, KDE NAHRADÍ NEJHORŠÍHO JEDINCE (ELITISMUS)
+        EVOLUCE POKRAČUJE OD self.generation DO generations (PO resume OD ULOŽENÉ GENERACE)
+        checkpoint - SOUBOR KONTROLNÍHO BODU, ULOŽÍ SE KAŽDÝCH checkpoint_interval GENERACÍ A PO POSLEDNÍ
         ---------------------------------------------------------------------------------
         PROCESS OF EVOLUTION - DETERMINATION OF FITNESS VALUE, SELECTION OF PARENTAL RULES, PROCESS OF 
         CROSSOVER AND MUTATION. IN A GENERATION THE INDIVIDUAL WITH THE HIGHEST FITNESS VALUE IS NOT SUBJECTED 
         TO CROSSOVER AND MUTATION AND IS PASSED DIRECTLY TO THE NEW GENERATION, WHERE IT REPLACES 
         THE WORST INDIVIDUAL (ELITISM)
+        EVOLUTION CONTINUES FROM self.generation UP TO generations (AFTER resume FROM THE SAVED GENERATION)
+        checkpoint - CHECKPOINT FILE, SAVED EVERY checkpoint_interval GENERATIONS AND AFTER THE LAST ONE
         """
-        for gen in range(generations):
-            print("_____________________ GENERACE:", gen+1, "_____________________")
-            fitness_values = self.evaluate_fitness()
+        with self.timing():
+            for gen in range(self.generation, generations):
+                with SamplingProfiler() if gen + 1 == self.profile_generation else nullcontext() as profiler:
+                    fitness_values = self.evaluate_fitness()
+                    self.population, self.gen_rule = self.next_generation(fitness_values)
+                self.report("generation", gen + 1, fitness_values)
+                if profiler is not None:
+                    self.progress.emit({"event": "profile", "generation": gen + 1, "samples": profiler.samples,
+                                        "functions": profiler.report()})
+                self.fitness_values = fitness_values
+                gen_best = max(fitness_values, key=operator.itemgetter(0))
+                if self.best is None or gen_best[0] > self.best[0]:
+                    self.best = gen_best
+                self.generation = gen + 1
+                if checkpoint is not None and (self.generation % checkpoint_interval == 0 or self.generation == generations):
+                    self.save_checkpoint(checkpoint)
+        best_rule_string = self.gen_rule
+        return best_rule_string
+
+    def save_checkpoint(self, path):
+        """ 
+        ULOŽENÍ STAVU MEZI GENERACEMI (POPULACE, FITNESS HODNOTY, STAVY GENERÁTORŮ NÁHODNÝCH ČÍSEL, NEJLEPŠÍ JEDINEC,
+        OBSAH self.cache A self.fidelity) - ZÁPIS DO DOČASNÉHO SOUBORU A PŘEJMENOVÁNÍ, TAKŽE SOUBOR NIKDY NENÍ POLOVIČNÍ
+        ---------------------------------------------------------------------------------------------------------------
+        SAVES THE STATE BETWEEN GENERATIONS (POPULATION, FITNESS VALUES, RANDOM GENERATOR STATES, BEST INDIVIDUAL,
+        CONTENTS OF self.cache AND self.fidelity) - WRITTEN TO A TEMPORARY FILE AND RENAMED, SO THE FILE IS NEVER HALF WRITTEN
+        """
+        state = {
+            "settings": {"rows": self.ca.rows, "cols": self.ca.cols, "population_size": self.population_size,
+                         "mutation_rate": self.mutation_rate, "cagens": self.gens, "selection": self.selection,
+                         "fitfun": self.fitfun, "genome": self.genome, "seeds": self.seeds,
+                         "seed": self.seed},
+            "generation": self.generation,
+            "evaluations": self.evaluations,
+            "population": self.population,
+            "fitness_values": self.fitness_values,
+            "gen_rule": self.gen_rule,
+            "best": self.best,
+            "random_state": self.random.getstate(),
+            "numpy_state": self.np_random.get_state(),
+            "cache": None if self.cache is None else self.cache.state(),
+            "fidelity": self.fidelity,
+        }
+        temporary_path = f"{path}.tmp"
+        with open(temporary_path, "wb") as checkpoint_file:
+            pickle.dump(state, checkpoint_file, protocol=pickle.HIGHEST_PROTOCOL)
+            checkpoint_file.flush()
+            os.fsync(checkpoint_file.fileno())
+        os.replace(temporary_path, path)
+
+    @classmethod
+    def resume(cls, path, backend=None, progress=None, instrument=False, profile_generation=None):
+        """ 
+        OBNOVENÍ GENETICKÉHO ALGORITMU Z KONTROLNÍHO BODU - evolve PAK POKRAČUJE OD ULOŽENÉ GENERACE
+        SE SerialBackend JE POKRAČOVÁNÍ SHODNÉ S BĚHEM BEZ PŘERUŠENÍ (CACHE SE OBNOVÍ Z KONTROLNÍHO BODU)
+        backend, progress, instrument, profile_generation - NASTAVENÍ BĚHU, KTERÁ SE DO KONTROLNÍHO BODU NEUKLÁDAJÍ,
+        PROTO SE ZADÁVAJÍ ZNOVU (VÝZNAM JAKO V __init__, progress=None = ConsoleSink())
+        ------------------------------------------------------------------------------------------------
+        RESTORES THE GENETIC ALGORITHM FROM A CHECKPOINT - evolve THEN CONTINUES FROM THE SAVED GENERATION
+        WITH SerialBackend THE CONTINUATION IS IDENTICAL TO AN UNINTERRUPTED RUN (THE CACHE IS RESTORED FROM THE CHECKPOINT)
+        backend, progress, instrument, profile_generation - RUN SETTINGS THAT ARE NOT STORED IN THE CHECKPOINT,
+        SO THEY ARE GIVEN AGAIN (MEANING AS IN __init__, progress=None = ConsoleSink())
+        """
+        with open(path, "rb") as checkpoint_file:
+            state = pickle.load(checkpoint_file)
+        cache = None if state["cache"] is None else FitnessCache.from_state(state["cache"])
+        ga = cls(**state["settings"], backend=backend, cache=cache, fidelity=state["fidelity"], progress=progress,
+                 instrument=instrument, profile_generation=profile_generation)
+        ga.generation = state["generation"]
+        ga.evaluations = state["evaluations"]
+        ga.population = state["population"]
+        ga.fitness_values = state["fitness_values"]
+        ga.gen_rule = state["gen_rule"]
+        ga.best = state["best"]
+        ga.random.setstate(state["random_state"])
+        ga.np_random.set_state(state["numpy_state"])
+        return ga
+
+    @timed
+    def next_generation(self, fitness_values):
+        """ 
+        NOVÁ GENERACE Z OHODNOCENÉ POPULACE - SELEKCE, KŘÍŽENÍ, MUTACE A ELITISMUS (JEDEN KROK evolve)
+        VRACÍ (NOVÁ POPULACE, NEJLEPŠÍ PRAVIDLO OHODNOCENÉ GENERACE)
+        -----------------------------------------------------------------------------------------------
+        A NEW GENERATION FROM THE SCORED POPULATION - SELECTION, CROSSOVER, MUTATION AND ELITISM (ONE STEP OF evolve)
+        RETURNS (NEW POPULATION, BEST RULE OF THE SCORED GENERATION)
+        """
+        if self.genome == "int":
+            fitness = np.array([fitness_value for fitness_value, _ in fitness_values], dtype=float)
+            gen_rule = fitness_values[int(np.argmax(fitness))][1]
+            new_population = self.breed_genomes(fitness)
+            new_population[int(np.argmin(fitness))] = self.population[int(np.argmax(fitness))]
+        else:
             new_population = []
             for _ in range(self.population_size-1):
                 parents = self.select_parents(fitness_values)
@@ -230,6 +579,139 @@ class GeneticAlgorithm:
             gen_rule = max(fitness_values, key=operator.itemgetter(0))[1]
             worst_fitness_idx = min(range(len(fitness_values)), key=lambda i: fitness_values[i][0])
             new_population[worst_fitness_idx] = gen_rule
-            self.population = new_population
-        best_rule_string = gen_rule
-        return best_rule_string
\ No newline at end of file
+        return new_population, gen_rule
+
+    def submit_rule(self, rule):
+        """ 
+        ASYNCHRONNÍ VYHODNOCENÍ JEDNOHO PRAVIDLA - VRACÍ (FUTURE SE SEZNAMEM HODNOT, KLÍČ CACHE NEBO None)
+        ULOŽENÁ PRAVIDLA VRACÍ HOTOVOU FUTURE, PRŮMĚR ZE VÍCE SEMÍNEK SPOČÍTÁ collect_rule
+        -------------------------------------------------------------------------------------------------
+        ASYNCHRONOUS EVALUATION OF ONE RULE - RETURNS (FUTURE OF A LIST OF VALUES, CACHE KEY OR None)
+        CACHED RULES RETURN A COMPLETED FUTURE, THE MEAN OVER SEVERAL SEEDS IS COMPUTED BY collect_rule
+        """
+        if self.uses_common_seeds():
+            evaluate = partial(batch_fitness, rows=self.ca.rows, cols=self.ca.cols, generations=self.gens,
+                               fitfun=self.fitfun, seeds=self.seeds, seed=self.common_seed)
+            return self.backend.submit(evaluate, [rule]), None
+        key, seeds = None, 1
+        if self.cache is not None:
+            key, value = self.cache.lookup(rule, self.fitfun, self.ca.rows, self.ca.cols, self.gens)
+            if value is not None:
+                return completed_future(lambda: [value]), None
+            if key is not None:
+                seeds = self.cache.seeds_for(self.fitfun)
+        evaluate = partial(batch_fitness, rows=self.ca.rows, cols=self.ca.cols, generations=self.gens, fitfun=self.fitfun)
+        return self.backend.submit(evaluate, [rule] * seeds), key
+
+    def collect_rule(self, future, key):
+        """ 
+        FITNESS HODNOTA Z DOKONČENÉ FUTURE ZE submit_rule (A JEJÍ ULOŽENÍ DO self.cache)
+        ----------------------------------------------------------------------------------
+        FITNESS VALUE FROM A FINISHED FUTURE OF submit_rule (AND STORING IT IN self.cache)
+        """
+        values = future.result()
+        value = float(np.mean(values)) if len(values) > 1 else values[0]
+        if key is not None:
+            self.cache.store(key, value)
+        return value
+
+    def breed_offspring(self, fitness_values, fitness):
+        """ 
+        DVA POTOMCI Z RODIČŮ VYBRANÝCH Z AKTUÁLNÍ POPULACE (SELEKCE, KŘÍŽENÍ A MUTACE JAKO V evolve)
+        ----------------------------------------------------------------------------------------------
+        TWO OFFSPRING OF PARENTS SELECTED FROM THE CURRENT POPULATION (SELECTION, CROSSOVER AND MUTATION AS IN evolve)
+        """
+        if self.genome == "int":
+            parents = self.population[self.select_parent_indices(fitness, 2)]
+            children = np.concatenate(self.crossover_genomes(parents[:1], parents[1:]))
+            return list(self.mutate_genomes(children))
+        self._roulette_values = None
+        parents = self.select_parents(fitness_values)
+        children = self.crossover(parents[0][1], parents[1][1])
+        return [self.mutate(child) for child in children]
+
+    def replacement_index(self, fitness, replacement):
+        """ 
+        INDEX JEDINCE, KTERÉHO NAHRADÍ NOVÝ POTOMEK - 'worst' = NEJHORŠÍ, 'tournament' = PORAŽENÝ Z TURNAJE DVOU
+        NEJLEPŠÍ JEDINEC SE NIKDY NENAHRAZUJE (ELITISMUS), VRACÍ None, POKUD JE V POPULACI JEN ON
+        -----------------------------------------------------------------------------------------------------------
+        INDEX OF THE INDIVIDUAL REPLACED BY A NEW OFFSPRING - 'worst' = THE WORST ONE, 'tournament' = THE LOSER OF A
+        TOURNAMENT OF TWO. THE BEST INDIVIDUAL IS NEVER REPLACED (ELITISM), RETURNS None IF IT IS THE ONLY ONE
+        """
+        if len(fitness) < 2:
+            return None
+        best = int(np.argmax(fitness))
+        if replacement == "tournament":
+            participants = self.np_random.randint(0, len(fitness), size=2)
+            loser = int(participants[np.argmin(fitness[participants])])
+            if loser != best:
+                return loser
+        others = fitness.copy()
+        others[best] = np.inf
+        return int(np.argmin(others))
+
+    def evolve_steady_state(self, evaluations, in_flight=None, replacement="worst"):
+        """ 
+        USTÁLENÁ (ASYNCHRONNÍ) EVOLUCE - PO OHODNOCENÍ POČÁTEČNÍ POPULACE SE POTOMCI ODESÍLAJÍ K VYHODNOCENÍ,
+        JAKMILE SE UVOLNÍ MÍSTO, A KAŽDÝ HOTOVÝ POTOMEK HNED NAHRADÍ JEDINCE PODLE replacement ('worst' NEBO 'tournament')
+        evaluations - POČET OHODNOCENÝCH POTOMKŮ
+        in_flight - POČET SOUČASNĚ VYHODNOCOVANÝCH POTOMKŮ (None = DVOJNÁSOBEK PRACOVNÍKŮ BACKENDU)
+        NEJLEPŠÍ JEDINEC SE NIKDY NENAHRADÍ, VRACÍ NEJLEPŠÍ PRAVIDLO KONEČNÉ POPULACE
+        -----------------------------------------------------------------------------------------------------------------
+        STEADY-STATE (ASYNCHRONOUS) EVOLUTION - AFTER THE INITIAL POPULATION IS SCORED, OFFSPRING ARE SUBMITTED FOR EVALUATION
+        AS SOON AS A SLOT FREES UP AND EVERY FINISHED OFFSPRING AT ONCE REPLACES AN INDIVIDUAL BY replacement ('worst' OR 'tournament')
+        evaluations - NUMBER OF OFFSPRING TO SCORE
+        in_flight - NUMBER OF OFFSPRING EVALUATED AT THE SAME TIME (None = TWICE THE BACKEND WORKERS)
+        THE BEST INDIVIDUAL IS NEVER REPLACED, RETURNS THE BEST RULE OF THE FINAL POPULATION
+        """
+        if replacement not in ("worst", "tournament"):
+            raise ValueError("Invalid replacement. Expected 'worst' or 'tournament'.")
+        if self.fidelity is not None:
+            raise ValueError("Steady-state evolution scores every offspring in full and does not support fidelity.")
+        with self.timing():
+            in_flight = in_flight or 2 * self.backend.max_workers
+            fitness_values = self.evaluate_fitness()
+            self.report("steady", 0, fitness_values)
+            if self.genome != "int":
+                self.population = list(self.population)
+            fitness = np.array([fitness_value for fitness_value, _ in fitness_values], dtype=float)
+            pending = {}
+            offspring = []
+            submitted = 0
+            completed = 0
+            while submitted < evaluations or pending:
+                start = time.perf_counter()
+                while submitted < evaluations and len(pending) < in_flight:
+                    if not offspring:
+                        offspring = self.breed_offspring(fitness_values, fitness)
+                    child = offspring.pop()
+                    future, key = self.submit_rule(child)
+                    pending[future] = (child, key)
+                    submitted += 1
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                self.evaluation_time += time.perf_counter() - start
+                for future in done:
+                    child, key = pending.pop(future)
+                    fitness_value = self.collect_rule(future, key)
+                    index = self.replacement_index(fitness, replacement)
+                    if index is None and fitness_value > fitness[0]:
+                        index = 0
+                    if index is not None:
+                        self.population[index] = child
+                        fitness[index] = fitness_value
+                        fitness_values[index] = (fitness_value, self.display_rule(child))
+                    self.evaluations += 1
+                    completed += 1
+                    if completed % self.population_size == 0 or completed == evaluations:
+                        self.report("steady", -(-completed // self.population_size), fitness_values)
+        best_rule_string = fitness_values[int(np.argmax(fitness))][1]
+        return best_rule_string
+
+    def close(self):
+        """ 
+        UKONČENÍ PRACOVNÍKŮ VYHODNOCOVACÍHO BACKENDU A ZÁPIS ZBÝVAJÍCÍCH UDÁLOSTÍ PRŮBĚHU
+        ---------------------------------------------------------------------------------
+        SHUTS DOWN THE WORKERS OF THE EVALUATION BACKEND AND WRITES THE REMAINING PROGRESS EVENTS
+        """
+        self.backend.close()
+        self.progress.close()
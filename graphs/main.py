@@ -6,6 +6,7 @@ import sys
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from cellularAutomaton import CellularAutomaton
+from trajectoryFile import TrajectoryReader
 
 ABS_SIZE = 11
 """ 
@@ -16,6 +17,14 @@ RULE SETTINGS
 rule_string - rule applied to create the graph
 """
 rule_string = "B0567/S1248"
+""" 
+trajectory_path - CESTA K ZÁZNAMU TRAJEKTORIE (ca.record), POČTY ŽIVÝCH BUNĚK SE PŘEČTOU ZE ZÁZNAMU
+                  MÍSTO NOVÉ SIMULACE A PRAVIDLO SE VEZME Z HLAVIČKY (None = SIMULACE PRAVIDLA rule_string)
+-----------------------------------------------------
+trajectory_path - PATH TO A RECORDED TRAJECTORY (ca.record), THE LIVE CELL COUNTS ARE READ FROM THE RECORDING
+                  INSTEAD OF A NEW SIMULATION AND THE RULE IS TAKEN FROM THE HEADER (None = SIMULATE rule_string)
+"""
+trajectory_path = None
 
 def run_simulation():
     live_counts = []
@@ -23,15 +32,17 @@ def run_simulation():
     initial_grid = np.zeros((ABS_SIZE, ABS_SIZE), dtype=int)
     initial_grid[ABS_SIZE // 2, ABS_SIZE // 2] = 1
 
-    ca = CellularAutomaton(ABS_SIZE, ABS_SIZE, initial_grid)
+    ca = CellularAutomaton(ABS_SIZE, ABS_SIZE, initial_grid, engine="symmetric")
     """ 
     ca.initialize_center_cell() - nastavení počátečního stavu na živou buňku uprostřed
     ca.randomize_grid() - nastavení počátečního stavu náhodného
     JE NUTNO ZAKOMENTOVAT TO, KTERÉ NENÍ POUŽÍVÁNO
+    (engine 'symmetric' simuluje jen osminu mřížky, u náhodného stavu se automaticky použije 'dense')
     --------------------------------------------------------------
     ca.initialize_center_cell() - setting the initial state to the live cell in the center
     ca.randomize_grid() - set the initial state to random
     IT IS NECESSARY TO COMMENT THAT WHICH IS NOT USED
+    (the 'symmetric' engine simulates only one eighth of the grid, a random state falls back to 'dense' automatically)
     """
     ca.initialize_center_cell()
     #ca.randomize_grid()
@@ -42,15 +53,25 @@ def run_simulation():
     generation = 0
     max_gen = 100
     while generation < max_gen:
-        ca.apply_rules(rule_string)
-        ca.grid = ca.next_grid.copy()
+        ca.advance(rule_string)
         live, _ = ca.count_live_dead()
         live_counts.append(live)
         generation += 1
 
     return live_counts
 
-live_counts = run_simulation()
+def read_trajectory(path):
+    with TrajectoryReader(path) as reader:
+        if reader.stats is not None:
+            live_counts = list(reader.stat("live"))
+        else:
+            live_counts = list(reader.measure(("live",))["live"])
+        return live_counts, reader.rule
+
+if trajectory_path is not None:
+    live_counts, rule_string = read_trajectory(trajectory_path)
+else:
+    live_counts = run_simulation()
 
 fig, ax = plt.subplots(figsize=(10, 3))
 ax.plot(live_counts, 'k-', label='Živé buňky', linewidth=2)
@@ -0,0 +1,349 @@
+import numpy as np
+from rule import as_rule
+
+
+class Node:
+    __slots__ = ("level", "nw", "ne", "sw", "se", "population")
+
+    def __init__(self, level, nw, ne, sw, se, population):
+        """
+        ČTVERCOVÝ BLOK 2^level x 2^level BUNĚK - ČTYŘI KVADRANTY O ÚROVEŇ NÍŽ (LIST ÚROVNĚ 0 JE JEDNA BUŇKA)
+        UZLY SE STEJNÝM OBSAHEM EXISTUJÍ JEN JEDNOU, TAKŽE SE POROVNÁVAJÍ IDENTITOU
+        ------------------------------------------------------------------------------------------------------
+        SQUARE BLOCK OF 2^level x 2^level CELLS - FOUR QUADRANTS ONE LEVEL LOWER (A LEAF OF LEVEL 0 IS ONE CELL)
+        NODES WITH THE SAME CONTENT EXIST ONLY ONCE, SO THEY ARE COMPARED BY IDENTITY
+        """
+        self.level = level
+        self.nw = nw
+        self.ne = ne
+        self.sw = sw
+        self.se = se
+        self.population = population
+
+
+DEAD = Node(0, None, None, None, None, 0)
+ALIVE = Node(0, None, None, None, None, 1)
+
+
+def is_power_of_two(value):
+    """
+    KONTROLA, ZDA JE ČÍSLO MOCNINOU DVOU
+    -------------------------------------
+    CHECKS WHETHER THE NUMBER IS A POWER OF TWO
+    """
+    return value > 0 and value & (value - 1) == 0
+
+
+class HashLife:
+    def __init__(self, rows, cols, initial_grid=None, mode="torus", max_nodes=1000000):
+        """
+        SIMULACE POMOCÍ ALGORITMU HASHLIFE - MŘÍŽKA JE STROM ČTVERCOVÝCH BLOKŮ, STEJNÉ BLOKY SE UKLÁDAJÍ JEN JEDNOU
+        A VÝSLEDEK 2^j KROKŮ PRO KAŽDÝ BLOK SE POČÍTÁ JEN JEDNOU (PRO DLOUHÉ SIMULACE PRAVIDEL BEZ B0)
+        mode - 'torus' = TORUS JAKO CellularAutomaton (rows = cols = MOCNINA DVOU)
+               'plane' = NEKONEČNÁ ROVINA, MŘÍŽKA rows x cols JE JEN POČÁTEČNÍ VÝŘEZ
+        max_nodes - PO PŘEKROČENÍ POČTU ULOŽENÝCH UZLŮ SE VYROVNÁVACÍ PAMĚŤ VYPRÁZDNÍ (ZACHOVÁ SE JEN AKTUÁLNÍ STAV),
+                    KONTROLUJE SE PO KAŽDÉM KROKU 2^j GENERACÍ (BĚHEM JEDNOHO KROKU MŮŽE BÝT UZLŮ DOČASNĚ VÍCE)
+        ----------------------------------------------------------------------------------------------------------
+        SIMULATION WITH THE HASHLIFE ALGORITHM - THE GRID IS A TREE OF SQUARE BLOCKS, EQUAL BLOCKS ARE STORED ONLY ONCE
+        AND THE RESULT OF 2^j STEPS FOR EVERY BLOCK IS COMPUTED ONLY ONCE (FOR LONG SIMULATIONS OF RULES WITHOUT B0)
+        mode - 'torus' = TORUS LIKE CellularAutomaton (rows = cols = A POWER OF TWO)
+               'plane' = INFINITE PLANE, THE rows x cols GRID IS ONLY THE INITIAL WINDOW
+        max_nodes - ONCE THE NUMBER OF STORED NODES IS EXCEEDED THE CACHE IS EMPTIED (ONLY THE CURRENT STATE IS KEPT),
+                    CHECKED AFTER EVERY STEP OF 2^j GENERATIONS (WITHIN ONE STEP THERE MAY TEMPORARILY BE MORE NODES)
+        """
+        if mode not in ("torus", "plane"):
+            raise ValueError("Invalid mode. Expected 'torus' or 'plane'.")
+        if mode == "torus" and not (rows == cols and rows >= 2 and is_power_of_two(rows)):
+            raise ValueError("The torus mode needs a square grid whose size is a power of two (at least 2).")
+        self.rows = rows
+        self.cols = cols
+        self.mode = mode
+        self.max_nodes = max_nodes
+        self.generation = 0
+        self.rule = None
+        self._nodes = {}
+        self._results = {}
+        self._empty = [DEAD]
+        self._origin = 0
+        if initial_grid is None:
+            initial_grid = np.zeros((rows, cols), dtype=int)
+        self.grid = initial_grid
+
+    def node(self, nw, ne, sw, se):
+        """
+        JEDINEČNÝ UZEL SE ZADANÝMI KVADRANTY (EXISTUJÍCÍ SE VRÁTÍ Z TABULKY)
+        ---------------------------------------------------------------------
+        THE UNIQUE NODE WITH THE GIVEN QUADRANTS (AN EXISTING ONE IS RETURNED FROM THE TABLE)
+        """
+        key = (nw, ne, sw, se)
+        node = self._nodes.get(key)
+        if node is None:
+            population = nw.population + ne.population + sw.population + se.population
+            node = Node(nw.level + 1, nw, ne, sw, se, population)
+            self._nodes[key] = node
+        return node
+
+    def empty(self, level):
+        """
+        PRÁZDNÝ UZEL DANÉ ÚROVNĚ
+        -------------------------
+        EMPTY NODE OF THE GIVEN LEVEL
+        """
+        while len(self._empty) <= level:
+            smaller = self._empty[-1]
+            self._empty.append(self.node(smaller, smaller, smaller, smaller))
+        return self._empty[level]
+
+    def from_array(self, cells):
+        """
+        STROM PRO ČTVERCOVÉ POLE 2^k x 2^k (PRÁZDNÉ ČÁSTI SE NEPROCHÁZEJÍ)
+        -------------------------------------------------------------------
+        TREE FOR A SQUARE 2^k x 2^k ARRAY (EMPTY PARTS ARE NOT VISITED)
+        """
+        size = len(cells)
+        if size == 1:
+            return ALIVE if cells[0, 0] else DEAD
+        level = size.bit_length() - 1
+        if not cells.any():
+            return self.empty(level)
+        half = size // 2
+        return self.node(self.from_array(cells[:half, :half]), self.from_array(cells[:half, half:]),
+                         self.from_array(cells[half:, :half]), self.from_array(cells[half:, half:]))
+
+    def paint(self, node, row, col, out):
+        """
+        ZÁPIS ŽIVÝCH BUNĚK UZLU S LEVÝM HORNÍM ROHEM (row, col) DO POLE out
+        (PRÁZDNÉ ČÁSTI A ČÁSTI MIMO POLE SE NEPROCHÁZEJÍ)
+        ---------------------------------------------------------------------
+        WRITES THE LIVE CELLS OF THE NODE WITH ITS TOP LEFT CORNER AT (row, col) INTO THE ARRAY out
+        (EMPTY PARTS AND PARTS OUTSIDE THE ARRAY ARE NOT VISITED)
+        """
+        size = 1 << node.level
+        if node.population == 0 or row >= out.shape[0] or col >= out.shape[1] or row + size <= 0 or col + size <= 0:
+            return
+        if node.level == 0:
+            out[row, col] = 1
+            return
+        half = size // 2
+        self.paint(node.nw, row, col, out)
+        self.paint(node.ne, row, col + half, out)
+        self.paint(node.sw, row + half, col, out)
+        self.paint(node.se, row + half, col + half, out)
+
+    @property
+    def grid(self):
+        """
+        AKTUÁLNÍ MŘÍŽKA rows x cols (V REŽIMU 'plane' VÝŘEZ NA MÍSTĚ POČÁTEČNÍ MŘÍŽKY)
+        ----------------------------------------------------------------------------------
+        THE CURRENT rows x cols GRID (IN THE 'plane' MODE THE WINDOW AT THE PLACE OF THE INITIAL GRID)
+        """
+        cells = np.zeros((self.rows, self.cols), dtype=int)
+        self.paint(self.root, -self._origin, -self._origin, cells)
+        return cells
+
+    @grid.setter
+    def grid(self, grid):
+        grid = np.asarray(grid)
+        size = max(2, 1 << (max(self.rows, self.cols) - 1).bit_length())
+        cells = np.zeros((size, size), dtype=int)
+        cells[:self.rows, :self.cols] = grid != 0
+        self._origin = 0
+        self.root = self.from_array(cells)
+
+    def initialize_center_cell(self):
+        """
+        NASTAVENÍ POČÁTEČNÍ MŘÍŽKY NA JEDNU ŽIVOU BUŇKU UPROSTŘED
+        -----------------------------------------------------------
+        SETTING THE INITIAL GRID TO ONE LIVE CELL IN THE MIDDLE
+        """
+        grid = np.zeros((self.rows, self.cols), dtype=int)
+        grid[self.rows // 2, self.cols // 2] = 1
+        self.grid = grid
+
+    @property
+    def population(self):
+        """
+        POČET ŽIVÝCH BUNĚK (V REŽIMU 'plane' V CELÉ ROVINĚ)
+        ----------------------------------------------------
+        NUMBER OF LIVE CELLS (IN THE 'plane' MODE IN THE WHOLE PLANE)
+        """
+        return self.root.population
+
+    def count_live_dead(self):
+        """
+        VÝPOČET ŽIVÝCH A MRTVÝCH BUNĚK (V REŽIMU 'plane' VE VÝŘEZU rows x cols)
+        -------------------------------------------------------------------------
+        SUM OF LIVING AND DEAD CELLS (IN THE 'plane' MODE IN THE rows x cols WINDOW)
+        """
+        live_count = self.population if self.mode == "torus" else int(self.grid.sum())
+        return live_count, self.rows * self.cols - live_count
+
+    def set_rule(self, rule):
+        """
+        NASTAVENÍ PRAVIDLA (PRAVIDLA S B0 NEJSOU PODPOROVÁNA), PŘI ZMĚNĚ SE ZAPOMENOU ULOŽENÉ VÝSLEDKY
+        ------------------------------------------------------------------------------------------------
+        SETS THE RULE (RULES WITH B0 ARE NOT SUPPORTED), STORED RESULTS ARE FORGOTTEN WHEN IT CHANGES
+        """
+        rule = as_rule(rule)
+        if 0 in rule.birth:
+            raise ValueError("HashLife does not support rules with B0.")
+        if rule != self.rule:
+            self.rule = rule
+            self._results.clear()
+
+    def base_step(self, node):
+        """
+        JEDEN KROK PRO STŘED 2 x 2 UZLU ÚROVNĚ 2 (BLOK 4 x 4)
+        ------------------------------------------------------
+        ONE STEP FOR THE 2 x 2 CENTRE OF A LEVEL 2 NODE (A 4 x 4 BLOCK)
+        """
+        cells = np.zeros((4, 4), dtype=int)
+        self.paint(node, 0, 0, cells)
+        counts = sum(cells[1 + i:3 + i, 1 + j:3 + j] for i in (-1, 0, 1) for j in (-1, 0, 1)) - cells[1:3, 1:3]
+        center = self.rule.table[cells[1:3, 1:3], counts]
+        leaves = [ALIVE if alive else DEAD for alive in center.ravel()]
+        return self.node(*leaves)
+
+    def centered(self, node):
+        """
+        STŘEDNÍ PODUZEL O ÚROVEŇ NIŽŠÍ
+        -------------------------------
+        THE CENTRAL SUB-NODE ONE LEVEL LOWER
+        """
+        return self.node(node.nw.se, node.ne.sw, node.sw.ne, node.se.nw)
+
+    def advance_node(self, node, j):
+        """
+        STŘED UZLU (O ÚROVEŇ NIŽŠÍ) PO 2^j KROCÍCH, j <= ÚROVEŇ - 2 (VÝSLEDKY SE UKLÁDAJÍ)
+        -------------------------------------------------------------------------------------
+        THE CENTRE OF THE NODE (ONE LEVEL LOWER) AFTER 2^j STEPS, j <= LEVEL - 2 (RESULTS ARE STORED)
+        """
+        if node.population == 0:
+            return self.empty(node.level - 1)
+        key = (node, j)
+        result = self._results.get(key)
+        if result is not None:
+            return result
+        if node.level == 2:
+            result = self.base_step(node)
+        else:
+            nw, ne, sw, se = node.nw, node.ne, node.sw, node.se
+            parts = [
+                nw, self.node(nw.ne, ne.nw, nw.se, ne.sw), ne,
+                self.node(nw.sw, nw.se, sw.nw, sw.ne), self.centered(node), self.node(ne.sw, ne.se, se.nw, se.ne),
+                sw, self.node(sw.ne, se.nw, sw.se, se.sw), se,
+            ]
+            if j == node.level - 2:
+                parts = [self.advance_node(part, j - 1) for part in parts]
+            else:
+                parts = [self.centered(part) for part in parts]
+            step = min(j, node.level - 3)
+            result = self.node(
+                self.advance_node(self.node(parts[0], parts[1], parts[3], parts[4]), step),
+                self.advance_node(self.node(parts[1], parts[2], parts[4], parts[5]), step),
+                self.advance_node(self.node(parts[3], parts[4], parts[6], parts[7]), step),
+                self.advance_node(self.node(parts[4], parts[5], parts[7], parts[8]), step))
+        self._results[key] = result
+        return result
+
+    def expand(self, node):
+        """
+        UZEL O ÚROVEŇ VYŠŠÍ S PŮVODNÍM UZLEM UPROSTŘED A PRÁZDNÝM OKOLÍM
+        ------------------------------------------------------------------
+        A NODE ONE LEVEL HIGHER WITH THE ORIGINAL NODE IN THE MIDDLE AND EMPTY SURROUNDINGS
+        """
+        border = self.empty(node.level - 1)
+        return self.node(self.node(border, border, border, node.nw), self.node(border, border, node.ne, border),
+                         self.node(border, node.sw, border, border), self.node(node.se, border, border, border))
+
+    def is_padded(self, node):
+        """
+        KONTROLA, ZDA JSOU VŠECHNY ŽIVÉ BUŇKY UVNITŘ STŘEDNÍ ČTVRTINY UZLU
+        -------------------------------------------------------------------
+        CHECKS WHETHER ALL LIVE CELLS ARE INSIDE THE CENTRAL QUARTER OF THE NODE
+        """
+        return node.level >= 3 and self.centered(self.centered(node)).population == node.population
+
+    def step_power(self, j):
+        """
+        POSUN SIMULACE O 2^j GENERACÍ (PAK SE PŘÍPADNĚ VYPRÁZDNÍ VYROVNÁVACÍ PAMĚŤ, VIZ max_nodes)
+        ---------------------------------------------------------------------------------------------
+        ADVANCES THE SIMULATION BY 2^j GENERATIONS (THEN THE CACHE IS EMPTIED IF NEEDED, SEE max_nodes)
+        """
+        if self.mode == "torus":
+            tiled = self.node(self.root, self.root, self.root, self.root)
+            shifted = self.advance_node(tiled, j)
+            self.root = self.node(shifted.se, shifted.sw, shifted.ne, shifted.nw)
+        else:
+            root = self.root
+            while root.level < j + 3 or not self.is_padded(root):
+                root = self.expand(root)
+                self._origin += 1 << (root.level - 2)
+            self.root = self.advance_node(root, j)
+            self._origin -= 1 << (self.root.level - 1)
+        self.generation += 1 << j
+        if len(self._nodes) > self.max_nodes:
+            self.collect()
+
+    def advance(self, rule, generations=1):
+        """
+        POSUN SIMULACE O LIBOVOLNÝ POČET GENERACÍ (ROZKLAD NA MOCNINY DVOU)
+        --------------------------------------------------------------------
+        ADVANCES THE SIMULATION BY ANY NUMBER OF GENERATIONS (SPLIT INTO POWERS OF TWO)
+        """
+        self.set_rule(rule)
+        if len(self._nodes) > self.max_nodes:
+            self.collect()
+        max_power = self.root.level - 1 if self.mode == "torus" else None
+        j = 0
+        while generations:
+            if j == max_power:
+                for _ in range(generations):
+                    self.step_power(j)
+                break
+            if generations & 1:
+                self.step_power(j)
+            generations >>= 1
+            j += 1
+
+    def live_counts(self, rule, generations, every=1):
+        """
+        PRŮBĚH POČTU ŽIVÝCH BUNĚK - HODNOTA NA ZAČÁTKU A PO KAŽDÝCH every GENERACÍCH AŽ DO generations
+        ------------------------------------------------------------------------------------------------
+        LIVE CELL TRAJECTORY - THE VALUE AT THE START AND AFTER EVERY every GENERATIONS UP TO generations
+        """
+        counts = [self.population]
+        for _ in range(generations // every):
+            self.advance(rule, every)
+            counts.append(self.population)
+        return counts
+
+    def collect(self):
+        """
+        VYPRÁZDNĚNÍ VYROVNÁVACÍ PAMĚTI - ZACHOVAJÍ SE JEN UZLY AKTUÁLNÍHO STAVU
+        -------------------------------------------------------------------------
+        EMPTIES THE CACHE - ONLY THE NODES OF THE CURRENT STATE ARE KEPT
+        """
+        self._nodes = {}
+        self._results = {}
+        self._empty = [DEAD]
+        rebuilt = {}
+
+        def rebuild(node):
+            if node.level == 0:
+                return node
+            copy = rebuilt.get(id(node))
+            if copy is None:
+                copy = self.node(rebuild(node.nw), rebuild(node.ne), rebuild(node.sw), rebuild(node.se))
+                rebuilt[id(node)] = copy
+            return copy
+
+        self.root = rebuild(self.root)
+
+    def stats(self):
+        """
+        VELIKOST VYROVNÁVACÍ PAMĚTI
+        ----------------------------
+        SIZE OF THE CACHE
+        """
+        return {"nodes": len(self._nodes), "results": len(self._results), "generation": self.generation}
@@ -0,0 +1,211 @@
+import os
+import sys
+import time
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from functools import wraps
+
+_enabled = False
+_switched_on = False
+_active_blocks = 0
+_lock = threading.Lock()
+_timers = {}
+
+
+def enable():
+    """
+    ZAPNUTÍ MĚŘENÍ (PLATÍ PRO CELÝ PROCES, PRACOVNÍ PROCESY BACKENDU MĚŘÍ ZVLÁŠŤ)
+    ------------------------------------------------------------------------------
+    ENABLES THE MEASUREMENT (FOR THE WHOLE PROCESS, WORKER PROCESSES OF A BACKEND MEASURE SEPARATELY)
+    """
+    global _enabled, _switched_on
+    with _lock:
+        _switched_on = True
+        _enabled = True
+
+
+def disable():
+    """
+    VYPNUTÍ MĚŘENÍ (NAMĚŘENÉ HODNOTY ZŮSTÁVAJÍ, PROBÍHAJÍCÍ BLOKY measuring MĚŘÍ DÁL)
+    ------------------------------------------------------------------------------------
+    DISABLES THE MEASUREMENT (MEASURED VALUES ARE KEPT, RUNNING measuring BLOCKS KEEP MEASURING)
+    """
+    global _enabled, _switched_on
+    with _lock:
+        _switched_on = False
+        _enabled = _active_blocks > 0
+
+
+@contextmanager
+def measuring(active=True):
+    """
+    MĚŘENÍ ZAPNUTÉ JEN PO DOBU BLOKU with (active=False = BEZ ZMĚNY) - PO POSLEDNÍM VNOŘENÉM NEBO SOUBĚŽNÉM BLOKU
+    SE OBNOVÍ STAV PODLE enable() A disable()
+    ---------------------------------------------------------------------------------------------------------------
+    MEASUREMENT ENABLED ONLY FOR THE DURATION OF THE with BLOCK (active=False = NO CHANGE) - AFTER THE LAST NESTED OR
+    CONCURRENT BLOCK THE STATE SET BY enable() AND disable() IS RESTORED
+    """
+    global _enabled, _active_blocks
+    if not active:
+        yield
+        return
+    with _lock:
+        _active_blocks += 1
+        _enabled = True
+    try:
+        yield
+    finally:
+        with _lock:
+            _active_blocks -= 1
+            _enabled = _switched_on or _active_blocks > 0
+
+
+def is_enabled():
+    return _enabled
+
+
+def reset():
+    """
+    VYNULOVÁNÍ VŠECH POČITADEL A ČASOVAČŮ
+    --------------------------------------
+    RESETS ALL COUNTERS AND TIMERS
+    """
+    with _lock:
+        _timers.clear()
+
+
+def timed(func):
+    """
+    DEKORÁTOR - POČET VOLÁNÍ A CELKOVÝ ČAS FUNKCE POD JEJÍM __qualname__ (PŘI VYPNUTÉM MĚŘENÍ JEN JEDNA KONTROLA)
+    ------------------------------------------------------------------------------------------------------------------
+    DECORATOR - NUMBER OF CALLS AND CUMULATIVE TIME OF A FUNCTION UNDER ITS __qualname__ (ONLY ONE CHECK WHEN DISABLED)
+    """
+    name = func.__qualname__
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        if not _enabled:
+            return func(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            with _lock:
+                timer = _timers.setdefault(name, [0, 0.0])
+                timer[0] += 1
+                timer[1] += elapsed
+    return wrapper
+
+
+def snapshot():
+    """
+    AKTUÁLNÍ HODNOTY JAKO SLOVNÍK {NÁZEV: {'calls': POČET, 'seconds': ČAS}}
+    ------------------------------------------------------------------------
+    CURRENT VALUES AS A DICTIONARY {NAME: {'calls': COUNT, 'seconds': TIME}}
+    """
+    with _lock:
+        return {name: {"calls": calls, "seconds": seconds} for name, (calls, seconds) in sorted(_timers.items())}
+
+
+def merge(delta):
+    """
+    PŘIČTENÍ PŘÍRŮSTKŮ NAMĚŘENÝCH JINDE (NAPŘ. V PRACOVNÍM PROCESU) K ČASOVAČŮM TOHOTO PROCESU
+    --------------------------------------------------------------------------------------------
+    ADDS INCREMENTS MEASURED ELSEWHERE (E.G. IN A WORKER PROCESS) TO THE TIMERS OF THIS PROCESS
+    """
+    with _lock:
+        for name, values in delta.items():
+            timer = _timers.setdefault(name, [0, 0.0])
+            timer[0] += values["calls"]
+            timer[1] += values["seconds"]
+
+
+def measured_call(func, *args):
+    """
+    VOLÁNÍ func(*args) SE ZAPNUTÝM MĚŘENÍM - VRACÍ (VÝSLEDEK, PŘÍRŮSTKY ČASOVAČŮ BĚHEM VOLÁNÍ)
+    ---------------------------------------------------------------------------------------------
+    CALLS func(*args) WITH THE MEASUREMENT ENABLED - RETURNS (RESULT, TIMER INCREMENTS DURING THE CALL)
+    """
+    before = snapshot()
+    with measuring():
+        result = func(*args)
+    return result, difference(snapshot(), before)
+
+
+def difference(current, previous):
+    """
+    PŘÍRŮSTEK MEZI DVĚMA SNÍMKY (JEN FUNKCE, KTERÉ BYLY MEZITÍM VOLÁNY)
+    --------------------------------------------------------------------
+    INCREMENT BETWEEN TWO SNAPSHOTS (ONLY FUNCTIONS CALLED IN BETWEEN)
+    """
+    delta = {}
+    for name, values in current.items():
+        before = previous.get(name, {"calls": 0, "seconds": 0.0})
+        if values["calls"] > before["calls"]:
+            delta[name] = {"calls": values["calls"] - before["calls"], "seconds": values["seconds"] - before["seconds"]}
+    return delta
+
+
+class SamplingProfiler:
+    def __init__(self, interval=0.001):
+        """
+        VZORKOVACÍ PROFILER - VLÁKNO NA POZADÍ KAŽDÝCH interval SEKUND ZAZNAMENÁ ZÁSOBNÍK VLÁKNA, KTERÉ PROFILER SPUSTILO
+        POUŽITÍ: with SamplingProfiler() as profiler: ... ; profiler.report()
+        --------------------------------------------------------------------------------------------------------------------
+        SAMPLING PROFILER - A BACKGROUND THREAD RECORDS THE STACK OF THE THREAD THAT STARTED THE PROFILER EVERY interval SECONDS
+        USAGE: with SamplingProfiler() as profiler: ... ; profiler.report()
+        """
+        self.interval = interval
+        self.samples = 0
+        self.self_counts = Counter()
+        self.total_counts = Counter()
+        self._target = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __enter__(self):
+        self._target = threading.get_ident()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.sample_loop, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def sample_loop(self):
+        """
+        SMYČKA VZORKOVÁNÍ - NEJVNITŘNĚJŠÍ FUNKCE SE POČÍTÁ DO 'self', KAŽDÁ FUNKCE NA ZÁSOBNÍKU JEDNOU DO 'total'
+        ----------------------------------------------------------------------------------------------------------
+        SAMPLING LOOP - THE INNERMOST FUNCTION COUNTS TOWARDS 'self', EVERY FUNCTION ON THE STACK ONCE TOWARDS 'total'
+        """
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._target)
+            if frame is None:
+                continue
+            self.samples += 1
+            self.self_counts[self.frame_name(frame)] += 1
+            seen = set()
+            while frame is not None:
+                seen.add(self.frame_name(frame))
+                frame = frame.f_back
+            self.total_counts.update(seen)
+
+    @staticmethod
+    def frame_name(frame):
+        code = frame.f_code
+        return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+    def report(self, top=20):
+        """
+        top FUNKCÍ PODLE CELKOVÉHO POČTU VZORKŮ - [{'function', 'self', 'total', 'share'}, ...]
+        ---------------------------------------------------------------------------------------
+        top FUNCTIONS BY TOTAL SAMPLES - [{'function', 'self', 'total', 'share'}, ...]
+        """
+        return [{"function": name, "self": self.self_counts[name], "total": total,
+                 "share": total / self.samples if self.samples else 0.0}
+                for name, total in self.total_counts.most_common(top)]
@@ -0,0 +1,240 @@
+import queue
+import multiprocessing
+from multiprocessing.managers import BaseManager
+from evaluationBackend import seed_worker
+from fitnessCache import FitnessCache
+from geneticAlgorithm import GeneticAlgorithm
+from rule import as_rule
+
+_HUB_QUEUES = {}
+
+
+def hub_queue(name):
+    """
+    FRONTA MIGRAČNÍHO UZLU PODLE NÁZVU (VYTVOŘÍ SE PŘI PRVNÍM POUŽITÍ V PROCESU UZLU)
+    ----------------------------------------------------------------------------------
+    QUEUE OF THE MIGRATION HUB BY NAME (CREATED ON FIRST USE IN THE HUB PROCESS)
+    """
+    return _HUB_QUEUES.setdefault(name, queue.Queue())
+
+
+class MigrationManager(BaseManager):
+    pass
+
+
+MigrationManager.register("queue", callable=hub_queue)
+
+
+class QueueTransport:
+    def __init__(self, count):
+        """
+        MIGRACE MEZI PROCESY NA JEDNOM POČÍTAČI (FRONTY multiprocessing, JEDNA PRO KAŽDÝ OSTROV A JEDNA PRO VÝSLEDKY)
+        ---------------------------------------------------------------------------------------------------------------
+        MIGRATION BETWEEN PROCESSES ON ONE MACHINE (multiprocessing QUEUES, ONE PER ISLAND AND ONE FOR THE RESULTS)
+        """
+        self.queues = {name: multiprocessing.Queue() for name in list(range(count)) + ["results"]}
+
+    def queue(self, name):
+        """
+        FRONTA OSTROVA (ČÍSLO) NEBO FRONTA VÝSLEDKŮ ('results')
+        --------------------------------------------------------
+        QUEUE OF AN ISLAND (NUMBER) OR THE RESULTS QUEUE ('results')
+        """
+        return self.queues[name]
+
+    def close(self):
+        pass
+
+
+class SocketTransport:
+    def __init__(self, address, authkey, serve=False):
+        """
+        MIGRACE PŘES MIGRAČNÍ UZEL NA SÍŤOVÉ ADRESE (OSTROVY MOHOU BĚŽET NA VÍCE POČÍTAČÍCH)
+        serve=True - TENTO POČÍTAČ UZEL SPUSTÍ, OSTATNÍ SE K NĚMU JEN PŘIPOJÍ
+        --------------------------------------------------------------------------------------
+        MIGRATION THROUGH A MIGRATION HUB AT A NETWORK ADDRESS (ISLANDS CAN RUN ON SEVERAL MACHINES)
+        serve=True - THIS MACHINE STARTS THE HUB, THE OTHERS ONLY CONNECT TO IT
+        """
+        self.address = address
+        self.authkey = authkey
+        self.serve = serve
+        self._manager = None
+        if serve:
+            self._manager = MigrationManager(address=address, authkey=authkey)
+            self._manager.start()
+            self.address = self._manager.address
+
+    def __getstate__(self):
+        """
+        DO PRACOVNÍCH PROCESŮ SE PŘEDÁVÁ JEN ADRESA A KLÍČ, KAŽDÝ PROCES SE PŘIPOJÍ SÁM
+        --------------------------------------------------------------------------------
+        ONLY THE ADDRESS AND THE KEY ARE PASSED TO WORKER PROCESSES, EACH PROCESS CONNECTS ON ITS OWN
+        """
+        return {"address": self.address, "authkey": self.authkey, "serve": False, "_manager": None}
+
+    def queue(self, name):
+        """
+        FRONTA OSTROVA (ČÍSLO) NEBO FRONTA VÝSLEDKŮ ('results') NA MIGRAČNÍM UZLU
+        ---------------------------------------------------------------------------
+        QUEUE OF AN ISLAND (NUMBER) OR THE RESULTS QUEUE ('results') ON THE MIGRATION HUB
+        """
+        if self._manager is None:
+            self._manager = MigrationManager(address=self.address, authkey=self.authkey)
+            self._manager.connect()
+        return self._manager.queue(name)
+
+    def close(self):
+        if self.serve and self._manager is not None:
+            self._manager.shutdown()
+            self._manager = None
+
+
+def emigrants(fitness_values, count):
+    """
+    PRAVIDLA count NEJLEPŠÍCH JEDINCŮ OHODNOCENÉ GENERACE
+    ------------------------------------------------------
+    RULES OF THE count BEST INDIVIDUALS OF THE SCORED GENERATION
+    """
+    ranked = sorted(range(len(fitness_values)), key=lambda i: fitness_values[i][0], reverse=True)
+    return [fitness_values[i][1] for i in ranked[:count]]
+
+
+def immigrate(ga, rules, fitness_values):
+    """
+    PŘISTĚHOVALCI NAHRADÍ V NOVÉ (JEŠTĚ NEOHODNOCENÉ) GENERACI POTOMKY NA NÁHODNÝCH MÍSTECH Z ga.np_random
+    MÍSTO ELITNÍHO JEDINCE (NEJHORŠÍ MÍSTO OHODNOCENÉ GENERACE fitness_values) SE NEVYBÍRÁ, TEN ZŮSTÁVÁ
+    ------------------------------------------------------------------------------
+    IMMIGRANTS REPLACE OFFSPRING AT RANDOM POSITIONS FROM ga.np_random IN THE NEW (NOT YET SCORED) GENERATION
+    THE POSITION OF THE ELITE INDIVIDUAL (THE WORST POSITION OF THE SCORED GENERATION fitness_values) IS NOT DRAWN, IT STAYS
+    """
+    elite = min(range(len(fitness_values)), key=lambda i: fitness_values[i][0])
+    candidates = [position for position in range(len(ga.population)) if position != elite]
+    positions = ga.np_random.choice(candidates, size=min(len(rules), len(candidates)), replace=False)
+    for position, rule in zip(positions, rules):
+        if ga.genome == "int":
+            ga.population[position] = as_rule(rule).code
+        else:
+            ga.population[position] = str(as_rule(rule))
+
+
+def run_island(index, count, settings, generations, migration_interval, migrants, transport, cache):
+    """
+    BĚH JEDNOHO OSTROVA V PRACOVNÍM PROCESU - KAŽDÝCH migration_interval GENERACÍ POŠLE migrants NEJLEPŠÍCH
+    PRAVIDEL DALŠÍMU OSTROVU V KRUHU A POČKÁ NA PŘISTĚHOVALCE OD PŘEDCHOZÍHO, VÝSLEDEK ULOŽÍ DO FRONTY 'results'
+    -----------------------------------------------------------------------------------------------------------
+    RUNS ONE ISLAND IN A WORKER PROCESS - EVERY migration_interval GENERATIONS IT SENDS ITS migrants BEST RULES
+    TO THE NEXT ISLAND IN THE RING AND WAITS FOR IMMIGRANTS FROM THE PREVIOUS ONE, THE RESULT GOES TO THE 'results' QUEUE
+    """
+    seed_worker()
+    if cache and "cache" not in settings:
+        settings = dict(settings, cache=FitnessCache())
+    ga = GeneticAlgorithm(**settings)
+    outbox = transport.queue((index + 1) % count)
+    inbox = transport.queue(index)
+    with ga.timing():
+        for gen in range(generations):
+            fitness_values = ga.evaluate_fitness()
+            ga.report("generation", gen + 1, fitness_values, island=index)
+            ga.population, gen_rule = ga.next_generation(fitness_values)
+            if (gen + 1) % migration_interval == 0 and gen + 1 < generations:
+                outbox.put(emigrants(fitness_values, migrants))
+                immigrate(ga, inbox.get(), fitness_values)
+    gen_fitness = max(fitness_value for fitness_value, _ in fitness_values)
+    ga.close()
+    transport.queue("results").put((index, gen_fitness, gen_rule))
+
+
+class IslandModel:
+    def __init__(self, islands, migration_interval=5, migrants=2, address=None, authkey=b"islands", serve=True,
+                 cache=True):
+        """
+        OSTROVNÍ MODEL - NĚKOLIK POPULACÍ V SAMOSTATNÝCH PROCESECH, KAŽDÝCH migration_interval GENERACÍ
+        SE migrants NEJLEPŠÍCH JEDINCŮ PŘESUNE NA DALŠÍ OSTROV V KRUHU
+        islands - SEZNAM NASTAVENÍ GeneticAlgorithm PRO KAŽDÝ OSTROV (SLOVNÍKY, MOHOU SE LIŠIT SELEKCÍ, FITNESS, ...)
+        address - None = OSTROVY JEN NA TOMTO POČÍTAČI, (HOST, PORT) = MIGRACE PŘES SÍŤOVÝ UZEL
+        serve - S address: True = UZEL BĚŽÍ NA TOMTO POČÍTAČI, False = PŘIPOJENÍ K UZLU JINÉHO POČÍTAČE
+        cache - KAŽDÝ OSTROV MÁ VLASTNÍ FitnessCache V PAMĚTI (POKUD NENÍ V NASTAVENÍ JINÁ)
+        ------------------------------------------------------------------------------------------------------------
+        ISLAND MODEL - SEVERAL POPULATIONS IN SEPARATE PROCESSES, EVERY migration_interval GENERATIONS
+        THE migrants BEST INDIVIDUALS MOVE TO THE NEXT ISLAND IN THE RING
+        islands - LIST OF GeneticAlgorithm SETTINGS FOR EACH ISLAND (DICTIONARIES, THEY MAY DIFFER IN SELECTION, FITNESS, ...)
+        address - None = ISLANDS ONLY ON THIS MACHINE, (HOST, PORT) = MIGRATION THROUGH A NETWORK HUB
+        serve - WITH address: True = THE HUB RUNS ON THIS MACHINE, False = CONNECT TO THE HUB OF ANOTHER MACHINE
+        cache - EVERY ISLAND HAS ITS OWN IN-MEMORY FitnessCache (UNLESS ITS SETTINGS GIVE ANOTHER ONE)
+        """
+        if not islands:
+            raise ValueError("The island model needs at least one island.")
+        if migration_interval < 1 or migrants < 0:
+            raise ValueError("Migration interval must be at least 1 and migrants must not be negative.")
+        self.islands = [dict(settings) for settings in islands]
+        self.migration_interval = migration_interval
+        self.migrants = migrants
+        self.cache = cache
+        if address is None:
+            self.transport = QueueTransport(len(self.islands))
+        else:
+            self.transport = SocketTransport(address, authkey, serve)
+        self.results = []
+
+    def evolve(self, generations, local_islands=None):
+        """
+        BĚH OSTROVŮ local_islands (INDEXY, None = VŠECHNY) V SAMOSTATNÝCH PROCESECH, generations MUSÍ BÝT ALESPOŇ 1
+        VRACÍ NEJLEPŠÍ PRAVIDLO POSLEDNÍ GENERACE ZE VŠECH OSTROVŮ (PŘIPOJENÝ POČÍTAČ BEZ UZLU VRACÍ None,
+        VÝSLEDKY SBÍRÁ POČÍTAČ S UZLEM), self.results = [(OSTROV, FITNESS, PRAVIDLO), ...]
+        (OSTROVY S RŮZNÝMI FITNESS FUNKCEMI MAJÍ RŮZNÉ STUPNICE, NEJLEPŠÍ PRAVIDLO SE VYBÍRÁ PODLE HODNOTY FITNESS)
+        ------------------------------------------------------------------------------------------------------
+        RUNS THE ISLANDS local_islands (INDICES, None = ALL) IN SEPARATE PROCESSES, generations MUST BE AT LEAST 1
+        RETURNS THE BEST RULE OF THE LAST GENERATION OVER ALL ISLANDS (A CONNECTED MACHINE WITHOUT THE HUB RETURNS None,
+        THE RESULTS ARE COLLECTED BY THE MACHINE WITH THE HUB), self.results = [(ISLAND, FITNESS, RULE), ...]
+        (ISLANDS WITH DIFFERENT FITNESS FUNCTIONS HAVE DIFFERENT SCALES, THE BEST RULE IS PICKED BY THE FITNESS VALUE)
+        """
+        if generations < 1:
+            raise ValueError("The island model needs at least one generation.")
+        count = len(self.islands)
+        local_islands = range(count) if local_islands is None else local_islands
+        processes = [multiprocessing.Process(target=run_island,
+                                             args=(index, count, self.islands[index], generations,
+                                                   self.migration_interval, self.migrants, self.transport, self.cache))
+                     for index in local_islands]
+        for process in processes:
+            process.start()
+        collects = not isinstance(self.transport, SocketTransport) or self.transport.serve
+        results = []
+        while collects and len(results) < count:
+            try:
+                results.append(self.transport.queue("results").get(timeout=1))
+            except queue.Empty:
+                self.check_processes(processes)
+        for process in processes:
+            process.join()
+        self.check_processes(processes)
+        if not collects:
+            return None
+        self.results = sorted(results)
+        return max(self.results, key=lambda result: result[1])[2]
+
+    def check_processes(self, processes):
+        """
+        KONTROLA PROCESŮ OSTROVŮ - PŘI CHYBĚ SE OSTATNÍ UKONČÍ (JINAK BY ČEKALY NA PŘISTĚHOVALCE NAVŽDY)
+        --------------------------------------------------------------------------------------------------
+        CHECKS THE ISLAND PROCESSES - ON FAILURE THE OTHERS ARE TERMINATED (OTHERWISE THEY WOULD WAIT FOR IMMIGRANTS FOREVER)
+        """
+        failed = [process for process in processes if process.exitcode not in (None, 0)]
+        if failed:
+            for process in processes:
+                process.terminate()
+            raise RuntimeError(f"{len(failed)} island process(es) failed.")
+
+    def close(self):
+        """
+        UKONČENÍ MIGRAČNÍHO UZLU (POKUD BĚŽÍ NA TOMTO POČÍTAČI)
+        --------------------------------------------------------
+        SHUTS DOWN THE MIGRATION HUB (IF IT RUNS ON THIS MACHINE)
+        """
+        self.transport.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -1,4 +1,6 @@
 from geneticAlgorithm import GeneticAlgorithm
+from evaluationBackend import ProcessBackend
+from fitnessCache import FitnessCache
 import time
 
 if __name__ == "__main__":
@@ -51,6 +53,94 @@ if __name__ == "__main__":
         'sym' - INTERESTING PATTERNS AND SYMMETRIES
         'alt' - CHECKERBOARD PATTERN
         
+        VYHODNOCOVACÍ BACKEND
+        backend - SerialBackend() - CELÁ POPULACE V HLAVNÍM PROCESU
+                  ThreadBackend(max_workers, chunk_size) - VLÁKNA
+                  ProcessBackend(max_workers, chunk_size) - PROCESY (PRACOVNÍCI SE POUŽIJÍ PRO VŠECHNY GENERACE)
+        ------------------------------------------------------------------------------------
+        EVALUATION BACKEND
+        backend - SerialBackend() - THE WHOLE POPULATION IN THE MAIN PROCESS
+                  ThreadBackend(max_workers, chunk_size) - THREADS
+                  ProcessBackend(max_workers, chunk_size) - PROCESSES (WORKERS ARE REUSED FOR ALL GENERATIONS)
+
+        VYROVNÁVACÍ PAMĚŤ FITNESS HODNOT
+        cache - FitnessCache(maxsize, path, stochastic_policy, seeds) - JIŽ OHODNOCENÁ PRAVIDLA SE NESIMULUJÍ ZNOVU
+                path - SOUBOR SQLITE SDÍLENÝ MEZI BĚHY (None = JEN V PAMĚTI)
+                stochastic_policy - 'bypass' = 'min' A 'div' SE NEUKLÁDAJÍ, 'mean' = UKLÁDÁ SE PRŮMĚR ZE seeds BĚHŮ
+        ------------------------------------------------------------------------------------
+        FITNESS CACHE
+        cache - FitnessCache(maxsize, path, stochastic_policy, seeds) - RULES ALREADY SCORED ARE NOT SIMULATED AGAIN
+                path - SQLITE FILE SHARED BETWEEN RUNS (None = MEMORY ONLY)
+                stochastic_policy - 'bypass' = 'min' AND 'div' ARE NOT CACHED, 'mean' = THE MEAN OF seeds RUNS IS CACHED
+
+        VÍCE NÁHODNÝCH MŘÍŽEK
+        seeds - POČET NÁHODNÝCH POČÁTEČNÍCH MŘÍŽEK PRO 'min' A 'div' (1 = JEDNA MŘÍŽKA JAKO DŘÍVE), FITNESS JE PRŮMĚR,
+                VŠICHNI JEDINCI GENERACE DOSTANOU STEJNÉ MŘÍŽKY A VŠE SE SIMULUJE JAKO JEDEN ZÁSOBNÍK
+        ------------------------------------------------------------------------------------
+        MULTIPLE RANDOM GRIDS
+        seeds - NUMBER OF RANDOM INITIAL GRIDS FOR 'min' AND 'div' (1 = ONE GRID AS BEFORE), THE FITNESS IS THE MEAN,
+                ALL INDIVIDUALS OF A GENERATION GET THE SAME GRIDS AND EVERYTHING IS SIMULATED AS ONE STACK
+
+        REPREZENTACE JEDINCŮ
+        genome - 'string' = TEXTY 'Bxxx/Sxxx', 'int' = 18BITOVÁ ČÍSLA (VEKTOROVÁ SELEKCE, KŘÍŽENÍ A MUTACE PRO VELKÉ POPULACE)
+        ------------------------------------------------------------------------------------
+        REPRESENTATION OF INDIVIDUALS
+        genome - 'string' = 'Bxxx/Sxxx' STRINGS, 'int' = 18-BIT INTEGERS (VECTORIZED SELECTION, CROSSOVER AND MUTATION FOR LARGE POPULATIONS)
+
+        VÍCESTUPŇOVÉ VYHODNOCENÍ
+        fidelity - SuccessiveHalving(rungs, keep) - CELÁ POPULACE SE VYHODNOTÍ LEVNĚ (rungs = [cagens NEBO (cagens, rows, cols), ...]),
+                   DO DELŠÍ SIMULACE POSTUPUJE JEN NEJLEPŠÍ PODÍL keep (None = VŠICHNI JEDINCI PLNĚ)
+        ------------------------------------------------------------------------------------
+        MULTI-FIDELITY EVALUATION
+        fidelity - SuccessiveHalving(rungs, keep) - THE WHOLE POPULATION IS SCORED CHEAPLY (rungs = [cagens OR (cagens, rows, cols), ...]),
+                   ONLY THE BEST keep FRACTION IS PROMOTED TO LONGER SIMULATIONS (None = ALL INDIVIDUALS IN FULL)
+
+        VÝPIS PRŮBĚHU
+        progress - ConsoleSink(every) - JEDEN ŘÁDEK SOUHRNU ZA GENERACI (VÝCHOZÍ), QuietSink() - BEZ VÝPISU,
+                   JsonLinesSink(path) - UDÁLOSTI JAKO ŘÁDKY JSON (ZÁPIS NA POZADÍ), CallbackSink(funkce) - VLASTNÍ ZPRACOVÁNÍ
+        ------------------------------------------------------------------------------------
+        PROGRESS OUTPUT
+        progress - ConsoleSink(every) - ONE SUMMARY LINE PER GENERATION (DEFAULT), QuietSink() - NO OUTPUT,
+                   JsonLinesSink(path) - EVENTS AS JSON LINES (WRITTEN IN THE BACKGROUND), CallbackSink(function) - CUSTOM HANDLING
+
+        MĚŘENÍ ČASU
+        instrument - True = ČASY HLAVNÍCH FUNKCÍ SE POSÍLAJÍ V KAŽDÉ UDÁLOSTI PRŮBĚHU (instrumentation.py)
+        profile_generation - ČÍSLO GENERACE, KTERÁ SE PROJDE VZORKOVACÍM PROFILEREM (None = ŽÁDNÁ)
+        ------------------------------------------------------------------------------------
+        TIMING
+        instrument - True = TIMES OF THE MAIN FUNCTIONS ARE SENT IN EVERY PROGRESS EVENT (instrumentation.py)
+        profile_generation - NUMBER OF THE GENERATION RUN UNDER THE SAMPLING PROFILER (None = NONE)
+
+        KONTROLNÍ BODY
+        ga.evolve(generations, checkpoint, checkpoint_interval) - STAV SE UKLÁDÁ DO SOUBORU checkpoint KAŽDÝCH checkpoint_interval GENERACÍ
+        GeneticAlgorithm.resume(checkpoint, backend, progress, instrument, profile_generation) - OBNOVENÍ PO PŘERUŠENÍ,
+                   evolve(generations) POKRAČUJE OD ULOŽENÉ GENERACE (backend, progress, instrument A profile_generation
+                   SE DO KONTROLNÍHO BODU NEUKLÁDAJÍ, ZADÁVAJÍ SE ZNOVU)
+        ------------------------------------------------------------------------------------
+        CHECKPOINTS
+        ga.evolve(generations, checkpoint, checkpoint_interval) - THE STATE IS SAVED TO THE FILE checkpoint EVERY checkpoint_interval GENERATIONS
+        GeneticAlgorithm.resume(checkpoint, backend, progress, instrument, profile_generation) - RESTORES AFTER AN INTERRUPTION,
+                   evolve(generations) CONTINUES FROM THE SAVED GENERATION (backend, progress, instrument AND profile_generation
+                   ARE NOT STORED IN THE CHECKPOINT, THEY ARE GIVEN AGAIN)
+
+        USTÁLENÁ EVOLUCE
+        ga.evolve_steady_state(evaluations, in_flight, replacement) - MÍSTO evolve: POTOMCI SE VYHODNOCUJÍ ASYNCHRONNĚ
+                   (in_flight NAJEDNOU) A HNED NAHRAZUJÍ NEJHORŠÍHO JEDINCE ('worst') NEBO PORAŽENÉHO Z TURNAJE ('tournament')
+        ------------------------------------------------------------------------------------
+        STEADY-STATE EVOLUTION
+        ga.evolve_steady_state(evaluations, in_flight, replacement) - INSTEAD OF evolve: OFFSPRING ARE SCORED ASYNCHRONOUSLY
+                   (in_flight AT ONCE) AND AT ONCE REPLACE THE WORST INDIVIDUAL ('worst') OR A TOURNAMENT LOSER ('tournament')
+
+        OSTROVNÍ MODEL
+        IslandModel(islands, migration_interval, migrants, address, authkey, serve) - VÍCE POPULACÍ V SAMOSTATNÝCH PROCESECH,
+                   islands = [NASTAVENÍ GeneticAlgorithm PRO KAŽDÝ OSTROV], KAŽDÝCH migration_interval GENERACÍ SE migrants
+                   NEJLEPŠÍCH PRAVIDEL PŘESUNE NA DALŠÍ OSTROV (address = (HOST, PORT) PRO OSTROVY NA VÍCE POČÍTAČÍCH)
+        ------------------------------------------------------------------------------------
+        ISLAND MODEL
+        IslandModel(islands, migration_interval, migrants, address, authkey, serve) - SEVERAL POPULATIONS IN SEPARATE PROCESSES,
+                   islands = [GeneticAlgorithm SETTINGS FOR EACH ISLAND], EVERY migration_interval GENERATIONS THE migrants
+                   BEST RULES MOVE TO THE NEXT ISLAND (address = (HOST, PORT) FOR ISLANDS ON SEVERAL MACHINES)
+
         DÉLKA GENETICKÉHO ALGORITMU
         generations - POČET GENERACÍ GENETICKÉHO ALGORITMU, PO KTERÉM SE SMYČKA UZAVŘE //
                         A VYHODNOTÍ ČLEN S NEJVYŠŠÍ FINTESS
@@ -60,9 +150,11 @@ if __name__ == "__main__":
                         IS CLOSED AND THE MEMBER WITH THE HIGHEST FINTESS IS EVALUATED
     """
     start_time = time.time()
-    ga = GeneticAlgorithm(rows=9, cols=9, population_size=150, 
-                          mutation_rate=0.01, cagens=100, selection="t", fitfun="alt")
-    best_rule_string = ga.evolve(generations=30)
+    with ProcessBackend() as backend, FitnessCache() as cache:
+        ga = GeneticAlgorithm(rows=9, cols=9, population_size=150, 
+                              mutation_rate=0.01, cagens=100, selection="t", fitfun="alt", backend=backend, cache=cache)
+        best_rule_string = ga.evolve(generations=30)
     end_time = time.time()
     elapsed_time = end_time - start_time
-    print("Best rule string found:", best_rule_string, "in", int(elapsed_time), "seconds")
\ No newline at end of file
+    print("Best rule string found:", best_rule_string, "in", int(elapsed_time), "seconds")
+    print("Fitness cache:", cache.stats())
\ No newline at end of file
@@ -0,0 +1,158 @@
+import json
+import queue
+import threading
+
+"""
+UDÁLOSTI PRŮBĚHU GENETICKÉHO ALGORITMU (SLOVNÍKY)
+'generation' - SOUHRN OHODNOCENÉ GENERACE: generation, best, best_rule, mean, worst, diversity (PODÍL RŮZNÝCH PRAVIDEL),
+               evaluation_time (SEKUNDY), evaluations (POČET OHODNOCENÝCH JEDINCŮ CELKEM), cache_hits, cache_misses,
+               PŘI seeds > 1 TAKÉ best_variance A mean_variance (ROZPTYL FITNESS PŘES NÁHODNÉ MŘÍŽKY)
+'steady' - STEJNÝ SOUHRN PRO USTÁLENOU EVOLUCI (generation = POČET OHODNOCENÝCH POTOMKŮ / VELIKOST POPULACE)
+           PŘI ZAPNUTÉM MĚŘENÍ OBA SOUHRNY OBSAHUJÍ timers = {FUNKCE: {'calls', 'seconds'}} ZA DOBU OD MINULÉHO SOUHRNU
+'profile' - VÝSLEDEK VZORKOVACÍHO PROFILERU PRO JEDNU GENERACI: generation, samples, functions
+'shard' - DOKONČENÁ ČÁST PRŮCHODU PRAVIDEL (ruleSweep.py): evaluated, pending (POČET PRAVIDEL K VYHODNOCENÍ), elapsed (SEKUNDY)
+--------------------------------------------------------------------------------------------------------------------
+PROGRESS EVENTS OF THE GENETIC ALGORITHM (DICTIONARIES)
+'generation' - SUMMARY OF A SCORED GENERATION: generation, best, best_rule, mean, worst, diversity (SHARE OF DISTINCT RULES),
+               evaluation_time (SECONDS), evaluations (TOTAL NUMBER OF SCORED INDIVIDUALS), cache_hits, cache_misses,
+               WITH seeds > 1 ALSO best_variance AND mean_variance (VARIANCE OF THE FITNESS OVER THE RANDOM GRIDS)
+'steady' - THE SAME SUMMARY FOR STEADY-STATE EVOLUTION (generation = NUMBER OF SCORED OFFSPRING / POPULATION SIZE)
+           WITH TIMING ENABLED BOTH SUMMARIES HOLD timers = {FUNCTION: {'calls', 'seconds'}} SINCE THE LAST SUMMARY
+'profile' - RESULT OF THE SAMPLING PROFILER FOR ONE GENERATION: generation, samples, functions
+'shard' - A FINISHED SHARD OF A RULE SWEEP (ruleSweep.py): evaluated, pending (NUMBER OF RULES TO EVALUATE), elapsed (SECONDS)
+"""
+EVENTS = ("generation", "steady", "profile", "shard")
+
+
+class QuietSink:
+    def emit(self, event):
+        """
+        UDÁLOST SE ZAHODÍ
+        ------------------
+        THE EVENT IS DISCARDED
+        """
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class ConsoleSink(QuietSink):
+    def __init__(self, every=1):
+        """
+        JEDEN ŘÁDEK SOUHRNU NA KONZOLI ZA KAŽDOU every-TOU GENERACI
+        ------------------------------------------------------------
+        ONE SUMMARY LINE ON THE CONSOLE FOR EVERY every-TH GENERATION
+        """
+        self.every = every
+        self._count = 0
+
+    def emit(self, event):
+        """
+        VÝPIS SOUHRNU GENERACE (S OSTROVEM, POKUD JE V UDÁLOSTI, A TŘEMI NEJPOMALEJŠÍMI FUNKCEMI PŘI MĚŘENÍ),
+        NEJČASTĚJŠÍCH FUNKCÍ Z PROFILERU NEBO POSTUPU PRŮCHODU PRAVIDEL
+        ---------------------------------------------------------------------------------------------------
+        PRINTS THE GENERATION SUMMARY (WITH THE ISLAND, IF THE EVENT HAS ONE, AND THE THREE SLOWEST FUNCTIONS WHEN TIMING),
+        THE MOST FREQUENT FUNCTIONS FROM THE PROFILER OR THE PROGRESS OF A RULE SWEEP
+        """
+        if event["event"] == "shard":
+            print(f"{event['evaluated']}/{event['pending']} rules evaluated in {event['elapsed']:.1f} s")
+            return
+        if event["event"] == "profile":
+            print(f"PROFIL GENERACE {event['generation']} ({event['samples']} vzorků):")
+            for function in event["functions"][:10]:
+                print(f"  {function['share']:6.1%}  {function['function']}")
+            return
+        self._count += 1
+        if self._count % self.every:
+            return
+        island = f"OSTROV {event['island']} " if "island" in event else ""
+        line = f"{island}GENERACE {event['generation']}: best {event['best']:.4f} ({event['best_rule']}), "
+        if "best_variance" in event:
+            line += f"variance {event['best_variance']:.4f}, "
+        line += (f"mean {event['mean']:.4f}, worst {event['worst']:.4f}, diversity {event['diversity']:.2f}, "
+                 f"{event['evaluation_time']:.2f} s, cache {event['cache_hits']}/{event['cache_hits'] + event['cache_misses']}")
+        if event.get("timers"):
+            slowest = sorted(event["timers"].items(), key=lambda item: -item[1]["seconds"])[:3]
+            line += ", " + ", ".join(f"{name} {values['seconds']:.3f} s" for name, values in slowest)
+        print(line)
+
+
+class CallbackSink(QuietSink):
+    def __init__(self, callback):
+        """
+        KAŽDÁ UDÁLOST SE PŘEDÁ FUNKCI callback(event)
+        ----------------------------------------------
+        EVERY EVENT IS PASSED TO THE FUNCTION callback(event)
+        """
+        self.callback = callback
+
+    def emit(self, event):
+        self.callback(event)
+
+
+class JsonLinesSink(QuietSink):
+    def __init__(self, path):
+        """
+        UDÁLOSTI JAKO ŘÁDKY JSON V SOUBORU path (PŘIPOJUJÍ SE NA KONEC)
+        ZÁPIS PROBÍHÁ VE VLÁKNĚ NA POZADÍ PŘES BUFFER, emit NIKDY NEČEKÁ NA DISK
+        --------------------------------------------------------------------------
+        EVENTS AS JSON LINES IN THE FILE path (APPENDED AT THE END)
+        WRITING HAPPENS IN A BACKGROUND THREAD THROUGH A BUFFER, emit NEVER WAITS FOR THE DISK
+        """
+        self.path = path
+        self._queue = queue.Queue()
+        self._thread = None
+
+    def __getstate__(self):
+        """
+        DO JINÉHO PROCESU SE PŘEDÁVÁ JEN CESTA (VLÁKNO SE SPUSTÍ AŽ PŘI PRVNÍ UDÁLOSTI)
+        ---------------------------------------------------------------------------------
+        ONLY THE PATH IS PASSED TO ANOTHER PROCESS (THE THREAD STARTS WITH THE FIRST EVENT)
+        """
+        return {"path": self.path}
+
+    def __setstate__(self, state):
+        self.__init__(state["path"])
+
+    def emit(self, event):
+        """
+        ZAŘAZENÍ UDÁLOSTI DO FRONTY PRO VLÁKNO ZÁPISU
+        ----------------------------------------------
+        QUEUES THE EVENT FOR THE WRITER THREAD
+        """
+        if self._thread is None:
+            self._thread = threading.Thread(target=self.write_events, daemon=True)
+            self._thread.start()
+        self._queue.put(event)
+
+    def write_events(self):
+        """
+        SMYČKA VLÁKNA ZÁPISU - SOUBOR SE VYPRÁZDNÍ VŽDY, KDYŽ JE FRONTA PRÁZDNÁ
+        --------------------------------------------------------------------------
+        LOOP OF THE WRITER THREAD - THE FILE IS FLUSHED WHENEVER THE QUEUE IS EMPTY
+        """
+        with open(self.path, "a", encoding="utf-8") as events_file:
+            while True:
+                event = self._queue.get()
+                if event is None:
+                    break
+                events_file.write(json.dumps(event, default=float) + "\n")
+                if self._queue.empty():
+                    events_file.flush()
+
+    def close(self):
+        """
+        ZÁPIS ZBÝVAJÍCÍCH UDÁLOSTÍ A UKONČENÍ VLÁKNA (LZE VOLAT OPAKOVANĚ)
+        --------------------------------------------------------------------
+        WRITES THE REMAINING EVENTS AND STOPS THE THREAD (MAY BE CALLED REPEATEDLY)
+        """
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
@@ -0,0 +1,45 @@
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from geneticAlgorithm import GeneticAlgorithm
+from videoRenderer import render_rules, top_rules
+
+""" 
+NASTAVENÍ DÁVKOVÉHO VYKRESLENÍ (BEZ OKNA)
+rules - PRAVIDLA K VYKRESLENÍ
+checkpoint - CESTA K SOUBORU STAVU GENETICKÉHO ALGORITMU (None = POUŽIJÍ SE rules), Z POSLEDNÍ OHODNOCENÉ
+             GENERACE SE VYKRESLÍ top_k NEJLEPŠÍCH RŮZNÝCH PRAVIDEL
+extension - '.mp4' = VIDEO, '.gif' = ANIMOVANÝ GIF
+size - VELIKOST CELULÁRNÍHO AUTOMATU, generations - DÉLKA SIMULACE, fps - SNÍMKY ZA SEKUNDU
+-----------------------------------------------------------------------
+BATCH RENDERING SETTINGS (WITHOUT A WINDOW)
+rules - RULES TO RENDER
+checkpoint - PATH TO A GENETIC ALGORITHM STATE FILE (None = rules ARE USED), THE top_k BEST DISTINCT RULES
+             OF THE LAST SCORED GENERATION ARE RENDERED
+extension - '.mp4' = VIDEO, '.gif' = ANIMATED GIF
+size - SIZE OF THE CELLULAR AUTOMATON, generations - LENGTH OF THE SIMULATION, fps - FRAMES PER SECOND
+"""
+rules = ["B02678/S0346", "B3/S23", "B36/S23"]
+checkpoint = None
+top_k = 5
+extension = ".mp4"
+size = 11
+generations = 100
+fps = 2.5
+
+if __name__ == "__main__":
+    current_directory = os.path.dirname(__file__)
+    output_directory = os.path.join(current_directory, 'videos')
+
+    if checkpoint is not None:
+        ga = GeneticAlgorithm.resume(checkpoint)
+        rules = top_rules(ga.fitness_values, top_k)
+        ga.close()
+
+    start_time = time.time()
+    paths = render_rules(rules, output_directory, extension, size, size, generations, fps)
+    for path in paths:
+        print(path)
+    print(len(paths), "videos rendered in", round(time.time() - start_time, 2), "seconds")
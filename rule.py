@@ -0,0 +1,113 @@
+import re
+from functools import lru_cache
+import numpy as np
+
+RULE_PATTERN = re.compile(r'^B(\d*)/S(\d*)$')
+RULE_SPACE_SIZE = 1 << 18
+
+
+class Rule:
+    __slots__ = ('birth', 'survival', 'code', 'table')
+
+    def __init__(self, birth, survival):
+        birth = tuple(sorted(set(int(n) for n in birth)))
+        survival = tuple(sorted(set(int(n) for n in survival)))
+        if any(n < 0 or n > 8 for n in birth + survival):
+            raise ValueError("Neighbour counts in a rule must be between 0 and 8.")
+        code = 0
+        for n in birth:
+            code |= 1 << n
+        for n in survival:
+            code |= 1 << (9 + n)
+        table = np.zeros((2, 9), dtype=bool)
+        table[0, list(birth)] = True
+        table[1, list(survival)] = True
+        table.flags.writeable = False
+        object.__setattr__(self, 'birth', birth)
+        object.__setattr__(self, 'survival', survival)
+        object.__setattr__(self, 'code', code)
+        object.__setattr__(self, 'table', table)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Rule objects are immutable.")
+
+    @classmethod
+    def from_string(cls, rule_string):
+        """
+        VYTVOŘENÍ PRAVIDLA Z TEXTU 'Bxxx/Sxxx' (S VYROVNÁVACÍ PAMĚTÍ)
+        ---------------------------------------------------------------
+        CREATES A RULE FROM THE 'Bxxx/Sxxx' STRING (CACHED)
+        """
+        return parse_rule(rule_string)
+
+    @classmethod
+    def from_code(cls, code):
+        """
+        VYTVOŘENÍ PRAVIDLA Z 18BITOVÉHO CELÉHO ČÍSLA
+        BITY 0-8 = ZROZENÍ, BITY 9-17 = PŘEŽITÍ
+        ----------------------------------------------
+        CREATES A RULE FROM ITS 18-BIT INTEGER ENCODING
+        BITS 0-8 = BIRTH, BITS 9-17 = SURVIVAL
+        """
+        return rule_from_code(int(code))
+
+    def __str__(self):
+        return f"B{''.join(map(str, self.birth))}/S{''.join(map(str, self.survival))}"
+
+    def __repr__(self):
+        return f"Rule('{self}')"
+
+    def __eq__(self, other):
+        if isinstance(other, Rule):
+            return self.code == other.code
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.code)
+
+    def __reduce__(self):
+        return (rule_from_code, (self.code,))
+
+
+@lru_cache(maxsize=4096)
+def parse_rule(rule_string):
+    """
+    PŘEVOD TEXTOVÉHO PRAVIDLA NA OBJEKT Rule (KAŽDÝ TEXT SE ZPRACUJE JEN JEDNOU)
+    ČÍSLICE 9 SE PŘIJME A IGNORUJE (BUŇKA NEMÁ 9 SOUSEDŮ); PRÁZDNÁ ČÁST B NEBO S ('B2/S') JE PRAVIDLO BEZ ZROZENÍ
+    NEBO PŘEŽITÍ, TAKOVÝ TEXT VYTVÁŘÍ str(Rule) PRO KÓDY S PRÁZDNOU ČÁSTÍ
+    ----------------------------------------------------------------------------
+    CONVERTS A RULE STRING TO A Rule OBJECT (EACH STRING IS PARSED ONLY ONCE)
+    THE DIGIT 9 IS ACCEPTED AND IGNORED (A CELL NEVER HAS 9 NEIGHBOURS); AN EMPTY B OR S PART ('B2/S') IS A RULE
+    WITHOUT BIRTH OR SURVIVAL, str(Rule) PRODUCES SUCH STRINGS FOR CODES WITH AN EMPTY PART
+    """
+    match = RULE_PATTERN.match(rule_string)
+    if not match:
+        raise ValueError("Invalid rule format. Expected 'Bxxx/Sxxx'.")
+    return Rule([int(x) for x in match.group(1) if x != '9'], [int(x) for x in match.group(2) if x != '9'])
+
+
+@lru_cache(maxsize=4096)
+def rule_from_code(code):
+    """
+    PŘEVOD 18BITOVÉHO KÓDU NA OBJEKT Rule
+    --------------------------------------
+    CONVERTS AN 18-BIT CODE TO A Rule OBJECT
+    """
+    if not 0 <= code < RULE_SPACE_SIZE:
+        raise ValueError("Rule code must be between 0 and 2**18 - 1.")
+    return Rule([n for n in range(9) if code >> n & 1], [n for n in range(9) if code >> (9 + n) & 1])
+
+
+def as_rule(rule):
+    """
+    PŘIJME Rule, TEXT 'Bxxx/Sxxx' NEBO 18BITOVÝ KÓD A VRÁTÍ Rule
+    -------------------------------------------------------------
+    ACCEPTS A Rule, A 'Bxxx/Sxxx' STRING OR AN 18-BIT CODE AND RETURNS A Rule
+    """
+    if isinstance(rule, Rule):
+        return rule
+    if isinstance(rule, str):
+        return parse_rule(rule)
+    if isinstance(rule, (int, np.integer)):
+        return rule_from_code(int(rule))
+    raise TypeError("Expected a Rule, a 'Bxxx/Sxxx' string or an integer rule code.")
@@ -0,0 +1,162 @@
+import csv
+from functools import partial
+import numpy as np
+from batchedAutomaton import BatchedCellularAutomaton, DenseStackEngine, state_keys
+from evaluationBackend import SerialBackend
+from rule import as_rule
+
+"""
+STATISTIKY KAŽDÉ GENERACE (METRIKY Z fitnessMetrics.py)
+live - POČET ŽIVÝCH BUNĚK, changed - POČET ZMĚNĚNÝCH BUNĚK, mirror - SKÓRE SYMETRIE (1 = ZRCADLOVĚ SYMETRICKÁ MŘÍŽKA)
+SOUHRN PRAVIDLA NAVÍC OBSAHUJE period (DÉLKA NALEZENÉHO CYKLU, 0 = BEZ OPAKOVÁNÍ) A transient (GENERACE ZAČÁTKU CYKLU)
+-----------------------------------------------------------------------------------------------------------------------
+STATISTICS OF EVERY GENERATION (METRICS FROM fitnessMetrics.py)
+live - NUMBER OF LIVE CELLS, changed - NUMBER OF CHANGED CELLS, mirror - SYMMETRY SCORE (1 = MIRROR-SYMMETRIC GRID)
+THE RULE SUMMARY ALSO HOLDS period (LENGTH OF THE DETECTED CYCLE, 0 = NO REPEAT) AND transient (GENERATION WHERE THE CYCLE STARTS)
+"""
+STATISTICS = ("live", "changed", "mirror")
+
+
+def simulate_chunk(rules, rows, cols, generations, initial="center", probability=0.3):
+    """
+    SIMULACE ČÁSTI PRAVIDEL JAKO JEDEN ZÁSOBNÍK MŘÍŽEK - PRO KAŽDÉ PRAVIDLO (PRAVIDLO, STATISTIKY TVARU
+    (len(STATISTICS), generations + 1), period, transient)
+    initial - 'center' = JEDNA ŽIVÁ BUŇKA UPROSTŘED, 'random' = NÁHODNÁ MŘÍŽKA S HUSTOTOU probability
+    ------------------------------------------------------------------------------------------------------
+    SIMULATES A CHUNK OF RULES AS ONE STACK OF GRIDS - FOR EVERY RULE (RULE, STATISTICS OF SHAPE
+    (len(STATISTICS), generations + 1), period, transient)
+    initial - 'center' = ONE LIVE CELL IN THE MIDDLE, 'random' = RANDOM GRID WITH DENSITY probability
+    """
+    batch = BatchedCellularAutomaton(rows, cols, rules)
+    if initial == "center":
+        batch.initialize_center_cells()
+        engine = batch.center_seeded_engine()
+    elif initial == "random":
+        batch.randomize_grids(probability)
+        engine = DenseStackEngine(rows, cols)
+    else:
+        raise ValueError("Invalid initial grid. Expected 'center' or 'random'.")
+    metrics = engine.metrics(STATISTICS)
+    statistics = np.zeros((len(rules), len(STATISTICS), generations + 1))
+    periods = np.zeros(len(rules), dtype=int)
+    transients = np.zeros(len(rules), dtype=int)
+    seen = [{} for _ in rules]
+
+    states = engine.fold(batch.grids)
+    prev_states = states
+    for gen in range(generations + 1):
+        measured = metrics.measure(states, prev_states)
+        for index, name in enumerate(STATISTICS):
+            statistics[:, index, gen] = measured[name]
+        for layer, key in enumerate(state_keys(states)):
+            if periods[layer] == 0:
+                if key in seen[layer]:
+                    transients[layer] = seen[layer][key]
+                    periods[layer] = gen - transients[layer]
+                else:
+                    seen[layer][key] = gen
+        if gen < generations:
+            prev_states = states
+            states = engine.step(states, batch.tables)
+    return [(str(as_rule(rule)), statistics[i], int(periods[i]), int(transients[i])) for i, rule in enumerate(rules)]
+
+
+def analyze_rules(rules, rows=11, cols=11, generations=100, initial="center", backend=None):
+    """
+    STATISTIKY PRO SEZNAM PRAVIDEL (NAPŘ. top_rules Z BĚHU GENETICKÉHO ALGORITMU) - ČÁSTI PRAVIDEL SE SIMULUJÍ
+    PARALELNĚ PŘES backend (evaluationBackend.py) A VÝSLEDKY SE ZAPISUJÍ DO DVOU SLOUPCOVÝCH TABULEK
+    VRACÍ (generations_table, summary_table) - SLOVNÍKY {SLOUPEC: np.ndarray}
+    generations_table - JEDEN ŘÁDEK NA PRAVIDLO A GENERACI: rule, generation, live, changed, mirror
+    summary_table - JEDEN ŘÁDEK NA PRAVIDLO: rule, period, transient, final_live A mean_ PRO KAŽDOU STATISTIKU
+    --------------------------------------------------------------------------------------------------------------
+    STATISTICS FOR A LIST OF RULES (E.G. top_rules FROM A GENETIC ALGORITHM RUN) - CHUNKS OF RULES ARE SIMULATED
+    IN PARALLEL THROUGH backend (evaluationBackend.py) AND THE RESULTS ARE WRITTEN INTO TWO COLUMNAR TABLES
+    RETURNS (generations_table, summary_table) - DICTIONARIES {COLUMN: np.ndarray}
+    generations_table - ONE ROW PER RULE AND GENERATION: rule, generation, live, changed, mirror
+    summary_table - ONE ROW PER RULE: rule, period, transient, final_live AND mean_ FOR EVERY STATISTIC
+    """
+    backend = backend or SerialBackend()
+    results = backend.map_chunks(partial(simulate_chunk, rows=rows, cols=cols, generations=generations,
+                                         initial=initial), list(rules))
+    count = len(results)
+    length = generations + 1
+    names = np.array([rule for rule, _, _, _ in results])
+    generations_table = {
+        "rule": np.repeat(names, length),
+        "generation": np.tile(np.arange(length), count),
+    }
+    summary_table = {
+        "rule": names,
+        "period": np.array([period for _, _, period, _ in results], dtype=int),
+        "transient": np.array([transient for _, _, _, transient in results], dtype=int),
+    }
+    statistics = np.stack([values for _, values, _, _ in results]) if results else np.zeros((0, len(STATISTICS), length))
+    for index, name in enumerate(STATISTICS):
+        generations_table[name] = statistics[:, index].ravel()
+    summary_table["final_live"] = statistics[:, 0, -1]
+    for index, name in enumerate(STATISTICS):
+        summary_table["mean_" + name] = statistics[:, index].mean(axis=1)
+    return generations_table, summary_table
+
+
+def save_table(path, table):
+    """
+    ULOŽENÍ SLOUPCOVÉ TABULKY - '.npz' = SLOUPCE JAKO POLE NUMPY, JINAK CSV S HLAVIČKOU
+    -------------------------------------------------------------------------------------
+    SAVES A COLUMNAR TABLE - '.npz' = COLUMNS AS NUMPY ARRAYS, OTHERWISE CSV WITH A HEADER
+    """
+    if path.endswith(".npz"):
+        np.savez_compressed(path, **table)
+        return
+    with open(path, "w", newline="", encoding="utf-8") as table_file:
+        writer = csv.writer(table_file)
+        writer.writerow(table)
+        writer.writerows(zip(*(column.tolist() for column in table.values())))
+
+
+def load_table(path):
+    """
+    NAČTENÍ TABULKY ULOŽENÉ FUNKCÍ save_table VE FORMÁTU '.npz'
+    -------------------------------------------------------------
+    LOADS A TABLE SAVED BY save_table IN THE '.npz' FORMAT
+    """
+    with np.load(path) as data:
+        return {name: data[name] for name in data.files}
+
+
+def plot_small_multiples(generations_table, summary_table, path, statistic="live", columns=5, rows_per_page=6):
+    """
+    MALÉ GRAFY statistic PRO KAŽDÉ PRAVIDLO VE SPOLEČNÉM MĚŘÍTKU, columns x rows_per_page GRAFŮ NA STRANU PDF
+    (V NÁZVU GRAFU JE PRAVIDLO A PERIODA, SVISLÁ ČÁRA OZNAČUJE ZAČÁTEK CYKLU)
+    -----------------------------------------------------------------------------------------------------------
+    SMALL PLOTS OF statistic FOR EVERY RULE ON A SHARED SCALE, columns x rows_per_page PLOTS PER PDF PAGE
+    (THE PLOT TITLE SHOWS THE RULE AND THE PERIOD, A VERTICAL LINE MARKS THE START OF THE CYCLE)
+    """
+    import matplotlib.pyplot as plt
+    from matplotlib.backends.backend_pdf import PdfPages
+
+    count = len(summary_table["rule"])
+    values = generations_table[statistic].reshape(count, -1) if count else np.zeros((0, 1))
+    top = max(float(values.max()) if values.size else 1.0, 1.0) * 1.05
+    per_page = columns * rows_per_page
+    with PdfPages(path) as pdf:
+        for first in range(0, max(count, 1), per_page):
+            fig, axes = plt.subplots(rows_per_page, columns, figsize=(2.4 * columns, 1.6 * rows_per_page),
+                                     sharex=True, sharey=True, squeeze=False)
+            for offset, ax in enumerate(axes.ravel()):
+                index = first + offset
+                if index >= count:
+                    ax.axis('off')
+                    continue
+                ax.plot(values[index], 'k-', linewidth=1)
+                period = summary_table["period"][index]
+                if period:
+                    ax.axvline(summary_table["transient"][index], color='gray', linestyle='--', linewidth=0.5)
+                ax.set_title(f"{summary_table['rule'][index]} (p={period})", fontsize=7)
+                ax.set_ylim(0, top)
+                ax.tick_params(labelsize=6)
+            fig.suptitle(statistic, fontsize=9)
+            fig.tight_layout()
+            pdf.savefig(fig)
+            plt.close(fig)
+    return path
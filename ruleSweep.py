@@ -0,0 +1,138 @@
+import json
+import os
+import time
+from functools import partial
+import numpy as np
+from batchedAutomaton import batch_fitness, FITNESS_FUNCTIONS
+from evaluationBackend import SerialBackend
+from progressEvents import QuietSink
+from rule import Rule, RULE_SPACE_SIZE
+
+
+def rule_codes(exclude_b0=False, predicate=None):
+    """
+    VÝČET KÓDŮ VŠECH PRAVIDEL Bxxx/Sxxx (MOŽNO VYNECHAT B0 NEBO FILTROVAT FUNKCÍ predicate(Rule))
+    ------------------------------------------------------------------------------------------------
+    ENUMERATES THE CODES OF ALL Bxxx/Sxxx RULES (B0 CAN BE EXCLUDED OR A predicate(Rule) FILTER APPLIED)
+    """
+    codes = np.arange(RULE_SPACE_SIZE)
+    if exclude_b0:
+        codes = codes[(codes & 1) == 0]
+    if predicate is not None:
+        codes = np.array([code for code in codes if predicate(Rule.from_code(code))], dtype=int)
+    return codes
+
+
+def load_results(path):
+    """
+    NAČTENÍ VÝSLEDKŮ PRŮCHODU (POLE FITNESS INDEXOVANÉ KÓDEM PRAVIDLA, NaN = NEVYHODNOCENO)
+    ------------------------------------------------------------------------------------------
+    LOADS SWEEP RESULTS (FITNESS ARRAY INDEXED BY RULE CODE, NaN = NOT EVALUATED)
+    """
+    return np.load(path, mmap_mode="r")
+
+
+def top_k(results, k=10):
+    """
+    k NEJLEPŠÍCH PRAVIDEL Z VÝSLEDKŮ PRŮCHODU JAKO SEZNAM (Rule, FITNESS)
+    ----------------------------------------------------------------------
+    THE k BEST RULES FROM SWEEP RESULTS AS A LIST OF (Rule, FITNESS)
+    """
+    results = np.asarray(results)
+    evaluated = np.flatnonzero(~np.isnan(results))
+    k = min(k, len(evaluated))
+    if k == 0:
+        return []
+    best = evaluated[np.argpartition(-results[evaluated], k - 1)[:k]]
+    best = best[np.argsort(-results[best], kind="stable")]
+    return [(Rule.from_code(code), results[code].item()) for code in best]
+
+
+class RuleSweep:
+    def __init__(self, path, rows, cols, cagens, fitfun, shard_size=4096, backend=None, progress=None):
+        """
+        PRŮCHOD PROSTOREM PRAVIDEL S VÝSLEDKY V SOUBORU path
+        progress - PŘÍJEMCE UDÁLOSTÍ 'shard' PO KAŽDÉ ČÁSTI (progressEvents.py), None = QuietSink()
+        -------------------------------------------------------------------------------------------
+        SWEEP OVER THE RULE SPACE WITH THE RESULTS IN THE FILE path
+        progress - RECEIVER OF THE 'shard' EVENTS AFTER EVERY SHARD (progressEvents.py), None = QuietSink()
+        """
+        if fitfun not in FITNESS_FUNCTIONS:
+            raise ValueError("Invalid fitness function. Expected 'min', 'div', 'sym' or 'alt'.")
+        self.path = path
+        self.settings = {"rows": rows, "cols": cols, "cagens": cagens, "fitfun": fitfun}
+        self.shard_size = shard_size
+        self.backend = backend if backend is not None else SerialBackend()
+        self.progress = progress if progress is not None else QuietSink()
+        self.results = self.open_results()
+
+    def open_results(self):
+        """
+        OTEVŘENÍ SOUBORU S VÝSLEDKY (PŘI OPAKOVANÉM SPUŠTĚNÍ SE POKRAČUJE TAM, KDE PRŮCHOD SKONČIL)
+        NASTAVENÍ SE UKLÁDÁ DO path + '.json' A MUSÍ SOUHLASIT - OBA SOUBORY SE ZAPÍŠÍ DO DOČASNÝCH SOUBORŮ A PŘEJMENUJÍ,
+        NASTAVENÍ JAKO PRVNÍ, TAKŽE PŘERUŠENÍ PŘI ZAKLÁDÁNÍ NEZANECHÁ VÝSLEDKY BEZ NASTAVENÍ
+        NOVÝ SOUBOR SE ZALOŽÍ JEN TEHDY, KDYŽ path NEEXISTUJE - VÝSLEDKY BEZ SOUBORU NASTAVENÍ SE NEPŘEPISUJÍ (ValueError)
+        ----------------------------------------------------------------------------------------------
+        OPENS THE RESULT FILE (A REPEATED RUN CONTINUES WHERE THE SWEEP STOPPED)
+        THE SETTINGS ARE STORED IN path + '.json' AND MUST MATCH - BOTH FILES ARE WRITTEN TO TEMPORARY FILES AND RENAMED,
+        THE SETTINGS FIRST, SO AN INTERRUPTION DURING CREATION LEAVES NO RESULTS WITHOUT SETTINGS
+        A NEW FILE IS CREATED ONLY WHEN path DOES NOT EXIST - RESULTS WITHOUT A SETTINGS FILE ARE NOT OVERWRITTEN (ValueError)
+        """
+        settings_path = self.path + ".json"
+        if os.path.exists(self.path) and not os.path.exists(settings_path):
+            raise ValueError(f"Sweep file {self.path} exists without its settings file {settings_path}. "
+                             "Restore the settings file or move the results away to start a new sweep.")
+        if os.path.exists(self.path):
+            with open(settings_path) as settings_file:
+                stored = json.load(settings_file)
+            if stored != self.settings:
+                raise ValueError(f"Sweep file {self.path} was created with different settings: {stored}")
+            return np.load(self.path, mmap_mode="r+")
+        temporary_path = settings_path + ".tmp"
+        with open(temporary_path, "w") as settings_file:
+            json.dump(self.settings, settings_file)
+        os.replace(temporary_path, settings_path)
+        temporary_path = self.path + ".tmp.npy"
+        results = np.lib.format.open_memmap(temporary_path, mode="w+", dtype=np.float64, shape=(RULE_SPACE_SIZE,))
+        results[:] = np.nan
+        results.flush()
+        del results
+        os.replace(temporary_path, self.path)
+        return np.load(self.path, mmap_mode="r+")
+
+    def pending(self, codes=None):
+        """
+        KÓDY PRAVIDEL, KTERÁ JEŠTĚ NEBYLA VYHODNOCENA
+        ----------------------------------------------
+        CODES OF RULES THAT HAVE NOT BEEN EVALUATED YET
+        """
+        codes = rule_codes() if codes is None else np.asarray(codes, dtype=int)
+        return codes[np.isnan(self.results[codes])]
+
+    def run(self, codes=None):
+        """
+        VYHODNOCENÍ PRAVIDEL PO ČÁSTECH (shard_size), PO KAŽDÉ ČÁSTI SE VÝSLEDKY ZAPÍŠOU NA DISK
+        codes - KÓDY PRAVIDEL K VYHODNOCENÍ (None = CELÝ PROSTOR 2^18 PRAVIDEL)
+        ------------------------------------------------------------------------------------------
+        EVALUATES RULES SHARD BY SHARD (shard_size), THE RESULTS ARE WRITTEN TO DISK AFTER EVERY SHARD
+        codes - CODES OF RULES TO EVALUATE (None = THE WHOLE SPACE OF 2^18 RULES)
+        """
+        pending = self.pending(codes)
+        evaluate = partial(batch_fitness, rows=self.settings["rows"], cols=self.settings["cols"],
+                           generations=self.settings["cagens"], fitfun=self.settings["fitfun"])
+        start_time = time.time()
+        for start in range(0, len(pending), self.shard_size):
+            shard = pending[start:start + self.shard_size]
+            self.results[shard] = self.backend.map_chunks(evaluate, [int(code) for code in shard])
+            self.results.flush()
+            self.progress.emit({"event": "shard", "evaluated": start + len(shard), "pending": len(pending),
+                                "elapsed": time.time() - start_time})
+        return self.results
+
+    def top_k(self, k=10):
+        """
+        k NEJLEPŠÍCH DOSUD VYHODNOCENÝCH PRAVIDEL
+        -------------------------------------------
+        THE k BEST RULES EVALUATED SO FAR
+        """
+        return top_k(self.results, k)
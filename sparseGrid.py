@@ -0,0 +1,256 @@
+import numpy as np
+from fitnessMetrics import MetricStream
+
+EMPTY_WINDOW = np.zeros((0, 0), dtype=int)
+
+
+class SparseState:
+    __slots__ = ("row", "col", "window")
+
+    def __init__(self, row, col, window):
+        """
+        STAV ŘÍDKÉ MŘÍŽKY - OKNO window S LEVÝM HORNÍM ROHEM (row, col) NA TORU, MIMO OKNO JSOU VŠECHNY BUŇKY MRTVÉ
+        OKNO JE VŽDY OŘEZANÉ NA ŽIVÉ BUŇKY (PRÁZDNÁ MŘÍŽKA MÁ OKNO TVARU (0, 0))
+        -----------------------------------------------------------------------------------------------------------
+        STATE OF A SPARSE GRID - WINDOW window WITH ITS TOP LEFT CORNER AT (row, col) ON THE TORUS, ALL CELLS OUTSIDE ARE DEAD
+        THE WINDOW IS ALWAYS TRIMMED TO THE LIVE CELLS (AN EMPTY GRID HAS A WINDOW OF SHAPE (0, 0))
+        """
+        self.row = row
+        self.col = col
+        self.window = window
+
+
+def circular_span(mask):
+    """
+    NEJKRATŠÍ CYKLICKÝ ÚSEK (ZAČÁTEK, DÉLKA), KTERÝ POKRYJE VŠECHNY HODNOTY True
+    -----------------------------------------------------------------------------
+    THE SHORTEST CIRCULAR INTERVAL (START, LENGTH) THAT COVERS ALL True VALUES
+    """
+    indices = np.flatnonzero(mask)
+    if len(indices) == 0:
+        return 0, 0
+    gaps = np.diff(np.append(indices, indices[0] + len(mask)))
+    widest = int(np.argmax(gaps))
+    return int(indices[(widest + 1) % len(indices)]), len(mask) - int(gaps[widest]) + 1
+
+
+def trim_window(window, row, col, rows, cols):
+    """
+    OŘEZÁNÍ OKNA NA ŽIVÉ BUŇKY (OKNO NESMÍ PŘESAHOVAT SAMO PŘES SEBE NA TORU)
+    ---------------------------------------------------------------------------
+    TRIMS A WINDOW TO ITS LIVE CELLS (THE WINDOW MUST NOT OVERLAP ITSELF ON THE TORUS)
+    """
+    live_rows = np.flatnonzero(window.any(axis=1))
+    if len(live_rows) == 0:
+        return SparseState(0, 0, EMPTY_WINDOW)
+    live_cols = np.flatnonzero(window.any(axis=0))
+    window = window[live_rows[0]:live_rows[-1] + 1, live_cols[0]:live_cols[-1] + 1]
+    return SparseState((row + live_rows[0]) % rows, (col + live_cols[0]) % cols, window)
+
+
+def window_indices(state, rows, cols):
+    """
+    ŘÁDKY A SLOUPCE CELÉ MŘÍŽKY, KTERÉ POKRÝVÁ OKNO STAVU
+    ------------------------------------------------------
+    ROWS AND COLUMNS OF THE FULL GRID COVERED BY THE WINDOW OF THE STATE
+    """
+    height, width = state.window.shape
+    return (state.row + np.arange(height)) % rows, (state.col + np.arange(width)) % cols
+
+
+def live_cells(state, rows, cols):
+    """
+    SEŘAZENÉ INDEXY ŽIVÝCH BUNĚK V CELÉ MŘÍŽCE (r * cols + c)
+    -----------------------------------------------------------
+    SORTED INDICES OF THE LIVE CELLS IN THE FULL GRID (r * cols + c)
+    """
+    window_rows, window_cols = np.nonzero(state.window)
+    return np.sort((state.row + window_rows) % rows * cols + (state.col + window_cols) % cols)
+
+
+def local_step(padded, table):
+    """
+    KROK SIMULACE PRO VNITŘEK POLE padded (OKRAJ ŠÍŘKY 1 SLOUŽÍ JEN JAKO SOUSEDÉ)
+    ------------------------------------------------------------------------------
+    SIMULATION STEP FOR THE INTERIOR OF padded (THE BORDER OF WIDTH 1 ONLY SERVES AS NEIGHBOURS)
+    """
+    row_sums = padded[:, :-2] + padded[:, 1:-1] + padded[:, 2:]
+    interior = padded[1:-1, 1:-1]
+    index = row_sums[:-2] + row_sums[1:-1] + row_sums[2:] - interior
+    index += 9 * interior
+    return table.astype(padded.dtype, copy=False).ravel().take(index)
+
+
+def step_sparse(state, rows, cols, table):
+    """
+    JEDEN KROK SIMULACE JEN V OKOLÍ ŽIVÝCH BUNĚK - NOVĚ ŽIVÉ BUŇKY MOHOU VZNIKNOUT JEN DO VZDÁLENOSTI 1 OD OKNA
+    PRAVIDLA S B0 (OŽIVUJÍ PRÁZDNÝ PROSTOR) A OKNA, KTERÁ BY PŘESÁHLA TORUS, SE POČÍTAJÍ PRO CELOU MŘÍŽKU
+    -------------------------------------------------------------------------------------------------------------
+    ONE SIMULATION STEP ONLY AROUND THE LIVE CELLS - NEW LIVE CELLS CAN ONLY APPEAR WITHIN DISTANCE 1 OF THE WINDOW
+    RULES WITH B0 (WHICH LIGHT UP EMPTY SPACE) AND WINDOWS THAT WOULD WRAP AROUND THE TORUS ARE STEPPED ON THE FULL GRID
+    """
+    height, width = state.window.shape
+    if table[0, 0] or height + 4 > rows or width + 4 > cols:
+        grid = unpack_sparse(state, rows, cols)
+        return pack_sparse(local_step(np.pad(grid, 1, mode="wrap"), table))
+    if height == 0:
+        return state
+    window = local_step(np.pad(state.window, 2), table)
+    return trim_window(window, state.row - 1, state.col - 1, rows, cols)
+
+
+def pack_sparse(grid):
+    """
+    PŘEVOD CELÉ MŘÍŽKY NA ŘÍDKÝ STAV (OKNO SE VOLÍ JAKO NEJMENŠÍ CYKLICKÝ OBDÉLNÍK SE ŽIVÝMI BUŇKAMI)
+    ---------------------------------------------------------------------------------------------------
+    CONVERTS A FULL GRID TO A SPARSE STATE (THE WINDOW IS THE SMALLEST CIRCULAR RECTANGLE WITH THE LIVE CELLS)
+    """
+    grid = np.asarray(grid)
+    row, height = circular_span(grid.any(axis=1))
+    col, width = circular_span(grid.any(axis=0))
+    if height == 0:
+        return SparseState(0, 0, EMPTY_WINDOW)
+    rows, cols = grid.shape
+    row_indices = (row + np.arange(height)) % rows
+    col_indices = (col + np.arange(width)) % cols
+    return SparseState(row, col, (grid[np.ix_(row_indices, col_indices)] != 0).astype(int))
+
+
+def unpack_sparse(state, rows, cols):
+    """
+    PŘEVOD ŘÍDKÉHO STAVU NA CELOU MŘÍŽKU (VŽDY NOVÁ KOPIE)
+    -------------------------------------------------------
+    CONVERTS A SPARSE STATE TO THE FULL GRID (ALWAYS A NEW COPY)
+    """
+    grid = np.zeros((rows, cols), dtype=int)
+    if state.window.size:
+        grid[np.ix_(*window_indices(state, rows, cols))] = state.window
+    return grid
+
+
+class SparseMetricStream(MetricStream):
+    def __init__(self, rows, cols, metrics):
+        """
+        METRIKY JEN Z ŽIVÝCH BUNĚK OKNA (ČAS ÚMĚRNÝ AKTIVITĚ) - changed A mirror JSOU ROZDÍLY MNOŽIN INDEXŮ
+        ŽIVÝCH BUNĚK, checkerboard SE POČÍTÁ Z PARITY JEJICH SOUŘADNIC
+        ---------------------------------------------------------------------------------------------------
+        METRICS FROM THE LIVE CELLS OF THE WINDOW ONLY (TIME PROPORTIONAL TO THE ACTIVITY) - changed AND mirror
+        ARE DIFFERENCES OF THE SETS OF LIVE CELL INDICES, checkerboard IS COMPUTED FROM THE PARITY OF THEIR COORDINATES
+        """
+        super().__init__(rows, cols, metrics)
+        self._recent = []
+
+    def cells(self, state):
+        """
+        INDEXY ŽIVÝCH BUNĚK STAVU (POSLEDNÍ DVA STAVY SI PAMATUJE, SOUSEDNÍ GENERACE SE TAK NEPOČÍTAJÍ ZNOVU)
+        --------------------------------------------------------------------------------------------------------
+        INDICES OF THE LIVE CELLS OF A STATE (IT REMEMBERS THE LAST TWO STATES, SO ADJACENT GENERATIONS ARE NOT RECOMPUTED)
+        """
+        for known, cells in self._recent:
+            if known is state:
+                return cells
+        cells = live_cells(state, self.rows, self.cols)
+        self._recent = [(state, cells)] + self._recent[:1]
+        return cells
+
+    def count_shared(self, cells, other):
+        """
+        POČET INDEXŮ SPOLEČNÝCH DVĚMA MNOŽINÁM ŽIVÝCH BUNĚK
+        -----------------------------------------------------
+        NUMBER OF INDICES SHARED BY TWO SETS OF LIVE CELLS
+        """
+        return len(np.intersect1d(cells, other, assume_unique=True))
+
+    def live_cells(self, states):
+        return np.count_nonzero(states.window)
+
+    def changed_cells(self, states, prev_states):
+        cells = self.cells(states)
+        prev_cells = self.cells(prev_states)
+        return len(cells) + len(prev_cells) - 2 * self.count_shared(cells, prev_cells)
+
+    def mirror_differences(self, states):
+        cells = self.cells(states)
+        rows, cols = np.divmod(cells, self.cols)
+        horizontal = self.count_shared(cells, rows * self.cols + (self.cols - 1 - cols))
+        vertical = self.count_shared(cells, (self.rows - 1 - rows) * self.cols + cols)
+        return 2 * (2 * len(cells) - horizontal - vertical)
+
+    def checkerboard_matches(self, states):
+        cells = self.cells(states)
+        odd = np.count_nonzero(np.sum(np.divmod(cells, self.cols), axis=0) % 2)
+        return 2 * odd + (self.area + 1) // 2 - len(cells)
+
+
+class SparseEngine:
+    name = "sparse"
+
+    def __init__(self, rows, cols):
+        self.rows = rows
+        self.cols = cols
+
+    def accepts(self, grid):
+        """
+        ENGINE 'sparse' PŘIJME KAŽDOU MŘÍŽKU
+        -------------------------------------
+        THE 'sparse' ENGINE ACCEPTS EVERY GRID
+        """
+        return True
+
+    def pack(self, grid):
+        """
+        PŘEVOD MŘÍŽKY NA VNITŘNÍ STAV (OKNO KOLEM ŽIVÝCH BUNĚK)
+        --------------------------------------------------------
+        CONVERTS A GRID TO THE INTERNAL STATE (A WINDOW AROUND THE LIVE CELLS)
+        """
+        return pack_sparse(grid)
+
+    def unpack(self, state):
+        """
+        PŘEVOD VNITŘNÍHO STAVU NA MŘÍŽKU (VŽDY NOVÁ KOPIE)
+        ---------------------------------------------------
+        CONVERTS THE INTERNAL STATE TO A GRID (ALWAYS A NEW COPY)
+        """
+        return unpack_sparse(state, self.rows, self.cols)
+
+    def step(self, state, rule):
+        """
+        NÁSLEDUJÍCÍ STAV PODLE PRAVIDLA
+        --------------------------------
+        NEXT STATE ACCORDING TO THE RULE
+        """
+        return step_sparse(state, self.rows, self.cols, rule.table)
+
+    def live_count(self, state):
+        """
+        POČET ŽIVÝCH BUNĚK VE STAVU
+        ----------------------------
+        NUMBER OF LIVE CELLS IN THE STATE
+        """
+        return int(state.window.sum())
+
+    def metrics(self, metrics):
+        """
+        VÝPOČET METRIK FITNESS FUNKCÍ PŘÍMO Z OKNA STAVU (BEZ ROZBALENÍ NA CELOU MŘÍŽKU)
+        ------------------------------------------------------------------------------------
+        FITNESS METRICS DIRECTLY FROM THE WINDOW OF THE STATE (WITHOUT UNPACKING TO THE FULL GRID)
+        """
+        return SparseMetricStream(self.rows, self.cols, metrics)
+
+    def key(self, state):
+        """
+        KOMPAKTNÍ KLÍČ STAVU - SEŘAZENÉ INDEXY ŽIVÝCH BUNĚK (NEZÁVISÍ NA UMÍSTĚNÍ OKNA)
+        ---------------------------------------------------------------------------------
+        COMPACT STATE KEY - SORTED INDICES OF THE LIVE CELLS (INDEPENDENT OF THE WINDOW PLACEMENT)
+        """
+        return live_cells(state, self.rows, self.cols).astype(np.int64).tobytes()
+
+    def from_key(self, key):
+        """
+        OBNOVENÍ STAVU Z KLÍČE
+        -----------------------
+        RESTORES A STATE FROM A KEY
+        """
+        grid = np.zeros(self.rows * self.cols, dtype=int)
+        grid[np.frombuffer(key, dtype=np.int64)] = 1
+        return pack_sparse(grid.reshape(self.rows, self.cols))
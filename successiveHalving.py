@@ -0,0 +1,79 @@
+import math
+import numpy as np
+
+
+class SuccessiveHalving:
+    def __init__(self, rungs, keep=0.5):
+        """
+        rungs - LEVNĚJŠÍ STUPNĚ VYHODNOCENÍ OD NEJLEVNĚJŠÍHO, KAŽDÝ JE cagens NEBO (cagens, rows, cols);
+                POSLEDNÍM STUPNĚM JE VŽDY PLNÉ VYHODNOCENÍ PODLE NASTAVENÍ GENETICKÉHO ALGORITMU
+        keep - PODÍL NEJLEPŠÍCH JEDINCŮ, KTEŘÍ POSTUPUJÍ DO DALŠÍHO STUPNĚ
+        ----------------------------------------------------------------------------------------------
+        rungs - CHEAPER EVALUATION STAGES FROM THE CHEAPEST, EACH IS cagens OR (cagens, rows, cols);
+                THE LAST STAGE IS ALWAYS THE FULL EVALUATION WITH THE GENETIC ALGORITHM SETTINGS
+        keep - FRACTION OF THE BEST INDIVIDUALS PROMOTED TO THE NEXT STAGE
+        """
+        if not 0 < keep <= 1:
+            raise ValueError("keep must be in the interval (0, 1].")
+        self.rungs = [rung if isinstance(rung, tuple) else (rung, None, None) for rung in rungs]
+        self.keep = keep
+        self.simulated_cell_updates = 0
+        self.full_cell_updates = 0
+
+    def stages(self, ga):
+        """
+        VŠECHNY STUPNĚ VČETNĚ PLNÉHO VYHODNOCENÍ JAKO SEZNAM (cagens, rows, cols)
+        ---------------------------------------------------------------------------
+        ALL STAGES INCLUDING THE FULL EVALUATION AS A LIST OF (cagens, rows, cols)
+        """
+        stages = []
+        for cagens, rows, cols in self.rungs:
+            stages.append((cagens, ga.ca.rows if rows is None else rows, ga.ca.cols if cols is None else cols))
+        stages.append((ga.gens, ga.ca.rows, ga.ca.cols))
+        return stages
+
+    def evaluate(self, ga, rules):
+        """
+        VYHODNOCENÍ POPULACE PO STUPNÍCH - VŠICHNI JEDINCI LEVNĚ, DO DALŠÍHO STUPNĚ POSTUPUJE JEN PODÍL keep.
+        JEDINCI VYŘAZENÍ DŘÍVE DOSTANOU FITNESS NEJVÝŠE ROVNOU NEJHORŠÍMU JEDINCI Z VYŠŠÍHO STUPNĚ,
+        TAKŽE POŘADÍ NEJLEPŠÍCH URČUJE VŽDY PLNÉ VYHODNOCENÍ
+        -------------------------------------------------------------------------------------------------------
+        EVALUATES THE POPULATION STAGE BY STAGE - EVERY INDIVIDUAL CHEAPLY, ONLY THE keep FRACTION IS PROMOTED.
+        INDIVIDUALS ELIMINATED EARLIER GET A FITNESS NO HIGHER THAN THE WORST INDIVIDUAL OF A HIGHER STAGE,
+        SO THE RANKING OF THE BEST IS ALWAYS DECIDED BY THE FULL EVALUATION
+        """
+        stages = self.stages(ga)
+        candidates = np.arange(len(rules))
+        eliminated = []
+        for level, (cagens, rows, cols) in enumerate(stages):
+            scores = np.asarray(ga.evaluate_rules([rules[i] for i in candidates], rows, cols, cagens), dtype=float)
+            self.simulated_cell_updates += len(candidates) * rows * cols * cagens
+            if level == len(stages) - 1 or len(candidates) <= 1:
+                break
+            order = np.argsort(-scores, kind="stable")
+            promoted = order[:max(1, math.ceil(len(candidates) * self.keep))]
+            dropped = order[len(promoted):]
+            eliminated.append((candidates[dropped], scores[dropped]))
+            candidates = candidates[promoted]
+        self.full_cell_updates += len(rules) * ga.ca.rows * ga.ca.cols * ga.gens
+
+        fitness = np.zeros(len(rules))
+        fitness[candidates] = scores
+        floor = scores.min() if len(scores) else 0.0
+        for indices, scores in reversed(eliminated):
+            fitness[indices] = np.minimum(scores, floor)
+            floor = min(floor, fitness[indices].min())
+        return fitness.tolist()
+
+    def stats(self):
+        """
+        ÚSPORA SIMULACE - POČET AKTUALIZACÍ BUNĚK OPROTI PLNÉMU VYHODNOCENÍ VŠECH JEDINCŮ
+        ----------------------------------------------------------------------------------
+        SIMULATION SAVINGS - NUMBER OF CELL UPDATES COMPARED TO A FULL EVALUATION OF ALL INDIVIDUALS
+        """
+        saved = 1 - self.simulated_cell_updates / self.full_cell_updates if self.full_cell_updates else 0.0
+        return {
+            "simulated_cell_updates": self.simulated_cell_updates,
+            "full_cell_updates": self.full_cell_updates,
+            "saved_fraction": saved,
+        }
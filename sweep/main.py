@@ -0,0 +1,45 @@
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from evaluationBackend import ProcessBackend
+from progressEvents import ConsoleSink
+from ruleSweep import RuleSweep, rule_codes
+
+""" 
+NASTAVENÍ PRŮCHODU CELÝM PROSTOREM PRAVIDEL
+rows, cols, cagens, fitfun - STEJNÉ VÝZNAMY JAKO V main.py
+shard_size - POČET PRAVIDEL VYHODNOCENÝCH MEZI DVĚMA ZÁPISY NA DISK
+exclude_b0 - VYNECHÁNÍ PRAVIDEL S B0
+top - POČET NEJLEPŠÍCH PRAVIDEL K VÝPISU
+PŘERUŠENÝ PRŮCHOD POKRAČUJE PO OPĚTOVNÉM SPUŠTĚNÍ TAM, KDE SKONČIL
+-----------------------------------------------------------------------
+SETTINGS OF THE SWEEP OVER THE WHOLE RULE SPACE
+rows, cols, cagens, fitfun - SAME MEANING AS IN main.py
+shard_size - NUMBER OF RULES EVALUATED BETWEEN TWO WRITES TO DISK
+exclude_b0 - SKIPS RULES WITH B0
+top - NUMBER OF BEST RULES TO PRINT
+AN INTERRUPTED SWEEP CONTINUES WHERE IT STOPPED WHEN RUN AGAIN
+"""
+rows = 9
+cols = 9
+cagens = 100
+fitfun = "alt"
+shard_size = 8192
+exclude_b0 = False
+top = 20
+
+if __name__ == "__main__":
+    current_directory = os.path.dirname(__file__)
+    file_path = os.path.join(current_directory, f'sweep_{fitfun}_{rows}x{cols}_{cagens}.npy')
+
+    start_time = time.time()
+    with ProcessBackend() as backend:
+        sweep = RuleSweep(file_path, rows, cols, cagens, fitfun, shard_size=shard_size, backend=backend,
+                          progress=ConsoleSink())
+        sweep.run(rule_codes(exclude_b0=exclude_b0))
+    print("Sweep finished in", int(time.time() - start_time), "seconds")
+
+    for rule, fitness in sweep.top_k(top):
+        print(fitness, "  (", rule, ")")
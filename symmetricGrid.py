@@ -0,0 +1,168 @@
+from functools import lru_cache
+import numpy as np
+from fitnessMetrics import MetricStream
+
+
+def supports_symmetry(rows, cols):
+    """
+    SYMETRICKÝ REŽIM JE MOŽNÝ JEN NA ČTVERCOVÉ MŘÍŽCE S LICHÝM POČTEM ŘÁDKŮ (STŘED JE JEDNA BUŇKA)
+    -----------------------------------------------------------------------------------------------
+    THE SYMMETRIC MODE IS ONLY POSSIBLE ON A SQUARE GRID WITH AN ODD NUMBER OF ROWS (THE CENTRE IS ONE CELL)
+    """
+    return rows == cols and rows % 2 == 1
+
+
+class SymmetricDomain:
+    def __init__(self, size):
+        """
+        ZÁKLADNÍ OBLAST SYMETRIE D4 (OSMINA MŘÍŽKY) PRO LICHOU ČTVERCOVOU MŘÍŽKU size x size NA TORU
+        BUŇKA OBLASTI (a, b), 0 <= a <= b <= size // 2, ZASTUPUJE VŠECHNY BUŇKY VE VZDÁLENOSTECH a A b OD STŘEDU
+        -----------------------------------------------------------------------------------------------------
+        FUNDAMENTAL DOMAIN OF THE D4 SYMMETRY (ONE EIGHTH OF THE GRID) FOR AN ODD size x size GRID ON A TORUS
+        DOMAIN CELL (a, b), 0 <= a <= b <= size // 2, STANDS FOR ALL CELLS AT DISTANCES a AND b FROM THE CENTRE
+        """
+        center = size // 2
+        self.size = size
+        self.cells = [(a, b) for a in range(center + 1) for b in range(a, center + 1)]
+        position = {cell: i for i, cell in enumerate(self.cells)}
+
+        offsets = np.abs(np.arange(size) - center)
+        low = np.minimum.outer(offsets, offsets)
+        high = np.maximum.outer(offsets, offsets)
+        self.orbit_index = np.vectorize(lambda a, b: position[(a, b)])(low, high)
+        self.weights = np.bincount(self.orbit_index.ravel(), minlength=len(self.cells))
+        self.rep_rows = np.array([center + a for a, _ in self.cells])
+        self.rep_cols = np.array([center + b for _, b in self.cells])
+
+        neighbors = []
+        for row, col in zip(self.rep_rows, self.rep_cols):
+            neighbors.append([self.orbit_index[(row + i) % size, (col + j) % size]
+                              for i in (-1, 0, 1) for j in (-1, 0, 1) if i or j])
+        self.neighbors = np.array(neighbors)
+
+    def __len__(self):
+        return len(self.cells)
+
+
+@lru_cache(maxsize=64)
+def symmetric_domain(size):
+    """
+    ZÁKLADNÍ OBLAST PRO DANOU VELIKOST MŘÍŽKY (VYTVOŘÍ SE JEN JEDNOU)
+    ------------------------------------------------------------------
+    FUNDAMENTAL DOMAIN FOR THE GIVEN GRID SIZE (CREATED ONLY ONCE)
+    """
+    return SymmetricDomain(size)
+
+
+def fold_grid(grid, domain):
+    """
+    HODNOTY BUNĚK ZÁKLADNÍ OBLASTI PRO MŘÍŽKU (NEBO ZÁSOBNÍK MŘÍŽEK)
+    ------------------------------------------------------------------
+    DOMAIN CELL VALUES FOR A GRID (OR A STACK OF GRIDS)
+    """
+    return np.asarray(grid)[..., domain.rep_rows, domain.rep_cols]
+
+
+def unfold_state(state, domain):
+    """
+    REKONSTRUKCE CELÉ MŘÍŽKY (NEBO ZÁSOBNÍKU) ZE ZÁKLADNÍ OBLASTI
+    --------------------------------------------------------------
+    RECONSTRUCTS THE FULL GRID (OR STACK) FROM THE FUNDAMENTAL DOMAIN
+    """
+    return state[..., domain.orbit_index]
+
+
+def is_symmetric(grid, domain):
+    """
+    KONTROLA, ZDA JE MŘÍŽKA SYMETRICKÁ VŮČI VŠEM OSMI SYMETRIÍM ČTVERCE KOLEM STŘEDU
+    ----------------------------------------------------------------------------------
+    CHECKS WHETHER THE GRID IS SYMMETRIC UNDER ALL EIGHT SYMMETRIES OF THE SQUARE AROUND THE CENTRE
+    """
+    grid = np.asarray(grid)
+    return grid.shape[-2:] == domain.orbit_index.shape and np.array_equal(unfold_state(fold_grid(grid, domain), domain), grid)
+
+
+def step_symmetric(state, neighbors, table):
+    """
+    JEDEN KROK SIMULACE NAD ZÁKLADNÍ OBLASTÍ (NEBO ZÁSOBNÍKEM S TABULKAMI TVARU (POČET, 2, 9))
+    ---------------------------------------------------------------------------------------------
+    ONE SIMULATION STEP OVER THE FUNDAMENTAL DOMAIN (OR A STACK WITH TABLES OF SHAPE (COUNT, 2, 9))
+    """
+    index = state[..., neighbors].sum(axis=-1)
+    index += 9 * state
+    if table.ndim == 3:
+        index += 18 * np.arange(len(state)).reshape(-1, 1)
+    return table.astype(state.dtype, copy=False).ravel().take(index)
+
+
+class SymmetricEngine:
+    name = "symmetric"
+
+    def __init__(self, rows, cols):
+        self.rows = rows
+        self.cols = cols
+        self.domain = symmetric_domain(rows) if supports_symmetry(rows, cols) else None
+
+    def accepts(self, grid):
+        """
+        MŘÍŽKU LZE ULOŽIT JEN TEHDY, KDYŽ JE SYMETRICKÁ (JINAK AUTOMAT PŘEJDE NA ENGINE 'dense')
+        ------------------------------------------------------------------------------------------
+        THE GRID CAN ONLY BE STORED WHEN IT IS SYMMETRIC (OTHERWISE THE AUTOMATON FALLS BACK TO 'dense')
+        """
+        return self.domain is not None and is_symmetric(grid, self.domain)
+
+    def pack(self, grid):
+        """
+        PŘEVOD MŘÍŽKY NA VNITŘNÍ STAV (JEN BUŇKY ZÁKLADNÍ OBLASTI)
+        ------------------------------------------------------------
+        CONVERTS A GRID TO THE INTERNAL STATE (ONLY THE DOMAIN CELLS)
+        """
+        return fold_grid(grid, self.domain).astype(int)
+
+    def unpack(self, state):
+        """
+        PŘEVOD VNITŘNÍHO STAVU NA CELOU MŘÍŽKU (VŽDY NOVÁ KOPIE)
+        ---------------------------------------------------------
+        CONVERTS THE INTERNAL STATE TO THE FULL GRID (ALWAYS A NEW COPY)
+        """
+        return unfold_state(state, self.domain)
+
+    def step(self, state, rule):
+        """
+        NÁSLEDUJÍCÍ STAV PODLE PRAVIDLA
+        --------------------------------
+        NEXT STATE ACCORDING TO THE RULE
+        """
+        return step_symmetric(state, self.domain.neighbors, rule.table)
+
+    def live_count(self, state):
+        """
+        POČET ŽIVÝCH BUNĚK (KAŽDÁ BUŇKA OBLASTI SE POČÍTÁ S VELIKOSTÍ SVÉ OBĚŽNÉ DRÁHY 1, 4 NEBO 8)
+        ---------------------------------------------------------------------------------------------
+        NUMBER OF LIVE CELLS (EVERY DOMAIN CELL COUNTS WITH THE SIZE OF ITS ORBIT 1, 4 OR 8)
+        """
+        return int(self.domain.weights @ state)
+
+    def metrics(self, metrics):
+        """
+        VÝPOČET METRIK FITNESS FUNKCÍ PŘÍMO NAD BUŇKAMI OBLASTI (ZRCADLENÍ JE VŽDY SHODNÉ)
+        ------------------------------------------------------------------------------------
+        FITNESS METRICS DIRECTLY OVER THE DOMAIN CELLS (THE MIRROR IMAGES ALWAYS AGREE)
+        """
+        return MetricStream(self.rows, self.cols, metrics, domain=self.domain)
+
+    def key(self, state):
+        """
+        KOMPAKTNÍ KLÍČ STAVU (1 BIT NA BUŇKU OBLASTI)
+        ----------------------------------------------
+        COMPACT STATE KEY (1 BIT PER DOMAIN CELL)
+        """
+        return np.packbits(state).tobytes()
+
+    def from_key(self, key):
+        """
+        OBNOVENÍ STAVU Z KLÍČE
+        -----------------------
+        RESTORES A STATE FROM A KEY
+        """
+        return np.unpackbits(np.frombuffer(key, dtype=np.uint8), count=len(self.domain)).astype(int)
@@ -0,0 +1,209 @@
+import os
+import struct
+import numpy as np
+from fitnessMetrics import MetricStream
+
+"""
+FORMÁT SOUBORU TRAJEKTORIE (.traj)
+HLAVIČKA (HEADER_SIZE BAJTŮ) - MAGIC, VERZE, rows, cols, BAJTY SNÍMKU, POČET SNÍMKŮ, POZICE STATISTIK (0 = BEZ NICH),
+                                SEMÍNKO (-1 = NEZNÁMÉ), PRAVIDLO 'Bxxx/Sxxx'
+SNÍMKY - JEDEN SNÍMEK NA GENERACI (0, 1, 2, ...), MŘÍŽKA ZABALENÁ np.packbits (1 BIT NA BUŇKU), VŠECHNY STEJNĚ DLOUHÉ,
+         ZAPISUJÍ SE PO BLOCÍCH chunk_frames SNÍMKŮ
+STATISTIKY - ZA SNÍMKY, PRO KAŽDOU GENERACI METRIKY STATS JAKO int64
+-----------------------------------------------------------------------------------------------------------------------
+TRAJECTORY FILE FORMAT (.traj)
+HEADER (HEADER_SIZE BYTES) - MAGIC, VERSION, rows, cols, FRAME BYTES, FRAME COUNT, STATS OFFSET (0 = NONE),
+                             SEED (-1 = UNKNOWN), RULE 'Bxxx/Sxxx'
+FRAMES - ONE FRAME PER GENERATION (0, 1, 2, ...), THE GRID PACKED BY np.packbits (1 BIT PER CELL), ALL OF EQUAL LENGTH,
+         WRITTEN IN BLOCKS OF chunk_frames FRAMES
+STATS - AFTER THE FRAMES, THE METRICS STATS FOR EVERY GENERATION AS int64
+"""
+MAGIC = b"CATRAJ\x00\x01"
+VERSION = 1
+HEADER_FORMAT = "<8sIIIIQQq64s"
+HEADER_SIZE = 128
+STATS = ("live", "changed")
+
+
+class TrajectoryWriter:
+    def __init__(self, path, rows, cols, rule=None, seed=None, stats=True, chunk_frames=64):
+        """
+        ZÁPIS TRAJEKTORIE - append(grid) PŘIDÁ SNÍMEK DALŠÍ GENERACE, close() DOPÍŠE STATISTIKY A HLAVIČKU
+        PRAVIDLO LZE NASTAVIT I POZDĚJI (writer.rule), ZAPÍŠE SE PŘI ZAVŘENÍ
+        ------------------------------------------------------------------------------------------------------
+        WRITES A TRAJECTORY - append(grid) ADDS THE FRAME OF THE NEXT GENERATION, close() WRITES THE STATS AND THE HEADER
+        THE RULE MAY ALSO BE SET LATER (writer.rule), IT IS WRITTEN ON CLOSING
+        """
+        self.path = path
+        self.rows = rows
+        self.cols = cols
+        self.rule = rule
+        self.seed = seed
+        self.frames = 0
+        self.frame_bytes = (rows * cols + 7) // 8
+        self._chunk = np.empty((chunk_frames, self.frame_bytes), dtype=np.uint8)
+        self._pending = 0
+        self._metrics = MetricStream(rows, cols, STATS) if stats else None
+        self._stats = []
+        self._previous = None
+        self._file = open(path, "wb")
+        self.write_header()
+
+    def write_header(self, stats_offset=0):
+        """
+        ZÁPIS HLAVIČKY NA ZAČÁTEK SOUBORU (POČET SNÍMKŮ ODPOVÍDÁ JIŽ ZAPSANÝM BLOKŮM)
+        ------------------------------------------------------------------------------
+        WRITES THE HEADER AT THE START OF THE FILE (THE FRAME COUNT MATCHES THE BLOCKS ALREADY WRITTEN)
+        """
+        rule = b"" if self.rule is None else str(self.rule).encode("ascii")
+        seed = -1 if self.seed is None else self.seed
+        header = struct.pack(HEADER_FORMAT, MAGIC, VERSION, self.rows, self.cols, self.frame_bytes,
+                             self.frames - self._pending, stats_offset, seed, rule)
+        position = self._file.tell()
+        self._file.seek(0)
+        self._file.write(header.ljust(HEADER_SIZE, b"\x00"))
+        self._file.seek(max(position, HEADER_SIZE))
+
+    def append(self, grid):
+        """
+        PŘIDÁNÍ MŘÍŽKY DALŠÍ GENERACE (PLNÝ BLOK SE ZAPÍŠE NAJEDNOU A HLAVIČKA SE AKTUALIZUJE)
+        ----------------------------------------------------------------------------------------
+        ADDS THE GRID OF THE NEXT GENERATION (A FULL BLOCK IS WRITTEN AT ONCE AND THE HEADER IS UPDATED)
+        """
+        if self._metrics is not None:
+            previous = grid if self._previous is None else self._previous
+            measured = self._metrics.measure(grid, previous)
+            self._stats.append([measured[name] for name in STATS])
+            self._previous = np.array(grid, copy=True)
+        self._chunk[self._pending] = np.packbits(grid, axis=None)
+        self._pending += 1
+        self.frames += 1
+        if self._pending == len(self._chunk):
+            self.flush()
+
+    def flush(self):
+        """
+        ZÁPIS ROZPRACOVANÉHO BLOKU SNÍMKŮ
+        ----------------------------------
+        WRITES THE PENDING BLOCK OF FRAMES
+        """
+        if self._pending:
+            self._file.write(self._chunk[:self._pending].tobytes())
+            self._pending = 0
+            self.write_header()
+
+    def close(self):
+        """
+        DOPSÁNÍ SNÍMKŮ, STATISTIK A KONEČNÉ HLAVIČKY (LZE VOLAT OPAKOVANĚ)
+        --------------------------------------------------------------------
+        WRITES THE REMAINING FRAMES, THE STATS AND THE FINAL HEADER (MAY BE CALLED REPEATEDLY)
+        """
+        if self._file is None:
+            return
+        self.flush()
+        stats_offset = 0
+        if self._metrics is not None:
+            stats_offset = self._file.tell()
+            self._file.write(np.array(self._stats, dtype="<i8").reshape(-1, len(STATS)).tobytes())
+        self.write_header(stats_offset)
+        self._file.close()
+        self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class TrajectoryReader:
+    def __init__(self, path):
+        """
+        ČTENÍ TRAJEKTORIE PŘES np.memmap - SNÍMKY SE NAČÍTAJÍ Z DISKU AŽ PŘI PŘÍSTUPU, LIBOVOLNĚ PODLE GENERACE
+        reader[g] = MŘÍŽKA GENERACE g, reader[a:b] = ZÁSOBNÍK MŘÍŽEK, reader.packed = ZABALENÉ SNÍMKY BEZ KOPÍROVÁNÍ
+        ----------------------------------------------------------------------------------------------------------
+        READS A TRAJECTORY THROUGH np.memmap - FRAMES ARE LOADED FROM DISK ONLY ON ACCESS, IN ANY ORDER BY GENERATION
+        reader[g] = GRID OF GENERATION g, reader[a:b] = STACK OF GRIDS, reader.packed = PACKED FRAMES WITHOUT COPYING
+        """
+        self.path = path
+        with open(path, "rb") as trajectory_file:
+            header = trajectory_file.read(HEADER_SIZE)
+        if len(header) < HEADER_SIZE or header[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a trajectory file.")
+        (_, version, self.rows, self.cols, self.frame_bytes, self.frames,
+         stats_offset, seed, rule) = struct.unpack_from(HEADER_FORMAT, header)
+        if version != VERSION:
+            raise ValueError(f"Unsupported trajectory version {version}.")
+        self.seed = None if seed < 0 else seed
+        self.rule = rule.rstrip(b"\x00").decode("ascii") or None
+        self.packed = self.map(HEADER_SIZE, np.uint8, (self.frames, self.frame_bytes))
+        self.stats = None
+        if stats_offset:
+            self.stats = self.map(stats_offset, "<i8", (self.frames, len(STATS)))
+
+    def map(self, offset, dtype, shape):
+        """
+        POHLED np.memmap NA ČÁST SOUBORU (PRÁZDNÉ POLE PRO NULOVÝ POČET SNÍMKŮ)
+        -------------------------------------------------------------------------
+        np.memmap VIEW OF A PART OF THE FILE (AN EMPTY ARRAY FOR ZERO FRAMES)
+        """
+        if shape[0] == 0 or os.path.getsize(self.path) <= offset:
+            return np.empty((0,) + shape[1:], dtype=dtype)
+        return np.memmap(self.path, dtype=dtype, mode="r", offset=offset, shape=shape)
+
+    def __len__(self):
+        return self.frames
+
+    def __getitem__(self, generation):
+        """
+        MŘÍŽKA JEDNÉ GENERACE (uint8) NEBO ZÁSOBNÍK MŘÍŽEK PRO ŘEZ GENERACÍ
+        --------------------------------------------------------------------
+        GRID OF ONE GENERATION (uint8) OR A STACK OF GRIDS FOR A SLICE OF GENERATIONS
+        """
+        packed = self.packed[generation]
+        cells = np.unpackbits(packed, axis=-1, count=self.rows * self.cols)
+        return cells.reshape(packed.shape[:-1] + (self.rows, self.cols))
+
+    def __iter__(self):
+        for generation in range(self.frames):
+            yield self[generation]
+
+    def stat(self, name):
+        """
+        HODNOTY JEDNÉ STATISTIKY ZE STATS PRO VŠECHNY GENERACE (BEZ KOPÍROVÁNÍ)
+        -------------------------------------------------------------------------
+        VALUES OF ONE STATISTIC FROM STATS FOR ALL GENERATIONS (WITHOUT COPYING)
+        """
+        if self.stats is None:
+            raise ValueError(f"{self.path} was recorded without stats.")
+        return self.stats[:, STATS.index(name)]
+
+    def measure(self, metrics, start=0, stop=None):
+        """
+        DODATEČNÝ VÝPOČET METRIK (fitnessMetrics.METRICS) PRO GENERACE start AŽ stop BEZ NOVÉ SIMULACE
+        VÝSLEDEK {NÁZEV: VEKTOR}, changed PRVNÍ GENERACE SE POČÍTÁ OPROTI GENERACI start - 1 (NEBO JE 0)
+        ---------------------------------------------------------------------------------------------------
+        POST-HOC COMPUTATION OF METRICS (fitnessMetrics.METRICS) FOR GENERATIONS start TO stop WITHOUT A NEW SIMULATION
+        RESULT {NAME: VECTOR}, changed OF THE FIRST GENERATION IS COMPUTED AGAINST GENERATION start - 1 (OR IS 0)
+        """
+        stop = self.frames if stop is None else stop
+        grids = self[start:stop]
+        previous = self[max(start - 1, 0):max(stop - 1, 0)]
+        if start == 0 and len(grids):
+            previous = np.concatenate([grids[:1], previous])
+        return MetricStream(self.rows, self.cols, metrics).measure(grids, previous)
+
+    def close(self):
+        """
+        UVOLNĚNÍ MAPOVÁNÍ SOUBORU
+        --------------------------
+        RELEASES THE FILE MAPPING
+        """
+        self.packed = None
+        self.stats = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,237 @@
+import os
+import queue
+import threading
+import cv2
+import numpy as np
+from cellularAutomaton import CellularAutomaton
+from rule import as_rule
+from trajectoryFile import TrajectoryReader
+
+"""
+BARVY SNÍMKU (BGR, JAKO V cv2)
+-------------------------------
+FRAME COLOURS (BGR, AS IN cv2)
+"""
+BLACK = (0, 0, 0)
+WHITE = (255, 255, 255)
+GRAY = (200, 200, 200)
+
+DEAD, ALIVE, LINE, BACKGROUND = 0, 1, 2, 3
+
+
+class FrameRenderer:
+    def __init__(self, rows, cols, cell_size=20, cell_gap=1, margin=20, text_height=50):
+        """
+        PŘEVOD MŘÍŽKY NA SNÍMEK JEDNOU OPERACÍ NUMPY - PRO KAŽDÝ PIXEL SE PŘEDEM URČÍ, ZDA PATŘÍ BUŇCE, ČÁŘE
+        MŘÍŽKY, NEBO POZADÍ, TAKŽE SNÍMEK JE JEN VÝBĚR Z PALETY (ROZVRŽENÍ STEJNÉ JAKO V visual/main.py)
+        ------------------------------------------------------------------------------------------------------
+        CONVERTS A GRID TO A FRAME IN ONE NUMPY OPERATION - FOR EVERY PIXEL IT IS DECIDED IN ADVANCE WHETHER
+        IT BELONGS TO A CELL, A GRID LINE OR THE BACKGROUND, SO A FRAME IS ONLY A PALETTE LOOKUP (LAYOUT AS IN visual/main.py)
+        """
+        self.rows = rows
+        self.cols = cols
+        self.margin = margin
+        self.text_height = text_height
+        self.width = cell_size * cols + cell_gap * (cols + 1) + 2 * margin
+        self.height = cell_size * rows + cell_gap * (rows + 1) + text_height + 2 * margin
+        self.palette = np.array([WHITE, BLACK, GRAY, WHITE], dtype=np.uint8)
+        self._cells = np.full((rows + 2, cols + 2), BACKGROUND, dtype=np.intp)
+        self._cells[:rows + 1, :cols + 1] = LINE
+        row_map = self.pixel_map(self.height, rows, cell_size, cell_gap, margin + text_height)
+        col_map = self.pixel_map(self.width, cols, cell_size, cell_gap, margin)
+        self._pixels = row_map[:, None] * (cols + 2) + col_map[None, :]
+
+    @staticmethod
+    def pixel_map(length, count, cell_size, cell_gap, offset):
+        """
+        PRO KAŽDÝ PIXEL JEDNÉ OSY INDEX BUŇKY (0 AŽ count - 1), count = ČÁRA MŘÍŽKY, count + 1 = POZADÍ
+        --------------------------------------------------------------------------------------------------
+        FOR EVERY PIXEL OF ONE AXIS THE CELL INDEX (0 TO count - 1), count = GRID LINE, count + 1 = BACKGROUND
+        """
+        pitch = cell_size + cell_gap
+        position = np.arange(length) - offset
+        mapping = np.full(length, count + 1, dtype=np.intp)
+        inside = (position >= 0) & (position < count * pitch + cell_gap)
+        mapping[inside] = count
+        cell = inside & (position % pitch >= cell_gap) & (position // pitch < count)
+        mapping[cell] = position[cell] // pitch
+        return mapping
+
+    def render(self, grid, lines=()):
+        """
+        SNÍMEK (VÝŠKA, ŠÍŘKA, 3) uint8 BGR PRO MŘÍŽKU S ŘÁDKY TEXTU NAHOŘE
+        --------------------------------------------------------------------
+        FRAME (HEIGHT, WIDTH, 3) uint8 BGR FOR A GRID WITH LINES OF TEXT AT THE TOP
+        """
+        self._cells[:self.rows, :self.cols] = grid
+        frame = self.palette.take(self._cells.ravel().take(self._pixels), axis=0)
+        for i, line in enumerate(lines):
+            self.put_text(frame, line, self.margin // 2 + self.text_height // 2 + i * (self.text_height // 2 - 2))
+        return frame
+
+    def put_text(self, frame, text, center_y):
+        """
+        VODOROVNĚ VYSTŘEDĚNÝ TEXT SE STŘEDEM VE VÝŠCE center_y
+        --------------------------------------------------------
+        HORIZONTALLY CENTRED TEXT WITH ITS CENTRE AT THE HEIGHT center_y
+        """
+        (text_width, text_height), _ = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 1)
+        origin = ((self.width - text_width) // 2, center_y + text_height // 2)
+        cv2.putText(frame, text, origin, cv2.FONT_HERSHEY_SIMPLEX, 0.5, BLACK, 1, cv2.LINE_AA)
+
+
+class VideoEncoder:
+    def __init__(self, path, fps, max_queue=64):
+        """
+        KÓDOVÁNÍ SNÍMKŮ VE VLÁKNĚ NA POZADÍ - write JEN VLOŽÍ SNÍMEK DO OMEZENÉ FRONTY (POKUD JE PLNÁ, POČKÁ)
+        PŘÍPONA .gif = ANIMOVANÝ GIF (PIL), JINAK VIDEO mp4v (cv2.VideoWriter)
+        ---------------------------------------------------------------------------------------------------------
+        ENCODES FRAMES IN A BACKGROUND THREAD - write ONLY PUTS THE FRAME INTO A BOUNDED QUEUE (IF IT IS FULL, IT WAITS)
+        EXTENSION .gif = ANIMATED GIF (PIL), OTHERWISE mp4v VIDEO (cv2.VideoWriter)
+        """
+        self.path = path
+        self.fps = fps
+        self.frames = 0
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._error = None
+        self._thread = threading.Thread(target=self.encode_frames, daemon=True)
+        self._thread.start()
+
+    def write(self, frame):
+        """
+        ZAŘAZENÍ SNÍMKU (uint8 BGR) KE KÓDOVÁNÍ
+        ----------------------------------------
+        QUEUES A FRAME (uint8 BGR) FOR ENCODING
+        """
+        if self._error is not None:
+            raise self._error
+        self._queue.put(frame)
+        self.frames += 1
+
+    def encode_frames(self):
+        """
+        SMYČKA VLÁKNA KÓDOVÁNÍ (CHYBA SE ULOŽÍ A VYVOLÁ V write NEBO close)
+        ---------------------------------------------------------------------
+        LOOP OF THE ENCODER THREAD (AN ERROR IS STORED AND RAISED IN write OR close)
+        """
+        writer = None
+        gif_frames = []
+        try:
+            while True:
+                frame = self._queue.get()
+                if frame is None:
+                    break
+                if self.path.lower().endswith(".gif"):
+                    gif_frames.append(frame[..., ::-1].copy())
+                    continue
+                if writer is None:
+                    height, width = frame.shape[:2]
+                    writer = cv2.VideoWriter(self.path, cv2.VideoWriter_fourcc(*'mp4v'), self.fps, (width, height))
+                writer.write(frame)
+            if gif_frames:
+                from PIL import Image
+                images = [Image.fromarray(frame) for frame in gif_frames]
+                images[0].save(self.path, save_all=True, append_images=images[1:],
+                               duration=int(1000 / self.fps), loop=0)
+        except Exception as error:
+            self._error = error
+            while self._queue.get() is not None:
+                pass
+        finally:
+            if writer is not None:
+                writer.release()
+
+    def close(self):
+        """
+        DOKÓDOVÁNÍ ZBÝVAJÍCÍCH SNÍMKŮ A ZAVŘENÍ SOUBORU
+        -------------------------------------------------
+        ENCODES THE REMAINING FRAMES AND CLOSES THE FILE
+        """
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+        if self._error is not None:
+            raise self._error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def simulate_grids(rule, rows, cols, generations, initial_grid=None):
+    """
+    MŘÍŽKY GENERACÍ 0 AŽ generations (BEZ POČÁTEČNÍ MŘÍŽKY JEDNA ŽIVÁ BUŇKA UPROSTŘED, ENGINE 'symmetric')
+    --------------------------------------------------------------------------------------------------------
+    GRIDS OF GENERATIONS 0 TO generations (WITHOUT AN INITIAL GRID ONE LIVE CELL IN THE MIDDLE, ENGINE 'symmetric')
+    """
+    rule = as_rule(rule)
+    ca = CellularAutomaton(rows, cols, initial_grid, engine="symmetric")
+    if initial_grid is None:
+        ca.initialize_center_cell()
+    yield ca.grid
+    for _ in range(generations):
+        ca.advance(rule)
+        yield ca.grid
+
+
+def render_rule(rule, path, rows=11, cols=11, generations=100, fps=2.5, initial_grid=None, renderer=None):
+    """
+    VIDEO NEBO GIF SIMULACE JEDNOHO PRAVIDLA BEZ OKNA (SNÍMKY S ČÍSLEM GENERACE A PRAVIDLEM)
+    ------------------------------------------------------------------------------------------
+    VIDEO OR GIF OF THE SIMULATION OF ONE RULE WITHOUT A WINDOW (FRAMES WITH THE GENERATION NUMBER AND THE RULE)
+    """
+    renderer = renderer or FrameRenderer(rows, cols)
+    rule_string = str(as_rule(rule))
+    with VideoEncoder(path, fps) as encoder:
+        for generation, grid in enumerate(simulate_grids(rule, rows, cols, generations, initial_grid)):
+            encoder.write(renderer.render(grid, (f"Generace {generation}.", f"Pravidlo: {rule_string}")))
+    return path
+
+
+def render_rules(rules, directory, extension=".mp4", rows=11, cols=11, generations=100, fps=2.5):
+    """
+    DÁVKOVÉ VYKRESLENÍ VÍCE PRAVIDEL (NAPŘ. NEJLEPŠÍCH Z BĚHU GENETICKÉHO ALGORITMU) DO SOUBORŮ B..._S....extension
+    ---------------------------------------------------------------------------------------------------------------
+    BATCH RENDERING OF SEVERAL RULES (E.G. THE BEST ONES FROM A GENETIC ALGORITHM RUN) INTO FILES B..._S....extension
+    """
+    os.makedirs(directory, exist_ok=True)
+    renderer = FrameRenderer(rows, cols)
+    paths = []
+    for rule in rules:
+        file_name = str(as_rule(rule)).replace("/", "_") + extension
+        paths.append(render_rule(rule, os.path.join(directory, file_name), rows, cols, generations, fps,
+                                 renderer=renderer))
+    return paths
+
+
+def top_rules(fitness_values, count):
+    """
+    count RŮZNÝCH NEJLEPŠÍCH PRAVIDEL Z [(FITNESS, PRAVIDLO), ...] (NAPŘ. ga.fitness_values)
+    ------------------------------------------------------------------------------------------
+    count DISTINCT BEST RULES FROM [(FITNESS, RULE), ...] (E.G. ga.fitness_values)
+    """
+    rules = []
+    for _, rule in sorted(fitness_values, key=lambda item: -item[0]):
+        if as_rule(rule) not in rules:
+            rules.append(as_rule(rule))
+        if len(rules) == count:
+            break
+    return rules
+
+
+def render_trajectory(trajectory_path, path, fps=2.5, renderer=None):
+    """
+    VIDEO NEBO GIF ZE ZÁZNAMU TRAJEKTORIE (trajectoryFile.py) BEZ NOVÉ SIMULACE
+    ------------------------------------------------------------------------------
+    VIDEO OR GIF FROM A RECORDED TRAJECTORY (trajectoryFile.py) WITHOUT A NEW SIMULATION
+    """
+    with TrajectoryReader(trajectory_path) as reader:
+        renderer = renderer or FrameRenderer(reader.rows, reader.cols)
+        rule_string = reader.rule or "?"
+        with VideoEncoder(path, fps) as encoder:
+            for generation, grid in enumerate(reader):
+                encoder.write(renderer.render(grid, (f"Generace {generation}.", f"Pravidlo: {rule_string}")))
+    return path